@@ -1,10 +1,11 @@
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.mixins import ConditionalGetMixin
 from .models import Category
 from .serializers import CategorySerializer, CategoryListSerializer
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing categories.
     """
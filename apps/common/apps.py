@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.common"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.common.signals  # noqa
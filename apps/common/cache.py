@@ -0,0 +1,126 @@
+"""
+Versioned response cache for the catalog endpoints.
+A cached response is keyed by the request path and query string, the
+tenant scope of the caller and the current versions of the data it was
+built from. Writes bump those versions instead of deleting keys, so stale
+entries are never read again and simply expire. Works with any Django
+cache backend; with the local-memory backend each process has its own
+versions, so entries may be stale for up to CATALOG_CACHE_TIMEOUT in
+other processes.
+
+Version names:
+- 'restaurant:<id>': one restaurant's products, discounts and details
+- 'shared': data used by every restaurant (categories, global discounts)
+- 'catalog': anything in the catalog; bumped together with the others
+"""
+import hashlib
+import time
+import uuid
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+KEY_PREFIX = 'catalog'
+
+# Response headers kept with a cached response (validators set by ConditionalGetMixin)
+CACHED_HEADERS = ['ETag', 'Last-Modified', 'Vary']
+
+
+def _version_key(name):
+    return f'{KEY_PREFIX}:version:{name}'
+
+
+def get_versions(names):
+    """Current version of each name, in one cache round trip"""
+    keys = [_version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from the clock so a version lost to eviction never repeats
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump(*names):
+    for name in names:
+        key = _version_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate(restaurant_id=None):
+    """
+    Invalidate cached responses built from one restaurant's data, or from
+    shared data when restaurant_id is None. The versions are bumped after
+    the current transaction commits, so no request can cache the old rows
+    again; catalog_changed is sent right away for derived data.
+    """
+    from .signals import catalog_changed
+    catalog_changed.send(sender=None, restaurant_id=restaurant_id)
+    names = [f'restaurant:{restaurant_id}' if restaurant_id else 'shared', 'catalog']
+    transaction.on_commit(lambda: bump(*names))
+
+
+def catalog_scope(user, restaurant_id=None):
+    """
+    (scope, version names) of a catalog response for this user.
+    Responses for one restaurant only depend on that restaurant and shared data.
+    """
+    if restaurant_id:
+        try:
+            # Same spelling as the ids the invalidation signals see
+            restaurant_id = uuid.UUID(str(restaurant_id))
+        except ValueError:
+            return 'public', ['catalog']
+        return f'restaurant:{restaurant_id}', [f'restaurant:{restaurant_id}', 'shared']
+    if user.is_authenticated and (user.role == 'admin' or user.is_superuser):
+        return 'admin', ['catalog']
+    if user.is_authenticated and user.role in ['restaurant_admin', 'staff'] and user.restaurant_id:
+        return catalog_scope(user, user.restaurant_id)
+    return 'public', ['catalog']
+
+
+def cache_response(get_scope):
+    """
+    Cache successful responses of a viewset method.
+    get_scope(view, request, **kwargs) returns (scope, version names).
+    A cached ETag is checked against If-None-Match, so repeat visits get a
+    304 without touching the database.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            scope, names = get_scope(self, request, **kwargs)
+            # Read the versions before the data so a concurrent write can only
+            # leave an entry under versions that are already outdated
+            versions = get_versions(names)
+            query = hashlib.md5(
+                f'{request.path}?{sorted(request.query_params.lists())}'.encode()
+            ).hexdigest()
+            key = f'{KEY_PREFIX}:response:{scope}:{query}:' + ':'.join(str(v) for v in versions)
+
+            entry = cache.get(key)
+            if entry is not None:
+                headers = entry['headers']
+                if 'ETag' in headers:
+                    not_modified = get_conditional_response(request, etag=headers['ETag'])
+                    if not_modified is not None:
+                        not_modified['ETag'] = headers['ETag']
+                        return not_modified
+                return Response(entry['data'], headers=headers)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, {
+                    'data': response.data,
+                    'headers': {name: response[name] for name in CACHED_HEADERS if name in response},
+                }, settings.CATALOG_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,83 @@
+import hashlib
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for list and retrieve.
+    The validator is one aggregate query over the filtered queryset:
+    the latest updated_at of every field in validator_fields plus the row
+    count, so nothing is serialized when the client's copy is current.
+    Lists only send an ETag, since a deleted row cannot move a
+    Last-Modified date; single objects send both.
+    """
+    # updated_at fields the serialized data depends on, including nested objects
+    validator_fields = ['updated_at']
+
+    def get_validator_extra(self):
+        """Anything besides the rows that the response depends on (e.g. the time)"""
+        return None
+
+    def get_validators(self, queryset):
+        """(etag, last_modified, count) for the rows in queryset"""
+        aggregates = {
+            field.replace('__', '_'): Max(field) for field in self.validator_fields
+        }
+        values = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+        etag = quote_etag(hashlib.md5(
+            repr((sorted(values.items()), self.get_validator_extra())).encode()
+        ).hexdigest())
+        last_modified = max(
+            (values[name] for name in aggregates if values[name]),
+            default=None
+        )
+        return etag, last_modified, values['count']
+
+    def conditional_response(self, request, etag, last_modified=None):
+        """304 response when the request's validators match, otherwise None"""
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None
+        )
+        if response is not None:
+            response['ETag'] = etag
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def set_validators(self, response, etag, last_modified=None):
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            # Results depend on who is asking (tenant scoping)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, _, _ = self.get_validators(self.filter_queryset(self.get_queryset()))
+        return (
+            self.conditional_response(request, etag)
+            or self.set_validators(super().list(request, *args, **kwargs), etag)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            etag, last_modified, count = self.get_validators(
+                self.filter_queryset(self.get_queryset()).filter(
+                    **{self.lookup_field: kwargs[lookup_url_kwarg]}
+                )
+            )
+        except (TypeError, ValueError, ValidationError):
+            count = 0
+        if not count:
+            # Let the regular lookup answer 404
+            return super().retrieve(request, *args, **kwargs)
+        return (
+            self.conditional_response(request, etag, last_modified)
+            or self.set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+        )
@@ -0,0 +1,107 @@
+import base64
+import binascii
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Requests that include ?cursor= (empty for the first page) are paginated
+    on (created_at, id) without COUNT(*) or OFFSET, so every page costs the
+    same as the first one. Requests without it keep page numbers.
+    Keyset pages are always ordered newest first and only link forward.
+    A view can page on another copy of created_at (e.g. across a join) by
+    setting keyset_field.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_keyset = self.cursor_query_param in request.query_params
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        field = getattr(view, 'keyset_field', 'created_at')
+        queryset = queryset.order_by(f'-{field}', '-pk')
+        if position is not None:
+            created_at, pk = position
+            try:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__lt': created_at}) |
+                    Q(**{field: created_at, 'pk__lt': pk})
+                )
+            except (ValidationError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to know whether there is a next page
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page_results = results[:page_size]
+        return self.page_results
+
+    def get_paginated_response(self, data):
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.use_keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        last = self.page_results[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(last.created_at, last.pk)
+        )
+
+    def get_previous_link(self):
+        if not self.use_keyset:
+            return super().get_previous_link()
+        return None
+
+    def encode_cursor(self, created_at, pk):
+        raw = f'{created_at.isoformat()}|{pk}'.encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, request):
+        """Return (created_at, pk) from the cursor, or None for the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk = base64.urlsafe_b64decode(encoded.encode()).decode().split('|', 1)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        created_at = parse_datetime(created_at)
+        if created_at is None or not pk:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Keyset cursor; send it empty for the first page',
+            'schema': {'type': 'string'},
+        })
+        return parameters
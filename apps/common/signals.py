@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import Signal, receiver
+from apps.category.models import Category
+from apps.discount.models import Discount
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
+from . import cache
+
+# Sent by cache.invalidate() inside the transaction that changed catalog data.
+# Arguments: restaurant_id (None when shared data such as categories changed)
+catalog_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Discount)
+def invalidate_restaurant_catalog(sender, instance, **kwargs):
+    """Product and discount changes only affect their restaurant (or everyone, for global discounts)"""
+    cache.invalidate(instance.restaurant_id)
+
+
+@receiver(m2m_changed, sender=Discount.products.through)
+def invalidate_discount_products(sender, instance, **kwargs):
+    # instance is the discount or, for changes made from the product side, the product
+    cache.invalidate(instance.restaurant_id)
+
+
+@receiver([post_save, post_delete], sender=Restaurant)
+def invalidate_restaurant(sender, instance, **kwargs):
+    cache.invalidate(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    cache.invalidate()
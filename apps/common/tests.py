@@ -0,0 +1,265 @@
+"""
+Query plan regression tests.
+Seeds a realistic data volume (about 100k rows) in the test database,
+refreshes the planner statistics and runs EXPLAIN on the main query of
+each viewset and background job. A test fails when its query no longer
+uses one of the indexes planned for it.
+Small lookup tables (categories, discounts, delivery zones, payment
+methods) are not checked: a sequential scan is the right plan for them.
+"""
+import random
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.discount import pricing
+from apps.favorite.models import Favorite
+from apps.notification.models import Notification
+from apps.notification.views import NotificationViewSet
+from apps.order import archive
+from apps.order.models import Order, OrderRestaurant
+from apps.order.views import OrderViewSet
+from apps.product.models import Product
+from apps.product.views import ProductViewSet
+from apps.restaurant.models import Restaurant, RestaurantOpeningInterval
+from apps.restaurant.views import RestaurantViewSet
+from apps.review.models import Review
+from apps.review.views import ReviewViewSet
+from apps.user_account.models import User
+from apps.wallet import loyalty
+from apps.wallet.models import WalletTransaction
+from apps.wallet.views import WalletTransactionViewSet
+
+PAGE_SIZE = 20
+
+
+def viewset_queryset(viewset_class, user, params=None):
+    """The filtered list queryset a viewset would serve for this user and query string"""
+    request = Request(APIRequestFactory().get('/', params or {}))
+    request.user = user
+    view = viewset_class(request=request, action='list', format_kwarg=None, args=(), kwargs={})
+    return view.filter_queryset(view.get_queryset())[:PAGE_SIZE]
+
+
+# (label, queryset builder, indexes any of which the plan must use)
+CHECKS = [
+    ('orders: customer list',
+     lambda ctx: viewset_queryset(OrderViewSet, ctx['customer']),
+     ['order_user_recent']),
+    ('orders: restaurant list',
+     lambda ctx: viewset_queryset(OrderViewSet, ctx['staff']),
+     ['order_link_restaurant_recent']),
+    ('orders: status filter',
+     lambda ctx: viewset_queryset(OrderViewSet, ctx['admin'], {'status': 'pending'}),
+     ['order_status_created']),
+    ('orders: archive scan',
+     lambda ctx: archive.archivable_orders(timezone.now() - timedelta(days=180)).order_by('created_at', 'id')[:500],
+     ['order_status_created', 'order_recent']),
+    ('orders: delivered since',
+     lambda ctx: loyalty.delivered_since(timezone.now() - timedelta(hours=1), None, timezone.now())[:500],
+     ['order_delivered']),
+    ('notifications: list',
+     lambda ctx: viewset_queryset(NotificationViewSet, ctx['customer']),
+     ['notification_user_recent']),
+    ('notifications: unread',
+     lambda ctx: Notification.objects.filter(user=ctx['customer'], is_read=False),
+     ['notification_user_unread']),
+    ('wallet: transactions',
+     lambda ctx: viewset_queryset(WalletTransactionViewSet, ctx['customer']),
+     ['wallet_tx_user_recent']),
+    ('wallet: earned',
+     lambda ctx: WalletTransaction.objects.filter(user=ctx['customer'], type='earned'),
+     ['wallet_tx_user_type_recent']),
+    ('products: public list',
+     lambda ctx: viewset_queryset(ProductViewSet, AnonymousUser()),
+     ['product_in_stock_top']),
+    ('products: restaurant list',
+     lambda ctx: viewset_queryset(ProductViewSet, ctx['staff'], {'in_stock': 'true'}),
+     ['product_restaurant_stock', 'product_restaurant_price']),
+    ('products: flash sale',
+     lambda ctx: Product.objects.filter(in_stock=True, is_flash_sale=True),
+     ['product_flash_sale_recent']),
+    ('products: discounted',
+     lambda ctx: Product.objects.filter(in_stock=True, effective_price__lt=F('price')).order_by('-created_at'),
+     ['product_discounted_recent']),
+    ('products: by price',
+     lambda ctx: viewset_queryset(ProductViewSet, AnonymousUser(), {'ordering': 'price', 'max_price': '20'}),
+     ['product_in_stock_price']),
+    ('products: restaurant by price',
+     lambda ctx: viewset_queryset(ProductViewSet, ctx['staff'], {'ordering': 'price'}),
+     ['product_restaurant_price']),
+    ('products: prices due',
+     lambda ctx: pricing.due_products().order_by('price_valid_until')[:500],
+     ['product_price_due']),
+    ('products: reviews',
+     lambda ctx: Review.objects.filter(product=ctx['product']),
+     ['review_product_recent']),
+    ('restaurants: public list',
+     lambda ctx: viewset_queryset(RestaurantViewSet, AnonymousUser()),
+     ['restaurant_active_top']),
+    ('restaurants: open now',
+     lambda ctx: RestaurantOpeningInterval.open_at(timezone.now()).values('restaurant_id'),
+     ['opening_interval_lookup']),
+    ('restaurants: menu',
+     lambda ctx: Product.objects.filter(restaurant=ctx['restaurant'], in_stock=True),
+     ['product_restaurant_stock', 'product_restaurant_price']),
+    ('restaurants: reviews',
+     lambda ctx: Review.objects.filter(restaurant=ctx['restaurant']),
+     ['review_restaurant_recent']),
+    ('reviews: my reviews',
+     lambda ctx: viewset_queryset(ReviewViewSet, ctx['customer']),
+     ['review_user_recent']),
+    ('reviews: high rated',
+     lambda ctx: Review.objects.filter(rating__gte=4).order_by('-created_at', '-pk')[:PAGE_SIZE],
+     ['review_high_rated']),
+    ('favorites: by type',
+     lambda ctx: Favorite.objects.filter(user=ctx['customer'], type='product'),
+     ['favorite_user_type_recent']),
+]
+
+
+def seed(scale=1):
+    """Insert the test volume and return the sample users and objects to query with"""
+    rng = random.Random(0)
+    password = make_password(None)
+    now = timezone.now()
+
+    restaurants = Restaurant.objects.bulk_create([
+        Restaurant(
+            name=f'Plan check {i}',
+            address='-',
+            phone='-',
+            email=f'plan-check-{i}@example.com',
+            rating=Decimal(rng.randint(0, 500)) / 100,
+            is_active=rng.random() < 0.9,
+        )
+        for i in range(200 * scale)
+    ], batch_size=1000)
+    timezones = ['Europe/Lisbon', 'Europe/Madrid', 'America/Sao_Paulo']
+    RestaurantOpeningInterval.objects.bulk_create([
+        RestaurantOpeningInterval(
+            restaurant=restaurant,
+            timezone=rng.choice(timezones),
+            start_minute=day * 1440 + 11 * 60,
+            end_minute=day * 1440 + rng.randint(20, 26) * 60,
+        )
+        for restaurant in restaurants
+        for day in range(7)
+    ], batch_size=1000)
+    products = []
+    for i in range(4000 * scale):
+        price = Decimal(rng.randint(100, 5000)) / 100
+        discount_price = Decimal('1.00') if rng.random() < 0.05 else None
+        products.append(Product(
+            name=f'Plan check {i}',
+            price=price,
+            discount_price=discount_price,
+            effective_price=discount_price or price,
+            price_valid_until=now + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.05 else None,
+            restaurant=rng.choice(restaurants),
+            in_stock=rng.random() < 0.9,
+            is_flash_sale=rng.random() < 0.02,
+            rating=Decimal(rng.randint(0, 500)) / 100,
+        ))
+    products = Product.objects.bulk_create(products, batch_size=1000)
+    users = User.objects.bulk_create([
+        User(email=f'plan-check-{i}@example.com', name=f'Plan check {i}', password=password)
+        for i in range(1000 * scale)
+    ], batch_size=1000)
+
+    statuses = [choice for choice, _ in Order.STATUS_CHOICES]
+    orders = Order.objects.bulk_create([
+        Order(
+            user=rng.choice(users),
+            total=Decimal('20.00'),
+            status=status,
+            delivery_address='-',
+            delivery_fee=Decimal('2.00'),
+            payment_method='cash',
+            delivered_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)) if status == 'delivered' else None,
+        )
+        for status in (rng.choice(statuses) for _ in range(20000 * scale))
+    ], batch_size=1000)
+    OrderRestaurant.objects.bulk_create([
+        OrderRestaurant(
+            order=order,
+            restaurant=rng.choice(restaurants),
+            subtotal=Decimal('18.00'),
+            items_count=1,
+            order_created_at=now,
+        )
+        for order in orders
+    ], batch_size=1000)
+    Notification.objects.bulk_create([
+        Notification(
+            user=rng.choice(users),
+            title='-',
+            message='-',
+            type='order_update',
+            is_read=rng.random() < 0.8,
+        )
+        for _ in range(40000 * scale)
+    ], batch_size=1000)
+    types = [choice for choice, _ in WalletTransaction.TYPE_CHOICES]
+    WalletTransaction.objects.bulk_create([
+        WalletTransaction(
+            user=rng.choice(users),
+            type=rng.choice(types),
+            amount=Decimal('1.00'),
+            points=10,
+            description='-',
+        )
+        for _ in range(20000 * scale)
+    ], batch_size=1000)
+
+    reviews = []
+    favorites = []
+    for user in users:
+        for product in rng.sample(products, 5):
+            reviews.append(Review(user=user, product=product, rating=rng.randint(1, 5)))
+        reviews.append(Review(user=user, restaurant=rng.choice(restaurants), rating=rng.randint(1, 5)))
+        for product in rng.sample(products, 3):
+            favorites.append(Favorite(user=user, type='product', product=product))
+        favorites.append(Favorite(user=user, type='restaurant', restaurant=rng.choice(restaurants)))
+    Review.objects.bulk_create(reviews, batch_size=1000)
+    Favorite.objects.bulk_create(favorites, batch_size=1000)
+
+    restaurant = restaurants[0]
+    return {
+        'customer': users[0],
+        'admin': User.objects.create(
+            email='plan-check-admin@example.com', name='Plan check admin', password=password, role='admin'
+        ),
+        'staff': User.objects.create(
+            email='plan-check-staff@example.com', name='Plan check staff', password=password,
+            role='staff', restaurant=restaurant
+        ),
+        'restaurant': restaurant,
+        'product': reviews[0].product,
+    }
+
+
+# EXPLAIN output names the indexes on these backends
+@unittest.skipUnless(connection.vendor in ['postgresql', 'sqlite'], 'Plans are only checked on PostgreSQL and SQLite')
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ctx = seed()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_hot_queries_use_their_indexes(self):
+        for label, build, indexes in CHECKS:
+            with self.subTest(label):
+                plan = build(self.ctx).explain()
+                self.assertTrue(
+                    any(index in plan for index in indexes),
+                    f'{label} does not use {" or ".join(indexes)}:\n{plan}'
+                )
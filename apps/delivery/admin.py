@@ -9,4 +9,5 @@ class DeliveryZoneAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     list_editable = ['is_active', 'delivery_fee']
     ordering = ['name']
-    readonly_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+    readonly_fields = ['id', 'created_at', 'updated_at']
+    filter_horizontal = ['restaurants']
\ No newline at end of file
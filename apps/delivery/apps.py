@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DeliveryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.delivery"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.delivery.signals  # noqa
@@ -0,0 +1,250 @@
+"""
+Restaurant and delivery-zone lookups by location, without PostGIS.
+Coordinates are plain latitude/longitude columns. Every process keeps an
+in-memory GeoIndex: restaurants bucketed by geohash cell and zones by the
+cells their bounding box covers, so a radius or point-in-zone query only
+looks at a few cells. The index is rebuilt when the 'geo' cache version
+changes; the signals in apps/delivery/signals.py bump it whenever
+coordinates, zones or their restaurants change. Versions are only shared
+between processes with a shared cache backend (Redis), so the index is
+also rebuilt once it is GEO_INDEX_MAX_AGE seconds old: with the
+local-memory cache, other processes see a change within that time.
+"""
+import math
+import threading
+import time
+from django.conf import settings
+from django.db import transaction
+from apps.common import cache
+from apps.restaurant.models import Restaurant
+from .models import DeliveryZone
+
+EARTH_RADIUS_KM = 6371.0088
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Geohash length of the index cells: about 4.9 x 4.9 km at the equator
+CELL_PRECISION = 5
+CELL_HEIGHT = 180 / 2 ** 12  # degrees of latitude
+CELL_WIDTH = 360 / 2 ** 13  # degrees of longitude
+
+VERSION_NAME = 'geo'
+
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 50.0
+
+
+def encode(latitude, longitude, precision=9):
+    """Geohash of a point"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def read_point(params):
+    """(latitude, longitude) from the lat and lng query parameters; ValueError if invalid"""
+    try:
+        latitude = float(params['lat'])
+        longitude = float(params['lng'])
+    except (KeyError, ValueError):
+        raise ValueError('lat and lng are required and must be numbers')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('lat must be between -90 and 90 and lng between -180 and 180')
+    return latitude, longitude
+
+
+def read_radius(params):
+    """Search radius in km from the radius query parameter, clamped to MAX_RADIUS_KM; ValueError if invalid"""
+    try:
+        radius = float(params.get('radius', DEFAULT_RADIUS_KM))
+    except ValueError:
+        raise ValueError('radius must be a number of kilometers')
+    if not math.isfinite(radius):
+        raise ValueError('radius must be a number of kilometers')
+    return min(max(radius, 0.0), MAX_RADIUS_KM)
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle (haversine) distance between two points"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(points):
+    """(min lat, min lng, max lat, max lng) of [lat, lng] points"""
+    lats = [point[0] for point in points]
+    lngs = [point[1] for point in points]
+    return min(lats), min(lngs), max(lats), max(lngs)
+
+
+def contains(polygon, latitude, longitude):
+    """Whether a point lies inside a polygon of [lat, lng] vertices (ray casting)"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lat_i > latitude) != (lat_j > latitude):
+            crossing = lng_i + (latitude - lat_i) * (lng_j - lng_i) / (lat_j - lat_i)
+            if longitude < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+
+def _grid(min_lat, min_lng, max_lat, max_lng):
+    """Rows and columns of the index cells covering a bounding box"""
+    rows = range(int((min_lat + 90) // CELL_HEIGHT), int((max_lat + 90) // CELL_HEIGHT) + 1)
+    columns = range(int((min_lng + 180) // CELL_WIDTH), int((max_lng + 180) // CELL_WIDTH) + 1)
+    return rows, columns
+
+
+def cell_count(min_lat, min_lng, max_lat, max_lng):
+    rows, columns = _grid(min_lat, min_lng, max_lat, max_lng)
+    return len(rows) * len(columns)
+
+
+def cells(min_lat, min_lng, max_lat, max_lng):
+    """Geohash cells covering a bounding box"""
+    rows, columns = _grid(min_lat, min_lng, max_lat, max_lng)
+    # Encode the center of each cell, away from rounding at the edges
+    return {
+        encode(-90 + (row + 0.5) * CELL_HEIGHT, -180 + (column + 0.5) * CELL_WIDTH, CELL_PRECISION)
+        for row in rows
+        for column in columns
+    }
+
+
+def radius_box(latitude, longitude, radius_km):
+    """Bounding box of a circle, clamped to valid coordinates"""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    lng_delta = 180.0 if cos_lat < 1e-6 else min(180.0, lat_delta / cos_lat)
+    return (
+        max(-90.0, latitude - lat_delta), max(-180.0, longitude - lng_delta),
+        min(90.0, latitude + lat_delta), min(180.0, longitude + lng_delta),
+    )
+
+
+class GeoIndex:
+    """Active restaurants and delivery zones, bucketed by geohash cell"""
+
+    def __init__(self, restaurants, zones):
+        self.restaurant_cells = {}
+        for restaurant_id, latitude, longitude in restaurants:
+            cell = encode(latitude, longitude, CELL_PRECISION)
+            self.restaurant_cells.setdefault(cell, []).append((restaurant_id, latitude, longitude))
+
+        self.zones = {}
+        self.zone_cells = {}
+        for zone in zones:
+            self.zones[zone['id']] = zone
+            for cell in cells(*zone['bbox']):
+                self.zone_cells.setdefault(cell, []).append(zone['id'])
+
+    @classmethod
+    def build(cls):
+        restaurants = Restaurant.objects.filter(
+            is_active=True, latitude__isnull=False, longitude__isnull=False
+        ).values_list('id', 'latitude', 'longitude')
+        links = {}
+        for zone_id, restaurant_id in DeliveryZone.restaurants.through.objects.filter(
+            restaurant__is_active=True
+        ).values_list('deliveryzone_id', 'restaurant_id'):
+            links.setdefault(zone_id, set()).add(restaurant_id)
+        zones = [
+            {
+                'id': zone.id,
+                'polygon': [(float(lat), float(lng)) for lat, lng in zone.polygon],
+                'bbox': (zone.min_latitude, zone.min_longitude, zone.max_latitude, zone.max_longitude),
+                'restaurants': links.get(zone.id, set()),
+            }
+            for zone in DeliveryZone.objects.filter(is_active=True, min_latitude__isnull=False)
+        ]
+        return cls(
+            [(restaurant_id, float(lat), float(lng)) for restaurant_id, lat, lng in restaurants],
+            zones
+        )
+
+    def nearby(self, latitude, longitude, radius_km):
+        """[(distance in km, restaurant id)] within the radius, nearest first"""
+        if not all(map(math.isfinite, (latitude, longitude, radius_km))):
+            raise ValueError('Coordinates and radius must be finite numbers')
+        box = radius_box(latitude, longitude, min(max(radius_km, 0.0), MAX_RADIUS_KM))
+        if cell_count(*box) > len(self.restaurant_cells):
+            # Near the poles a box spans every longitude; the occupied cells are fewer
+            candidates = self.restaurant_cells.values()
+        else:
+            candidates = [self.restaurant_cells.get(cell, []) for cell in cells(*box)]
+        found = []
+        for cell_restaurants in candidates:
+            for restaurant_id, lat, lng in cell_restaurants:
+                distance = distance_km(latitude, longitude, lat, lng)
+                if distance <= radius_km:
+                    found.append((distance, restaurant_id))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def zones_at(self, latitude, longitude):
+        """Ids of the zones containing a point"""
+        return [
+            zone_id for zone_id in self.zone_cells.get(encode(latitude, longitude, CELL_PRECISION), [])
+            if contains(self.zones[zone_id]['polygon'], latitude, longitude)
+        ]
+
+    def delivering_to(self, latitude, longitude):
+        """Ids of the restaurants with a delivery zone containing a point"""
+        restaurant_ids = set()
+        for zone_id in self.zones_at(latitude, longitude):
+            restaurant_ids |= self.zones[zone_id]['restaurants']
+        return restaurant_ids
+
+
+_index = None
+_index_version = None
+_index_built_at = None
+_lock = threading.Lock()
+
+
+def _is_stale(version):
+    return (
+        _index is None
+        or _index_version != version
+        or time.monotonic() - _index_built_at >= settings.GEO_INDEX_MAX_AGE
+    )
+
+
+def get_index():
+    """This process's GeoIndex, rebuilt when the data changed or it is too old"""
+    global _index, _index_version, _index_built_at
+    version, = cache.get_versions([VERSION_NAME])
+    if _is_stale(version):
+        with _lock:
+            if _is_stale(version):
+                _index = GeoIndex.build()
+                _index_version = version
+                _index_built_at = time.monotonic()
+    return _index
+
+
+def invalidate():
+    """Rebuild every process's index after the current transaction commits"""
+    transaction.on_commit(lambda: cache.bump(VERSION_NAME))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0001_initial"),
+        ("restaurant", "0005_restaurant_geohash_restaurant_latitude_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deliveryzone",
+            name="max_latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="deliveryzone",
+            name="max_longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="deliveryzone",
+            name="min_latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="deliveryzone",
+            name="min_longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="deliveryzone",
+            name="polygon",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="deliveryzone",
+            name="restaurants",
+            field=models.ManyToManyField(
+                blank=True, related_name="delivery_zones", to="restaurant.restaurant"
+            ),
+        ),
+    ]
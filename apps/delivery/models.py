@@ -10,6 +10,18 @@ class DeliveryZone(models.Model):
     delivery_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     estimated_time = models.CharField(max_length=50, blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Area served, as [[latitude, longitude], ...] vertices (see apps/delivery/geo.py)
+    polygon = models.JSONField(default=list, blank=True)
+    # Bounding box of the polygon, set on save
+    min_latitude = models.FloatField(blank=True, null=True, editable=False)
+    min_longitude = models.FloatField(blank=True, null=True, editable=False)
+    max_latitude = models.FloatField(blank=True, null=True, editable=False)
+    max_longitude = models.FloatField(blank=True, null=True, editable=False)
+    restaurants = models.ManyToManyField(
+        'restaurant.Restaurant',
+        blank=True,
+        related_name='delivery_zones'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -17,4 +29,12 @@ class DeliveryZone(models.Model):
         ordering = ['name']
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    def save(self, *args, **kwargs):
+        from .geo import bounding_box
+        if self.polygon:
+            self.min_latitude, self.min_longitude, self.max_latitude, self.max_longitude = bounding_box(self.polygon)
+        else:
+            self.min_latitude = self.min_longitude = self.max_latitude = self.max_longitude = None
+        super().save(*args, **kwargs)
\ No newline at end of file
@@ -7,10 +7,27 @@ class DeliveryZoneSerializer(serializers.ModelSerializer):
         model = DeliveryZone
         fields = [
             'id', 'name', 'description', 'delivery_fee',
-            'estimated_time', 'is_active', 'created_at', 'updated_at'
+            'estimated_time', 'is_active', 'polygon', 'restaurants',
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def validate_polygon(self, value):
+        """At least three [latitude, longitude] vertices, or none"""
+        if not value:
+            return []
+        if not isinstance(value, list) or len(value) < 3:
+            raise serializers.ValidationError('A polygon needs at least three [latitude, longitude] points')
+        for point in value:
+            if (
+                not isinstance(point, (list, tuple)) or len(point) != 2
+                or not all(isinstance(coordinate, (int, float)) for coordinate in point)
+            ):
+                raise serializers.ValidationError('Each point must be [latitude, longitude]')
+            if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+                raise serializers.ValidationError('Coordinates out of range')
+        return [[float(latitude), float(longitude)] for latitude, longitude in value]
+
 
 class DeliveryZoneListSerializer(serializers.ModelSerializer):
     """Simplified serializer for list views"""
@@ -0,0 +1,51 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.restaurant.models import Restaurant
+from . import geo
+from .models import DeliveryZone
+
+# Restaurant fields held by the geo index
+INDEXED_FIELDS = {'latitude', 'longitude', 'is_active'}
+
+
+@receiver(post_save, sender=Restaurant)
+def refresh_index_on_restaurant_save(sender, instance, update_fields=None, **kwargs):
+    # Rating and review count updates do not move a restaurant
+    if update_fields is None or INDEXED_FIELDS & set(update_fields):
+        geo.invalidate()
+
+
+@receiver(post_delete, sender=Restaurant)
+@receiver([post_save, post_delete], sender=DeliveryZone)
+def refresh_index(sender, **kwargs):
+    geo.invalidate()
+
+
+@receiver(m2m_changed, sender=DeliveryZone.restaurants.through)
+def refresh_index_on_zone_restaurants(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        geo.invalidate()
+
+
+@receiver(m2m_changed, sender=DeliveryZone.restaurants.through)
+def touch_zones_on_restaurants_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    The linked restaurants are part of a zone's representation, so changing
+    them moves the zone's updated_at and conditional GETs see the change.
+    """
+    if reverse and action == 'pre_clear':
+        # Changed from the restaurant side: remember the zones being unlinked
+        instance._cleared_zone_ids = list(instance.delivery_zones.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    now = timezone.now()
+    if not reverse:
+        zone_ids = [instance.pk]
+        instance.updated_at = now
+    elif action == 'post_clear':
+        zone_ids = getattr(instance, '_cleared_zone_ids', [])
+    else:
+        zone_ids = pk_set
+    DeliveryZone.objects.filter(pk__in=zone_ids).update(updated_at=now)
@@ -1,3 +1,52 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from apps.restaurant.models import Restaurant
+from .models import DeliveryZone
+from .views import DeliveryZoneViewSet
 
-# Create your tests here.
+
+class DeliveryZoneConditionalGetTests(TestCase):
+    """Zone validators follow the linked restaurants"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        cls.other = Restaurant.objects.create(name='Suya Spot', address='2 Main St', phone='2', email='s@example.com')
+
+    def setUp(self):
+        self.zone = DeliveryZone.objects.create(name='Central')
+        self.zone.restaurants.add(self.restaurant)
+        # As if the zone was last edited a while ago
+        DeliveryZone.objects.filter(pk=self.zone.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def retrieve(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        request = APIRequestFactory().get(f'/api/delivery-zones/{self.zone.pk}/', **headers)
+        return DeliveryZoneViewSet.as_view({'get': 'retrieve'})(request, pk=str(self.zone.pk))
+
+    def assertChangeRefreshes(self, change):
+        etag = self.retrieve()['ETag']
+        self.assertEqual(self.retrieve(etag).status_code, 304)
+        change()
+        response = self.retrieve(etag)
+        self.assertEqual(response.status_code, 200)
+        response.render()
+        return response.data['restaurants']
+
+    def test_unchanged_zone_is_not_modified(self):
+        etag = self.retrieve()['ETag']
+        self.assertEqual(self.retrieve(etag).status_code, 304)
+
+    def test_adding_a_restaurant_refreshes(self):
+        restaurants = self.assertChangeRefreshes(lambda: self.zone.restaurants.add(self.other))
+        self.assertCountEqual(restaurants, [self.restaurant.pk, self.other.pk])
+
+    def test_removing_a_restaurant_refreshes(self):
+        restaurants = self.assertChangeRefreshes(lambda: self.zone.restaurants.remove(self.restaurant))
+        self.assertEqual(restaurants, [])
+
+    def test_changes_from_the_restaurant_side_refresh(self):
+        self.assertChangeRefreshes(lambda: self.other.delivery_zones.add(self.zone))
+        self.assertChangeRefreshes(lambda: self.other.delivery_zones.clear())
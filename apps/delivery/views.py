@@ -1,10 +1,14 @@
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.mixins import ConditionalGetMixin
+from . import geo
 from .models import DeliveryZone
 from .serializers import DeliveryZoneSerializer, DeliveryZoneListSerializer
 
 
-class DeliveryZoneViewSet(viewsets.ModelViewSet):
+class DeliveryZoneViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing delivery zones.
     """
@@ -29,4 +33,17 @@ class DeliveryZoneViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAuthenticated]
         else:
             permission_classes = [permissions.AllowAny]
-        return [permission() for permission in permission_classes]
\ No newline at end of file
+        return [permission() for permission in permission_classes]
+
+    @action(detail=False, methods=['get'])
+    def lookup(self, request):
+        """Active delivery zones containing a point (?lat=<latitude>&lng=<longitude>)"""
+        try:
+            latitude, longitude = geo.read_point(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        zone_ids = geo.get_index().zones_at(latitude, longitude)
+        zones = DeliveryZone.objects.filter(pk__in=zone_ids, is_active=True)
+        serializer = DeliveryZoneListSerializer(zones, many=True)
+        return Response(serializer.data)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DiscountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.discount"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.discount.signals  # noqa
@@ -0,0 +1,52 @@
+"""
+Management command to refresh the stored effective prices of products.
+By default it reprices the products whose price is due because a discount
+started or ended; --all reprices every product. Runs once, or keeps
+watching for due prices with --interval.
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.discount import pricing
+from apps.product.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Recompute product effective prices from discount_price and active discounts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every product, not only those whose price is due'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Products repriced per transaction (default: 500)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Keep running, checking for due prices every this many seconds'
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            changed = pricing.recompute(Product.objects.all(), batch_size=options['batch_size'])
+            self.stdout.write(f'Repriced {changed} products')
+
+        total = 0
+        try:
+            while True:
+                changed = pricing.recompute_due(batch_size=options['batch_size'])
+                total += changed
+                if changed:
+                    self.stdout.write(f'Repriced {changed} due products')
+                if options['interval'] is None:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Prices up to date ({total} due products repriced)'))
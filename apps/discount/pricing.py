@@ -0,0 +1,221 @@
+"""
+Effective product prices.
+A product's effective price is the lowest of its price, its manual
+discount_price and its price after each Discount that currently applies
+to it. It is stored in Product.effective_price so listings can sort and
+filter on it in SQL. Product.price_valid_until is when the next of those
+discounts starts or ends; recompute_prices refreshes the products whose
+price is due.
+
+Only item-level discounts change catalog prices: active ones without a
+minimum order amount and with uses left. A discount applies to the
+products it lists; one that lists none applies to every product of its
+restaurant, or to every product when it has no restaurant either.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from functools import reduce
+from operator import or_
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from apps.common.cache import invalidate
+from apps.product.models import Product
+from .models import Discount
+
+CENT = Decimal('0.01')
+
+# Product fields the effective price is computed from
+PRICE_FIELDS = ['price', 'discount_price', 'restaurant']
+
+
+def catalog_discounts(now):
+    """Discounts that change catalog prices now or later"""
+    return Discount.objects.filter(
+        is_active=True,
+        end_date__gt=now,
+        minimum_order_amount__lte=0
+    ).filter(
+        Q(usage_limit__isnull=True) | Q(used_count__lt=F('usage_limit'))
+    )
+
+
+def discounted_price(discount, price):
+    """Price after one discount, never below zero"""
+    if discount.discount_type == 'percentage':
+        amount = price * discount.discount_value / 100
+    else:  # fixed
+        amount = discount.discount_value
+    if discount.maximum_discount:
+        amount = min(amount, discount.maximum_discount)
+    return max(price - amount, Decimal('0.00')).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class PriceBook:
+    """
+    The catalog discounts, indexed by what they apply to.
+    Call load_products() with the ids of the products to price before price().
+    With products, only the discounts that can apply to them are loaded.
+    """
+
+    def __init__(self, now=None, products=None):
+        self.now = now or timezone.now()
+        discounts = catalog_discounts(self.now)
+        if products is not None:
+            discounts = discounts.filter(
+                Q(products__in=[product.pk for product in products])
+                | Q(products__isnull=True, restaurant_id__in={product.restaurant_id for product in products})
+                | Q(products__isnull=True, restaurant__isnull=True)
+            ).distinct()
+        self.discounts = {discount.id: discount for discount in discounts}
+        links = Discount.products.through.objects.filter(discount_id__in=self.discounts)
+        # Discounts listing products only apply to those
+        listing = set(links.values_list('discount_id', flat=True).distinct())
+        self.by_restaurant = {}
+        self.everywhere = []
+        for discount in self.discounts.values():
+            if discount.id in listing:
+                continue
+            if discount.restaurant_id:
+                self.by_restaurant.setdefault(discount.restaurant_id, []).append(discount)
+            else:
+                self.everywhere.append(discount)
+        self.by_product = {}
+
+    def load_products(self, product_ids):
+        self.by_product = {}
+        links = Discount.products.through.objects.filter(
+            discount_id__in=self.discounts,
+            product_id__in=product_ids
+        ).values_list('product_id', 'discount_id')
+        for product_id, discount_id in links:
+            self.by_product.setdefault(product_id, []).append(self.discounts[discount_id])
+
+    def price(self, product):
+        """(effective price, valid until) of a product"""
+        price = product.price
+        best = price
+        if product.discount_price is not None and product.discount_price < price:
+            best = product.discount_price
+
+        valid_until = None
+        discounts = (
+            self.by_product.get(product.pk, [])
+            + self.by_restaurant.get(product.restaurant_id, [])
+            + self.everywhere
+        )
+        for discount in discounts:
+            if discount.start_date <= self.now:
+                best = min(best, discounted_price(discount, price))
+                change = discount.end_date
+            else:
+                change = discount.start_date
+            valid_until = change if valid_until is None else min(valid_until, change)
+        return best, valid_until
+
+
+def apply(products, book=None):
+    """Set effective_price and price_valid_until on these products, without saving"""
+    book = book or PriceBook(products=products)
+    book.load_products([product.pk for product in products if not product._state.adding])
+    for product in products:
+        product.effective_price, product.price_valid_until = book.price(product)
+
+
+def recompute(products, batch_size=500):
+    """
+    Refresh the stored prices of a product queryset, in batches of one
+    transaction each. Returns the number of products whose price changed.
+    """
+    book = PriceBook()
+    products = products.only(
+        'id', 'price', 'discount_price', 'restaurant_id', 'effective_price', 'price_valid_until'
+    ).order_by('pk')
+    changed_count = 0
+    last_pk = None
+    while True:
+        batch = products.filter(pk__gt=last_pk) if last_pk else products
+        batch = list(batch[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        stored = {product.pk: (product.effective_price, product.price_valid_until) for product in batch}
+        apply(batch, book)
+        changed = [
+            product for product in batch
+            if (product.effective_price, product.price_valid_until) != stored[product.pk]
+        ]
+        if changed:
+            with transaction.atomic():
+                Product.objects.bulk_update(changed, ['effective_price', 'price_valid_until'], batch_size=100)
+                for restaurant_id in {
+                    product.restaurant_id for product in changed
+                    if product.effective_price != stored[product.pk][0]
+                }:
+                    invalidate(restaurant_id)
+            changed_count += len(changed)
+    return changed_count
+
+
+def apply_due(products, now=None):
+    """
+    Recompute, without saving, the prices of these products that are due,
+    so a caller never charges a price whose discount has started or ended
+    before recompute_prices has caught up
+    """
+    now = now or timezone.now()
+    due = [
+        product for product in products
+        if product.price_valid_until is not None and product.price_valid_until <= now
+    ]
+    if due:
+        apply(due, PriceBook(now, products=due))
+
+
+def due_products(now=None):
+    """Products whose price changes because a discount started or ended"""
+    return Product.objects.filter(price_valid_until__lte=now or timezone.now())
+
+
+def recompute_due(batch_size=500):
+    """
+    Reprice the products whose price is due, oldest first. Repricing moves
+    a product's price_valid_until into the future (or clears it), which
+    takes it out of the queue. Returns the number of products repriced.
+    """
+    total = 0
+    while True:
+        product_ids = list(
+            due_products().order_by('price_valid_until').values_list('pk', flat=True)[:batch_size]
+        )
+        if not product_ids:
+            break
+        changed = recompute(Product.objects.filter(pk__in=product_ids), batch_size=batch_size)
+        if not changed:
+            break
+        total += changed
+    return total
+
+
+def scope(restaurant_id, product_ids):
+    """
+    Products a discount applies to, as a Q object, or None for every product
+    """
+    if product_ids:
+        return Q(pk__in=product_ids)
+    if restaurant_id:
+        return Q(restaurant_id=restaurant_id)
+    return None
+
+
+def reprice(scopes):
+    """
+    Recompute the prices of the products in any of these scopes once the
+    current transaction commits. Every product is only marked due instead,
+    for recompute_prices to pick up.
+    """
+    if any(product_scope is None for product_scope in scopes):
+        Product.objects.update(price_valid_until=timezone.now())
+        return
+    products = Product.objects.filter(reduce(or_, scopes))
+    transaction.on_commit(lambda: recompute(products))
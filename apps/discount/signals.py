@@ -0,0 +1,73 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from . import pricing
+from .models import Discount
+
+
+def _listed_products(discount):
+    return set(discount.products.values_list('pk', flat=True))
+
+
+@receiver(pre_save, sender=Discount)
+def remember_previous_restaurant(sender, instance, **kwargs):
+    """Products of the restaurant a discount is moved away from need repricing too"""
+    instance._previous_restaurant_id = Discount.objects.filter(
+        pk=instance.pk
+    ).values_list('restaurant_id', flat=True).first()
+
+
+@receiver(post_save, sender=Discount)
+def reprice_on_save(sender, instance, created, **kwargs):
+    listed = _listed_products(instance)
+    scopes = [pricing.scope(instance.restaurant_id, listed)]
+    previous_restaurant_id = getattr(instance, '_previous_restaurant_id', None)
+    if not created and previous_restaurant_id != instance.restaurant_id:
+        scopes.append(pricing.scope(previous_restaurant_id, listed))
+    pricing.reprice(scopes)
+
+
+@receiver(pre_delete, sender=Discount)
+def remember_listed_products(sender, instance, **kwargs):
+    # The links are deleted before post_delete is sent
+    instance._listed_products = _listed_products(instance)
+
+
+@receiver(post_delete, sender=Discount)
+def reprice_on_delete(sender, instance, **kwargs):
+    pricing.reprice([pricing.scope(instance.restaurant_id, getattr(instance, '_listed_products', None))])
+
+
+@receiver(m2m_changed, sender=Discount.products.through)
+def reprice_discount_products(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Reprice the products added to or removed from a discount. A discount
+    whose list becomes empty, or stops being empty, also changes the prices
+    of its whole restaurant (or of every product).
+    instance is the discount or, for changes made from the product side, the product.
+    """
+    if action == 'pre_clear':
+        related = instance.discounts if reverse else instance.products
+        instance._cleared_pks = set(related.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    changed = pk_set if action != 'post_clear' else getattr(instance, '_cleared_pks', set())
+    if not changed:
+        return
+    if reverse:
+        discounts = Discount.objects.filter(pk__in=changed)
+        scopes = [pricing.scope(None, {instance.pk})]
+    else:
+        discounts = [instance]
+        scopes = [pricing.scope(None, changed)]
+
+    for discount in discounts:
+        listed = _listed_products(discount)
+        if reverse:
+            previous = listed - {instance.pk} if action == 'post_add' else listed | {instance.pk}
+        else:
+            previous = listed - changed if action == 'post_add' else listed | changed
+        if not listed or not previous:
+            scopes.append(pricing.scope(discount.restaurant_id, None))
+    pricing.reprice(scopes)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favorite", "0001_initial"),
+        ("product", "0001_initial"),
+        ("restaurant", "0002_restaurant_restaurant_active_top"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="favorite",
+            index=models.Index(
+                fields=["user", "type", "-created_at"], name="favorite_user_type_recent"
+            ),
+        ),
+    ]
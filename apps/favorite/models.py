@@ -41,6 +41,9 @@ class Favorite(models.Model):
             ['user', 'restaurant'],
             ['user', 'product']
         ]
+        indexes = [
+            models.Index(fields=['user', 'type', '-created_at'], name='favorite_user_type_recent'),
+        ]
 
     def __str__(self):
         if self.type == 'restaurant' and self.restaurant:
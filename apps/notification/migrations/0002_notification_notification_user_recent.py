@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discount", "0001_initial"),
+        ("notification", "0001_initial"),
+        ("order", "0005_order_order_user_recent_order_order_recent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="notification_user_recent"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discount", "0001_initial"),
+        ("notification", "0002_notification_notification_user_recent"),
+        ("order", "0007_order_order_status_created"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["user", "-created_at"],
+                name="notification_user_unread",
+            ),
+        ),
+    ]
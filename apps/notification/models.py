@@ -45,6 +45,15 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_recent'),
+            # Unread list and mark_all_read only touch unread rows
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=models.Q(is_read=False),
+                name='notification_user_unread',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.name} - {self.title}"
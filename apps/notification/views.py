@@ -2,6 +2,7 @@ from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.pagination import KeysetPagination
 from .models import Notification
 from .serializers import NotificationSerializer, NotificationCreateSerializer, NotificationUpdateSerializer
 
@@ -12,6 +13,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     """
     queryset = Notification.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['type', 'is_read']
     ordering_fields = ['created_at']
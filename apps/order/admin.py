@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Order, OrderItem
+from .models import (
+    Order, OrderItem, OrderRestaurant, OrderEvent, ArchivedOrder, ArchivedOrderRestaurant
+)
 
 
 class OrderItemInline(admin.TabularInline):
@@ -8,6 +10,13 @@ class OrderItemInline(admin.TabularInline):
     readonly_fields = ['total_price']
 
 
+class OrderRestaurantInline(admin.TabularInline):
+    model = OrderRestaurant
+    extra = 0
+    readonly_fields = ['restaurant', 'subtotal', 'delivery_fee', 'items_count', 'order_created_at']
+    can_delete = False
+
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ['id', 'user', 'total', 'status', 'payment_status', 'created_at']
@@ -15,15 +24,15 @@ class OrderAdmin(admin.ModelAdmin):
     search_fields = ['id', 'user__name', 'user__email', 'delivery_address']
     list_editable = ['status', 'payment_status']
     ordering = ['-created_at']
-    readonly_fields = ['id', 'created_at', 'updated_at']
-    inlines = [OrderItemInline]
+    readonly_fields = ['id', 'delivered_at', 'created_at', 'updated_at']
+    inlines = [OrderItemInline, OrderRestaurantInline]
     
     fieldsets = (
         ('Order Information', {
             'fields': ('user', 'total', 'status')
         }),
         ('Delivery', {
-            'fields': ('delivery_address', 'delivery_fee', 'delivery_time', 'notes')
+            'fields': ('delivery_address', 'delivery_fee', 'delivery_time', 'delivered_at', 'notes')
         }),
         ('Payment', {
             'fields': ('payment_method', 'payment_status')
@@ -34,10 +43,76 @@ class OrderAdmin(admin.ModelAdmin):
         })
     )
 
+    def save_related(self, request, form, formsets, change):
+        """Keep the restaurant links in step with the inline items"""
+        super().save_related(request, form, formsets, change)
+        OrderRestaurant.sync_for_order(form.instance)
+
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
     list_display = ['order', 'product', 'quantity', 'unit_price', 'total_price']
     list_filter = ['order__status', 'product__restaurant']
     search_fields = ['order__id', 'product__name']
-    readonly_fields = ['total_price']
\ No newline at end of file
+    readonly_fields = ['total_price']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        previous_order = form.initial.get('order')
+        if previous_order and previous_order != obj.order_id:
+            OrderRestaurant.sync_for_order(Order.objects.get(pk=previous_order))
+        OrderRestaurant.sync_for_order(obj.order)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        OrderRestaurant.sync_for_order(obj.order)
+
+    def delete_queryset(self, request, queryset):
+        orders = list(Order.objects.filter(pk__in=queryset.values('order_id')))
+        super().delete_queryset(request, queryset)
+        for order in orders:
+            OrderRestaurant.sync_for_order(order)
+
+
+@admin.register(OrderEvent)
+class OrderEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'order', 'type', 'status', 'state', 'attempts', 'created_at', 'processed_at']
+    list_filter = ['type', 'state', 'created_at']
+    search_fields = ['order__id']
+    ordering = ['-id']
+    readonly_fields = ['order', 'type', 'status', 'payload', 'attempts', 'last_error', 'created_at', 'processed_at']
+    actions = ['requeue_events']
+
+    @admin.action(description='Requeue selected events')
+    def requeue_events(self, request, queryset):
+        from django.utils import timezone
+        updated = queryset.exclude(state='processed').update(
+            state='pending',
+            attempts=0,
+            available_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} events requeued')
+
+
+class ArchivedOrderRestaurantInline(admin.TabularInline):
+    model = ArchivedOrderRestaurant
+    extra = 0
+    readonly_fields = ['restaurant', 'subtotal', 'items_count', 'order_created_at']
+    can_delete = False
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'total', 'status', 'payment_status', 'created_at', 'archived_at']
+    list_filter = ['status', 'payment_status', 'payment_method', 'created_at']
+    search_fields = ['id', 'user__name', 'user__email']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'id', 'user', 'total', 'status', 'delivery_address', 'delivery_fee',
+        'payment_method', 'payment_status', 'delivery_time', 'delivered_at', 'notes', 'items',
+        'created_at', 'updated_at', 'archived_at'
+    ]
+    inlines = [ArchivedOrderRestaurantInline]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,80 @@
+"""
+Order archival: closed orders older than a cutoff are copied into the
+archive tables and removed from the hot tables in small transactions.
+Each batch is self-contained, so an interrupted run simply resumes.
+"""
+from django.db import transaction
+from apps.notification.models import Notification
+from .models import Order, OrderItem, OrderRestaurant, ArchivedOrder, ArchivedOrderRestaurant
+
+CLOSED_STATUSES = ['delivered', 'cancelled']
+
+
+def archivable_orders(cutoff):
+    """Closed orders created before cutoff with no undelivered outbox events"""
+    return Order.objects.filter(
+        status__in=CLOSED_STATUSES,
+        created_at__lt=cutoff
+    ).exclude(events__state='pending')
+
+
+def archive_batch(cutoff, batch_size=500):
+    """Move one batch of orders into the archive; returns the number moved"""
+    with transaction.atomic():
+        orders = list(
+            archivable_orders(cutoff).select_for_update(skip_locked=True).order_by(
+                'created_at', 'id'
+            )[:batch_size]
+        )
+        if not orders:
+            return 0
+
+        order_ids = [order.id for order in orders]
+        items = {}
+        for item in OrderItem.objects.filter(order_id__in=order_ids).values(
+            'id', 'order_id', 'product_id', 'product__name', 'quantity', 'unit_price', 'total_price'
+        ):
+            items.setdefault(item['order_id'], []).append({
+                'id': str(item['id']),
+                'product': str(item['product_id']),
+                'name': item['product__name'],
+                'quantity': item['quantity'],
+                'unit_price': str(item['unit_price']),
+                'total_price': str(item['total_price']),
+            })
+
+        ArchivedOrder.objects.bulk_create([
+            ArchivedOrder(
+                id=order.id,
+                user_id=order.user_id,
+                total=order.total,
+                status=order.status,
+                delivery_address=order.delivery_address,
+                delivery_fee=order.delivery_fee,
+                payment_method=order.payment_method,
+                payment_status=order.payment_status,
+                delivery_time=order.delivery_time,
+                delivered_at=order.delivered_at,
+                notes=order.notes,
+                items=items.get(order.id, []),
+                created_at=order.created_at,
+                updated_at=order.updated_at,
+            )
+            for order in orders
+        ], ignore_conflicts=True)
+        ArchivedOrderRestaurant.objects.bulk_create([
+            ArchivedOrderRestaurant(
+                id=link.id,
+                order_id=link.order_id,
+                restaurant_id=link.restaurant_id,
+                subtotal=link.subtotal,
+                items_count=link.items_count,
+                order_created_at=link.order_created_at,
+            )
+            for link in OrderRestaurant.objects.filter(order_id__in=order_ids)
+        ], ignore_conflicts=True)
+
+        # Keep customers' notifications; only their link to the order goes away
+        Notification.objects.filter(order_id__in=order_ids).update(order=None)
+        Order.objects.filter(id__in=order_ids).delete()
+    return len(orders)
@@ -0,0 +1,141 @@
+"""
+Live order feed for restaurant kitchens.
+The feed reads the OrderEvent log, so a client only needs the id of the
+last event it saw. An in-process broker wakes long-poll and SSE waiters
+as soon as new events commit; waiters also re-check the database every
+few seconds so events written by other processes are picked up too.
+
+Waiting requests hold their worker thread, so the web server must run
+threaded workers (see configuration/gunicorn.conf.py); with the default
+sync workers every open feed would take a whole process.
+"""
+import json
+import threading
+import time
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from .models import OrderEvent, OrderItem
+
+POLL_INTERVAL = 2.0
+MAX_WAIT = 25.0
+MAX_EVENTS = 100
+KEEP_ALIVE = 15.0
+
+
+class FeedBroker:
+    """Wakes feed waiters in this process when order events are committed"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._version = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def publish(self):
+        with self._condition:
+            self._version += 1
+            self._condition.notify_all()
+
+    def wait(self, version, timeout):
+        """Block until a publish newer than version, or until timeout"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._version != version, timeout)
+            return self._version
+
+
+broker = FeedBroker()
+
+
+def latest_cursor():
+    """Id of the newest event, used as the starting cursor for new clients"""
+    return OrderEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def fetch_events(restaurant, since, limit=MAX_EVENTS):
+    """Return compact deltas for a restaurant's order events after since"""
+    events = list(
+        OrderEvent.objects.filter(
+            id__gt=since,
+            order__restaurant_links__restaurant=restaurant
+        ).annotate(
+            subtotal=F('order__restaurant_links__subtotal')
+        ).order_by('id').values(
+            'id', 'type', 'order_id', 'status', 'subtotal', 'created_at'
+        )[:limit]
+    )
+
+    # New orders carry the restaurant's lines so tablets need no follow-up fetch
+    new_order_ids = [event['order_id'] for event in events if event['type'] == 'order_created']
+    items = {}
+    if new_order_ids:
+        for item in OrderItem.objects.filter(
+            order_id__in=new_order_ids,
+            product__restaurant=restaurant
+        ).values('order_id', 'product_id', 'product__name', 'quantity'):
+            items.setdefault(item['order_id'], []).append({
+                'product': item['product_id'],
+                'name': item['product__name'],
+                'quantity': item['quantity'],
+            })
+
+    deltas = []
+    for event in events:
+        delta = {
+            'id': event['id'],
+            'type': event['type'],
+            'order': event['order_id'],
+            'status': event['status'],
+            'at': event['created_at'],
+        }
+        if event['type'] == 'order_created':
+            delta['subtotal'] = event['subtotal']
+            delta['items'] = items.get(event['order_id'], [])
+        deltas.append(delta)
+    return deltas
+
+
+def bounded(timeout):
+    """Clamp a wait to [0, MAX_WAIT]; NaN waits MAX_WAIT"""
+    if not 0 <= timeout <= MAX_WAIT:
+        return 0.0 if timeout < 0 else MAX_WAIT
+    return timeout
+
+
+def wait_for_events(restaurant, since, timeout):
+    """Long-poll: return as soon as there are events, or an empty list on timeout"""
+    deadline = time.monotonic() + bounded(timeout)
+    while True:
+        version = broker.version
+        events = fetch_events(restaurant, since)
+        remaining = deadline - time.monotonic()
+        if events or remaining <= 0:
+            return events
+        broker.wait(version, min(POLL_INTERVAL, remaining))
+
+
+def stream_events(restaurant, since, duration):
+    """
+    Server-Sent Events stream. Runs for at most duration seconds; browsers
+    reconnect automatically and resume from the Last-Event-ID header.
+    """
+    deadline = time.monotonic() + bounded(duration)
+    if since is None:
+        since = latest_cursor()
+
+    yield 'retry: 1000\n\n'
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        events = wait_for_events(restaurant, since, min(KEEP_ALIVE, remaining))
+        if not events:
+            yield ': keep-alive\n\n'
+            continue
+
+        for event in events:
+            data = json.dumps(event, cls=DjangoJSONEncoder)
+            yield f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+        since = events[-1]['id']
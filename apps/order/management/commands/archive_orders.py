@@ -0,0 +1,60 @@
+"""
+Management command to archive closed orders.
+Moves delivered and cancelled orders older than the configured age from
+the hot order tables into the archive tables, one batch per transaction.
+Safe to interrupt and re-run.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.order import archive
+
+
+class Command(BaseCommand):
+    help = 'Move closed orders older than a given age into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+            help=f'Archive orders created more than this many days ago (default: {settings.ORDER_ARCHIVE_AFTER_DAYS})'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Orders moved per transaction (default: 500)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Stop after this many batches'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many orders would be archived'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        self.stdout.write(f'Archiving closed orders created before {cutoff:%Y-%m-%d %H:%M}')
+
+        if options['dry_run']:
+            count = archive.archivable_orders(cutoff).count()
+            self.stdout.write(self.style.SUCCESS(f'{count} orders would be archived'))
+            return
+
+        batches = 0
+        moved = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            count = archive.archive_batch(cutoff, options['batch_size'])
+            if not count:
+                break
+            batches += 1
+            moved += count
+            self.stdout.write(f'Archived {moved} orders...')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} orders in {batches} batches'))
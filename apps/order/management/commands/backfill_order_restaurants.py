@@ -0,0 +1,69 @@
+"""
+Management command to backfill order restaurant links.
+Creates OrderRestaurant rows for orders placed before the link table existed.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from apps.order.models import Order, OrderItem, OrderRestaurant
+
+
+class Command(BaseCommand):
+    help = 'Backfill order restaurant links for existing orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of orders processed per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = None
+        orders_seen = 0
+        links_created = 0
+
+        while True:
+            # Keyset over order ids so orders without items are visited only once
+            pending = Order.objects.filter(restaurant_links__isnull=True)
+            if last_id is not None:
+                pending = pending.filter(id__gt=last_id)
+            batch = list(
+                pending.order_by('id').values_list('id', 'created_at')[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_id = batch[-1][0]
+            created_at = dict(batch)
+            rows = OrderItem.objects.filter(
+                order_id__in=created_at
+            ).values('order_id', 'product__restaurant_id').annotate(
+                subtotal=Sum('total_price'),
+                items_count=Count('id')
+            ).order_by()
+
+            links = [
+                OrderRestaurant(
+                    order_id=row['order_id'],
+                    restaurant_id=row['product__restaurant_id'],
+                    subtotal=row['subtotal'],
+                    items_count=row['items_count'],
+                    order_created_at=created_at[row['order_id']],
+                )
+                for row in rows
+            ]
+            with transaction.atomic():
+                OrderRestaurant.objects.bulk_create(links, ignore_conflicts=True)
+
+            orders_seen += len(batch)
+            links_created += len(links)
+            self.stdout.write(f'Processed {orders_seen} orders...')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Backfilled {links_created} restaurant links for {orders_seen} orders'
+            )
+        )
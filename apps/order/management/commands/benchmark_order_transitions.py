@@ -0,0 +1,104 @@
+"""
+Management command to benchmark order status transitions under contention.
+Several threads race every order through the full pending -> delivered
+chain; each step of each order must have exactly one winner and exactly
+one status event.
+Run against PostgreSQL: SQLite serializes writers and will report lock errors.
+"""
+import threading
+import time
+import uuid
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.contrib.auth import get_user_model
+from apps.restaurant.models import Restaurant
+from apps.order.models import Order, OrderEvent
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Race concurrent status transitions and verify there are no lost updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=50, help='Number of orders (default: 50)')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers per order (default: 8)')
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        restaurant = Restaurant.objects.create(
+            name=f'Benchmark Restaurant {suffix}',
+            address='Benchmark',
+            phone='0000000000',
+            email=f'benchmark-{suffix}@bitedrop.test',
+        )
+        user = User.objects.create_user(
+            email=f'benchmark-{suffix}@bitedrop.test',
+            name='Benchmark User',
+        )
+
+        try:
+            orders = [
+                Order.objects.create(
+                    user=user,
+                    total=Decimal('10.00'),
+                    delivery_address='Benchmark',
+                    payment_method='cash',
+                )
+                for _ in range(options['orders'])
+            ]
+            OrderEvent.objects.filter(order__user=user).delete()
+            self.race(orders, options['threads'])
+        finally:
+            user.delete()
+            restaurant.delete()
+
+    def race(self, orders, thread_count):
+        steps = ['confirmed', 'preparing', 'ready', 'delivering', 'delivered']
+        wins = {(order.pk, step): 0 for order in orders for step in steps}
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(thread_count)
+
+        def worker():
+            try:
+                barrier.wait()
+                for order in orders:
+                    for step in steps:
+                        # A stale copy, as a request handler would hold
+                        local = Order(pk=order.pk, status=Order.TRANSITIONS[step][0])
+                        if local.transition_to(step):
+                            with lock:
+                                wins[(order.pk, step)] += 1
+            except Exception as exc:
+                with lock:
+                    errors.append(repr(exc))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        attempts = len(wins) * thread_count
+        events = OrderEvent.objects.filter(order__in=orders, type='status_changed').count()
+        lost_updates = sum(1 for count in wins.values() if count != 1)
+        delivered = Order.objects.filter(pk__in=[order.pk for order in orders], status='delivered').count()
+
+        self.stdout.write(f'Attempts:        {attempts}')
+        self.stdout.write(f'Elapsed:         {elapsed:.3f}s ({attempts / elapsed:.0f} attempts/s)')
+        self.stdout.write(f'Transitions won: {sum(wins.values())} of {len(wins)} expected')
+        self.stdout.write(f'Status events:   {events}')
+        self.stdout.write(f'Delivered:       {delivered} of {len(orders)}')
+        self.stdout.write(f'Lost updates:    {lost_updates}')
+        for error in errors:
+            self.stdout.write(self.style.ERROR(f'Worker error: {error}'))
+
+        if errors or lost_updates or events != len(wins) or delivered != len(orders):
+            raise CommandError('Contention benchmark failed')
+        self.stdout.write(self.style.SUCCESS('No lost updates'))
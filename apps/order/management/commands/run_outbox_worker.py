@@ -0,0 +1,50 @@
+"""
+Management command to drain the order outbox.
+Runs continuously by default; use --once to drain pending events and exit.
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.order import outbox
+
+
+class Command(BaseCommand):
+    help = 'Process pending order outbox events in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of events claimed per batch (default: 100)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the outbox is empty (default: 2)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the currently pending events and exit'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+
+        self.stdout.write(self.style.SUCCESS('Outbox worker started'))
+        try:
+            while True:
+                processed = outbox.process_batch(batch_size)
+                total += processed
+                if processed:
+                    self.stdout.write(f'Processed {processed} events ({total} total)')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Outbox worker stopped after {total} events'))
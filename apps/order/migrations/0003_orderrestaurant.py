@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:53
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0002_alter_order_total"),
+        ("restaurant", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderRestaurant",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "subtotal",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+                ),
+                ("items_count", models.PositiveIntegerField(default=0)),
+                ("order_created_at", models.DateTimeField()),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="restaurant_links",
+                        to="order.order",
+                    ),
+                ),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_links",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-order_created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["restaurant", "-order_created_at"],
+                        name="order_link_restaurant_recent",
+                    )
+                ],
+                "unique_together": {("order", "restaurant")},
+            },
+        ),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0005_order_order_user_recent_order_order_recent"),
+        ("restaurant", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                ("total", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("confirmed", "Confirmed"),
+                            ("preparing", "Preparing"),
+                            ("ready", "Ready"),
+                            ("delivering", "Delivering"),
+                            ("delivered", "Delivered"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("delivery_address", models.TextField()),
+                ("delivery_fee", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "payment_method",
+                    models.CharField(
+                        choices=[
+                            ("mobile_money", "Mobile Money"),
+                            ("card", "Credit/Debit Card"),
+                            ("wallet", "BiteDrop Wallet"),
+                            ("cash", "Cash on Delivery"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "payment_status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("refunded", "Refunded"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("delivery_time", models.DateTimeField(blank=True, null=True)),
+                ("notes", models.TextField(blank=True, null=True)),
+                ("items", models.JSONField(blank=True, default=list)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_orders",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrderRestaurant",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                ("subtotal", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("items_count", models.PositiveIntegerField()),
+                ("order_created_at", models.DateTimeField()),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="restaurant_links",
+                        to="order.archivedorder",
+                    ),
+                ),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_order_links",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-order_created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="archived_order_user_recent"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="archived_order_recent"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorderrestaurant",
+            index=models.Index(
+                fields=["restaurant", "-order_created_at"],
+                name="archived_link_restaurant",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="archivedorderrestaurant",
+            unique_together={("order", "restaurant")},
+        ),
+    ]
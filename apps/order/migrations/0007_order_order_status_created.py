@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0006_archivedorder_archivedorderrestaurant_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "created_at"], name="order_status_created"
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_delivered_at(apps, schema_editor):
+    # Last change of a delivered order is its delivery, close enough for history
+    for name in ["Order", "ArchivedOrder"]:
+        model = apps.get_model("order", name)
+        model.objects.filter(status="delivered").update(
+            delivered_at=models.F("updated_at")
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0007_order_order_status_created"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedorder",
+            name="delivered_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="delivered_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("delivered_at__isnull", False)),
+                fields=["delivered_at", "id"],
+                name="order_delivered",
+            ),
+        ),
+        migrations.RunPython(backfill_delivered_at, migrations.RunPython.noop),
+    ]
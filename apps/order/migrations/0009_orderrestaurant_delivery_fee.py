@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:57
+
+from django.db import migrations, models
+from apps.order.models import split_delivery_fee
+
+
+def backfill_delivery_fee(apps, schema_editor):
+    Order = apps.get_model("order", "Order")
+    OrderRestaurant = apps.get_model("order", "OrderRestaurant")
+    orders = Order.objects.filter(delivery_fee__gt=0).prefetch_related(
+        "restaurant_links"
+    )
+    for order in orders.iterator(chunk_size=1000):
+        links = list(order.restaurant_links.all())
+        shares = split_delivery_fee(
+            order.delivery_fee, [link.subtotal for link in links]
+        )
+        for link, share in zip(links, shares):
+            link.delivery_fee = share
+        OrderRestaurant.objects.bulk_update(links, ["delivery_fee"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0008_order_delivered_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="orderrestaurant",
+            name="delivery_fee",
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_delivery_fee, migrations.RunPython.noop),
+    ]
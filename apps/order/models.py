@@ -1,6 +1,35 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 import uuid
+from decimal import Decimal, ROUND_DOWN
+
+CENT = Decimal('0.01')
+
+
+class OrderQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        Plan the queries needed to serialize orders with OrderSerializer.
+        Users, items, products and restaurants are loaded in a fixed number
+        of queries regardless of how many orders are on the page.
+        """
+        items_count = OrderItem.objects.filter(
+            order=models.OuterRef('pk')
+        ).order_by().values('order').annotate(
+            count=models.Count('pk')
+        ).values('count')
+
+        return self.select_related('user').annotate(
+            annotated_items_count=Coalesce(
+                models.Subquery(items_count), 0
+            )
+        ).prefetch_related(
+            models.Prefetch(
+                'items',
+                queryset=OrderItem.objects.select_related('product__restaurant')
+            ),
+        )
 
 
 class Order(models.Model):
@@ -14,6 +43,16 @@ class Order(models.Model):
         ('cancelled', 'Cancelled'),
     ]
 
+    # Allowed status transitions: target status -> statuses it can be reached from
+    TRANSITIONS = {
+        'confirmed': ['pending'],
+        'preparing': ['confirmed'],
+        'ready': ['preparing'],
+        'delivering': ['ready'],
+        'delivered': ['delivering'],
+        'cancelled': ['pending', 'confirmed'],
+    }
+
     PAYMENT_METHOD_CHOICES = [
         ('mobile_money', 'Mobile Money'),
         ('card', 'Credit/Debit Card'),
@@ -41,28 +80,116 @@ class Order(models.Model):
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
     payment_status = models.CharField(max_length=20, choices=PAYMENT_STATUS_CHOICES, default='pending')
     delivery_time = models.DateTimeField(blank=True, null=True)
+    delivered_at = models.DateTimeField(blank=True, null=True)  # When the status became delivered
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination on (created_at, id), per customer and globally
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_recent'),
+            models.Index(fields=['-created_at', '-id'], name='order_recent'),
+            # Status filters and the archive scan (closed orders before a cutoff)
+            models.Index(fields=['status', 'created_at'], name='order_status_created'),
+            # Loyalty accrual scans orders by delivery time (apps/wallet/loyalty.py)
+            models.Index(
+                fields=['delivered_at', 'id'],
+                name='order_delivered',
+                condition=models.Q(delivered_at__isnull=False)
+            ),
+        ]
 
     def __str__(self):
         return f"Order {self.id} - {self.user.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so saves can tell real status changes apart
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save the order together with its outbox events in one transaction.
+        order_status_changed is only sent when the stored status changes.
+        """
+        previous_status = getattr(self, '_loaded_status', None)
+        if self.status == 'delivered' and self.delivered_at is None:
+            self.delivered_at = timezone.now()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'delivered_at'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous_status is not None and previous_status != self.status:
+                self._send_status_changed(previous_status)
+        self._loaded_status = self.status
+
+    def can_transition_to(self, status):
+        """Check whether the current status may move to the given status"""
+        return self.status in self.TRANSITIONS.get(status, [])
+
+    def transition_to(self, status):
+        """
+        Atomically move the order to a new status.
+        Runs UPDATE ... WHERE id = ? AND status IN (...), so concurrent callers
+        cannot both win. Returns True if this call performed the transition.
+        """
+        allowed_from = self.TRANSITIONS.get(status, [])
+        now = timezone.now()
+        changes = {'status': status, 'updated_at': now}
+        if status == 'delivered':
+            changes['delivered_at'] = now
+        with transaction.atomic():
+            updated = Order.objects.filter(
+                pk=self.pk,
+                status__in=allowed_from
+            ).update(**changes)
+            if not updated:
+                return False
+            if status == 'delivered':
+                self.delivered_at = now
+
+            previous_status = self.status
+            self.status = status
+            self._loaded_status = status
+            self._send_status_changed(previous_status)
+        return True
+
+    def _send_status_changed(self, previous_status):
+        from .signals import order_status_changed
+        order_status_changed.send(
+            sender=Order,
+            order=self,
+            previous_status=previous_status
+        )
+
     @property
     def items_count(self):
         """Get total number of items in the order"""
+        if hasattr(self, 'annotated_items_count'):
+            return self.annotated_items_count
         return self.items.count()
 
     @property
     def restaurants(self):
         """Get all restaurants involved in this order"""
+        prefetched_items = getattr(self, '_prefetched_objects_cache', {}).get('items')
+        if prefetched_items is not None:
+            # Derive restaurants from the prefetched items instead of querying
+            restaurants = {}
+            for item in prefetched_items:
+                restaurant = item.product.restaurant
+                restaurants.setdefault(restaurant.pk, restaurant)
+            return list(restaurants.values())
+
         from apps.restaurant.models import Restaurant
-        return Restaurant.objects.filter(
-            products__order_items__order=self
-        ).distinct()
+        return Restaurant.objects.filter(order_links__order=self)
 
 
 class OrderItem(models.Model):
@@ -90,4 +217,218 @@ class OrderItem(models.Model):
     def save(self, *args, **kwargs):
         """Calculate total price before saving"""
         self.total_price = self.unit_price * self.quantity
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+def split_delivery_fee(fee, subtotals):
+    """
+    Split an order's delivery fee across its restaurants in proportion to
+    their subtotals. The shares add up to the fee exactly: the cents lost
+    to rounding down go to the largest subtotals.
+    """
+    if not subtotals:
+        return []
+    fee = Decimal(fee)
+    weights = [Decimal(subtotal) for subtotal in subtotals]
+    total = sum(weights)
+    if total <= 0:
+        weights = [Decimal(1)] * len(weights)
+        total = sum(weights)
+    shares = [(fee * weight / total).quantize(CENT, rounding=ROUND_DOWN) for weight in weights]
+    remainder = int((fee - sum(shares)) / CENT)
+    for index in sorted(range(len(weights)), key=lambda index: -weights[index])[:remainder]:
+        shares[index] += CENT
+    return shares
+
+
+class OrderRestaurant(models.Model):
+    """
+    Denormalized link between an order and each restaurant it contains.
+    Written when the order is created so tenant-scoped order queries can
+    use a single index instead of joining through items and products.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='restaurant_links'
+    )
+    restaurant = models.ForeignKey(
+        'restaurant.Restaurant',
+        on_delete=models.CASCADE,
+        related_name='order_links'
+    )
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # This restaurant's share of the order's delivery fee, see split_delivery_fee
+    delivery_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    items_count = models.PositiveIntegerField(default=0)
+    order_created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-order_created_at']
+        unique_together = ['order', 'restaurant']
+        indexes = [
+            models.Index(
+                fields=['restaurant', '-order_created_at'],
+                name='order_link_restaurant_recent',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.order_id} - {self.restaurant_id}"
+
+    @classmethod
+    def build_for_order(cls, order, order_items):
+        """Build (unsaved) restaurant links from an order's items"""
+        links = {}
+        for item in order_items:
+            restaurant_id = item.product.restaurant_id
+            link = links.get(restaurant_id)
+            if link is None:
+                link = links[restaurant_id] = cls(
+                    order=order,
+                    restaurant_id=restaurant_id,
+                    subtotal=0,
+                    items_count=0,
+                    order_created_at=order.created_at,
+                )
+            link.subtotal += item.total_price
+            link.items_count += 1
+        links = list(links.values())
+        shares = split_delivery_fee(order.delivery_fee, [link.subtotal for link in links])
+        for link, share in zip(links, shares):
+            link.delivery_fee = share
+        return links
+
+    @classmethod
+    def sync_for_order(cls, order):
+        """
+        Rewrite an order's links from its saved items, for changes made
+        outside the order API (e.g. items edited in the admin)
+        """
+        links = cls.build_for_order(order, order.items.select_related('product'))
+        with transaction.atomic():
+            cls.objects.filter(order=order).exclude(
+                restaurant_id__in=[link.restaurant_id for link in links]
+            ).delete()
+            cls.objects.bulk_create(
+                links,
+                update_conflicts=True,
+                unique_fields=['order', 'restaurant'],
+                update_fields=['subtotal', 'delivery_fee', 'items_count'],
+            )
+
+
+class OrderEvent(models.Model):
+    """
+    Transactional outbox for order side effects.
+    Rows are written in the same transaction as the order change and are
+    drained by the run_outbox_worker management command.
+    """
+    TYPE_CHOICES = [
+        ('order_created', 'Order Created'),
+        ('status_changed', 'Status Changed'),
+    ]
+
+    STATE_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('dead', 'Dead'),
+    ]
+
+    # Sequential primary key keeps events in commit order
+    id = models.BigAutoField(primary_key=True)
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='events'
+    )
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    payload = models.JSONField(default=dict, blank=True)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['available_at'],
+                name='order_event_pending',
+                condition=models.Q(state='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.type} - {self.order_id} ({self.state})"
+
+
+class ArchivedOrder(models.Model):
+    """
+    Closed order moved out of the hot order tables by the archive_orders
+    command. Items are kept as a snapshot since they are never updated.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)  # Same id as the original order
+    user = models.ForeignKey(
+        'user_account.User',
+        on_delete=models.CASCADE,
+        related_name='archived_orders'
+    )
+    total = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    delivery_address = models.TextField()
+    delivery_fee = models.DecimalField(max_digits=10, decimal_places=2)
+    payment_method = models.CharField(max_length=20, choices=Order.PAYMENT_METHOD_CHOICES)
+    payment_status = models.CharField(max_length=20, choices=Order.PAYMENT_STATUS_CHOICES)
+    delivery_time = models.DateTimeField(blank=True, null=True)
+    delivered_at = models.DateTimeField(blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    items = models.JSONField(default=list, blank=True)  # Snapshot of the order items
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='archived_order_user_recent'),
+            models.Index(fields=['-created_at', '-id'], name='archived_order_recent'),
+        ]
+
+    def __str__(self):
+        return f"Archived order {self.id}"
+
+
+class ArchivedOrderRestaurant(models.Model):
+    """Restaurant link of an archived order, mirroring OrderRestaurant"""
+    id = models.UUIDField(primary_key=True, editable=False)  # Same id as the original link
+    order = models.ForeignKey(
+        ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name='restaurant_links'
+    )
+    restaurant = models.ForeignKey(
+        'restaurant.Restaurant',
+        on_delete=models.CASCADE,
+        related_name='archived_order_links'
+    )
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2)
+    items_count = models.PositiveIntegerField()
+    order_created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-order_created_at']
+        unique_together = ['order', 'restaurant']
+        indexes = [
+            models.Index(
+                fields=['restaurant', '-order_created_at'],
+                name='archived_link_restaurant',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.order_id} - {self.restaurant_id}"
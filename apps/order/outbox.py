@@ -0,0 +1,170 @@
+"""
+Order outbox: events are written by the order signals in the same
+transaction as the order change, then drained in batches by the
+run_outbox_worker management command.
+"""
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.notification.models import Notification
+from apps.user_account.models import User
+from .models import OrderEvent
+from . import feed
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(seconds=30)
+
+STATUS_MESSAGES = {
+    'confirmed': 'Your order has been confirmed and is being prepared.',
+    'preparing': 'Your order is being prepared by the restaurant.',
+    'ready': 'Your order is ready for pickup/delivery!',
+    'delivering': 'Your order is out for delivery!',
+    'delivered': 'Your order has been delivered. Enjoy your meal!',
+    'cancelled': 'Your order has been cancelled.',
+}
+
+
+def enqueue(order, event_type, **payload):
+    """Write an outbox event for the given order"""
+    event = OrderEvent.objects.create(
+        order=order,
+        type=event_type,
+        status=order.status,
+        payload=payload,
+    )
+    # Wake live feed waiters once the event is visible to other connections
+    transaction.on_commit(feed.broker.publish)
+    return event
+
+
+def process_batch(batch_size=100):
+    """
+    Claim and dispatch one batch of pending events.
+    Returns the number of events claimed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            OrderEvent.objects.select_for_update(skip_locked=True).filter(
+                state='pending',
+                available_at__lte=now
+            ).select_related('order__user').order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        try:
+            with transaction.atomic():
+                dispatch(events)
+        except Exception:
+            # Retry one by one so a single bad event cannot block the batch
+            logger.exception('Outbox batch failed, retrying events individually')
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        dispatch([event])
+                except Exception as exc:
+                    _mark_failed(event, exc, now)
+                else:
+                    _mark_processed([event], now)
+        else:
+            _mark_processed(events, now)
+
+    return len(events)
+
+
+def dispatch(events):
+    """
+    Fan events out into notifications with a single bulk insert, then let
+    other apps (e.g. sales rollups) process the batch in the same transaction.
+    """
+    from .signals import order_events_processed
+
+    notifications = []
+    notifications.extend(_restaurant_notifications(
+        [event for event in events if event.type == 'order_created']
+    ))
+    notifications.extend(_customer_notifications(
+        [event for event in events if event.type == 'status_changed']
+    ))
+    Notification.objects.bulk_create(notifications)
+    order_events_processed.send(sender=OrderEvent, events=events)
+
+
+def _restaurant_notifications(events):
+    """
+    Notify every restaurant in newly created orders: its first admin and
+    all of its staff
+    """
+    if not events:
+        return []
+
+    orders = {event.order_id: event.order for event in events}
+    recipients = User.objects.filter(
+        role__in=['restaurant_admin', 'staff'],
+        restaurant__order_links__order_id__in=orders
+    ).values_list('id', 'role', 'restaurant_id', 'restaurant__order_links__order_id').order_by('pk')
+
+    notifications = []
+    notified_admins = set()
+    for user_id, role, restaurant_id, order_id in recipients:
+        order = orders[order_id]
+        if role == 'restaurant_admin':
+            # One admin per restaurant, the first one
+            if (order_id, restaurant_id) in notified_admins:
+                continue
+            notified_admins.add((order_id, restaurant_id))
+            message = f"You have a new order from {order.user.name}. Total: ${order.total}"
+        else:
+            message = f"New order from {order.user.name}. Total: ${order.total}"
+        notifications.append(Notification(
+            user_id=user_id,
+            title=f"New Order #{str(order.id)[:8]}",
+            message=message,
+            type='order_update',
+            order=order
+        ))
+    return notifications
+
+
+def _customer_notifications(events):
+    """Notify customers of the status recorded on each event"""
+    return [
+        Notification(
+            user_id=event.order.user_id,
+            title=f"Order #{str(event.order_id)[:8]} Update",
+            message=STATUS_MESSAGES.get(
+                event.status,
+                f'Your order status has been updated to {event.status}.'
+            ),
+            type='order_update',
+            order=event.order
+        )
+        for event in events
+    ]
+
+
+def _mark_processed(events, now):
+    OrderEvent.objects.filter(id__in=[event.id for event in events]).update(
+        state='processed',
+        processed_at=now,
+        attempts=F('attempts') + 1,
+        last_error=None
+    )
+
+
+def _mark_failed(event, exc, now):
+    """Schedule a retry with linear backoff, or dead-letter the event"""
+    attempts = event.attempts + 1
+    state = 'dead' if attempts >= MAX_ATTEMPTS else 'pending'
+    OrderEvent.objects.filter(id=event.id).update(
+        state=state,
+        attempts=attempts,
+        last_error=repr(exc),
+        available_at=now + RETRY_DELAY * attempts
+    )
+    logger.warning('Outbox event %s failed (attempt %s): %r', event.id, attempts, exc)
@@ -1,5 +1,9 @@
+from decimal import Decimal
+from django.db import transaction
 from rest_framework import serializers
-from .models import Order, OrderItem
+from .models import Order, OrderItem, OrderRestaurant, ArchivedOrder
+from apps.discount import pricing
+from apps.product.models import Product
 from apps.product.serializers import ProductListSerializer
 from apps.user_account.serializers import UserSerializer
 
@@ -16,10 +20,17 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
 
 class OrderItemCreateSerializer(serializers.ModelSerializer):
-    """Serializer for creating order items"""
+    """
+    Serializer for creating order items.
+    Products are resolved in bulk by OrderCreateSerializer and unit prices
+    are always taken from the product on the server.
+    """
+    product = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
+
     class Meta:
         model = OrderItem
-        fields = ['product', 'quantity', 'unit_price']
+        fields = ['product', 'quantity']
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -33,10 +44,10 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'user', 'total', 'status', 'delivery_address',
             'delivery_fee', 'payment_method', 'payment_status',
-            'delivery_time', 'notes', 'created_at', 'updated_at',
+            'delivery_time', 'delivered_at', 'notes', 'created_at', 'updated_at',
             'items', 'items_count', 'restaurants'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'delivered_at', 'created_at', 'updated_at']
 
     def get_restaurants(self, obj):
         """Get restaurants involved in this order"""
@@ -45,6 +56,27 @@ class OrderSerializer(serializers.ModelSerializer):
         return RestaurantListSerializer(restaurants, many=True).data
 
 
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """Read-only serializer for archived orders"""
+    restaurants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedOrder
+        fields = [
+            'id', 'total', 'status', 'delivery_address',
+            'delivery_fee', 'payment_method', 'payment_status',
+            'delivery_time', 'delivered_at', 'notes', 'created_at', 'updated_at',
+            'archived_at', 'items', 'restaurants'
+        ]
+        read_only_fields = fields
+
+    def get_restaurants(self, obj):
+        return [
+            {'id': link.restaurant_id, 'name': link.restaurant.name, 'subtotal': link.subtotal}
+            for link in obj.restaurant_links.all()
+        ]
+
+
 class OrderCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating orders"""
     items = OrderItemCreateSerializer(many=True, write_only=True)
@@ -57,17 +89,58 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'total', 'status', 'payment_status', 'created_at']
 
+    def validate_items(self, items):
+        """Load every referenced product in one query and merge duplicate lines"""
+        if not items:
+            raise serializers.ValidationError("An order must contain at least one item")
+
+        quantities = {}
+        for item in items:
+            quantities[item['product']] = quantities.get(item['product'], 0) + item['quantity']
+
+        products = Product.objects.in_bulk(list(quantities))
+        missing = [str(product_id) for product_id in quantities if product_id not in products]
+        if missing:
+            raise serializers.ValidationError(f"Invalid product ids: {', '.join(missing)}")
+
+        out_of_stock = [product.name for product in products.values() if not product.in_stock]
+        if out_of_stock:
+            raise serializers.ValidationError(f"Products out of stock: {', '.join(out_of_stock)}")
+
+        # Charge current prices even where a discount started or ended since the last repricing
+        pricing.apply_due(products.values())
+
+        return [
+            {'product': products[product_id], 'quantity': quantity}
+            for product_id, quantity in quantities.items()
+        ]
+
     def create(self, validated_data):
         items_data = validated_data.pop('items')
-        order = Order.objects.create(**validated_data)
-        
-        total = 0
+
+        order_items = []
+        total = Decimal('0.00')
         for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
-            total += item_data['unit_price'] * item_data['quantity']
-        
-        order.total = total
-        order.save()
+            product = item_data['product']
+            unit_price = product.final_price
+            total_price = unit_price * item_data['quantity']
+            order_items.append(OrderItem(
+                product=product,
+                quantity=item_data['quantity'],
+                unit_price=unit_price,
+                total_price=total_price,
+            ))
+            total += total_price
+
+        # The order row is written once with its final total, then all items in one insert
+        with transaction.atomic():
+            order = Order.objects.create(total=total, **validated_data)
+            for order_item in order_items:
+                order_item.order = order
+            OrderItem.objects.bulk_create(order_items)
+            OrderRestaurant.objects.bulk_create(
+                OrderRestaurant.build_for_order(order, order_items)
+            )
         return order
 
 
@@ -76,3 +149,26 @@ class OrderUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['status', 'payment_status', 'delivery_time']
+
+    def validate_status(self, value):
+        """Only allow status changes listed in Order.TRANSITIONS"""
+        if self.instance and value != self.instance.status and not self.instance.can_transition_to(value):
+            raise serializers.ValidationError(
+                f"Order cannot move from {self.instance.status} to {value}"
+            )
+        return value
+
+    def update(self, instance, validated_data):
+        status = validated_data.pop('status', instance.status)
+        with transaction.atomic():
+            # Status goes through the conditional UPDATE so concurrent changes cannot both win
+            if status != instance.status and not instance.transition_to(status):
+                raise serializers.ValidationError(
+                    {'status': f"Order cannot move from {instance.status} to {status}"}
+                )
+
+            if validated_data:
+                for attr, value in validated_data.items():
+                    setattr(instance, attr, value)
+                instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
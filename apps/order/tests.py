@@ -1,3 +1,225 @@
-from django.test import TestCase
+import io
+import threading
+import unittest
+from decimal import Decimal
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.common.pagination import KeysetPagination
+from apps.notification.models import Notification
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
+from apps.user_account.models import User
+from . import archive
+from .models import ArchivedOrder, Order, OrderEvent, OrderItem, OrderRestaurant
+from .views import OrderViewSet
 
-# Create your tests here.
+
+def create_order(user, product, quantity=1):
+    """An order for one product, with its restaurant links"""
+    order = Order.objects.create(user=user, delivery_address='1 Main St', payment_method='cash')
+    OrderItem.objects.create(order=order, product=product, quantity=quantity, unit_price=product.price)
+    OrderRestaurant.sync_for_order(order)
+    return order
+
+
+class OrderHistoryTests(TestCase):
+    """Archived orders, listed for each role"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        other = Restaurant.objects.create(name='Suya Spot', address='2 Main St', phone='2', email='s@example.com')
+        product = Product.objects.create(name='Jollof', price=Decimal('10.00'), restaurant=cls.restaurant)
+        other_product = Product.objects.create(name='Suya', price=Decimal('8.00'), restaurant=other)
+        cls.customer = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+        cls.staff = User.objects.create_user(
+            email='staff@example.com', name='Staff', password='x', role='staff', restaurant=cls.restaurant
+        )
+        cls.restaurant_admin = User.objects.create_user(
+            email='owner@example.com', name='Owner', password='x', role='restaurant_admin', restaurant=cls.restaurant
+        )
+        for _ in range(3):
+            create_order(cls.customer, product)
+        create_order(cls.customer, other_product)
+        Order.objects.update(status='delivered', delivered_at=timezone.now())
+        OrderEvent.objects.update(state='processed')
+        archive.archive_batch(timezone.now())
+
+    def history(self, user, params=None):
+        request = APIRequestFactory().get('/api/orders/history/', params or {})
+        force_authenticate(request, user=user)
+        response = OrderViewSet.as_view({'get': 'history'})(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_restaurant_users_see_their_archived_orders(self):
+        for user in [self.staff, self.restaurant_admin]:
+            with self.subTest(role=user.role):
+                data = self.history(user)
+                self.assertEqual(data['count'], 3)
+
+    def test_restaurant_users_page_archived_orders_by_cursor(self):
+        newest = ArchivedOrder.objects.filter(restaurant_links__restaurant=self.restaurant).first()
+        cursor = KeysetPagination().encode_cursor(newest.created_at, newest.pk)
+        for user in [self.staff, self.restaurant_admin]:
+            with self.subTest(role=user.role):
+                first = self.history(user, {'cursor': ''})
+                self.assertEqual(len(first['results']), 3)
+                self.assertEqual(first['results'][0]['id'], str(newest.pk))
+                rest = self.history(user, {'cursor': cursor})
+                self.assertEqual(len(rest['results']), 2)
+                self.assertNotIn(str(newest.pk), [order['id'] for order in rest['results']])
+
+    def test_customer_sees_all_their_archived_orders(self):
+        self.assertEqual(self.history(self.customer)['count'], 4)
+
+
+class OrderTransitionTests(TestCase):
+    """Conditional status updates and their outbox events"""
+
+    @classmethod
+    def setUpTestData(cls):
+        restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        cls.product = Product.objects.create(name='Jollof', price=Decimal('10.00'), restaurant=restaurant)
+        cls.customer = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+        cls.restaurant_admin = User.objects.create_user(
+            email='owner@example.com', name='Owner', password='x', role='restaurant_admin', restaurant=restaurant
+        )
+
+    def setUp(self):
+        self.order = create_order(self.customer, self.product)
+
+    def advance(self, *statuses):
+        for status in statuses:
+            self.assertTrue(self.order.transition_to(status), status)
+
+    def status_events(self):
+        return list(OrderEvent.objects.filter(order=self.order, type='status_changed').values_list('status', flat=True))
+
+    def run_worker(self):
+        call_command('run_outbox_worker', once=True, stdout=io.StringIO())
+
+    def test_illegal_transitions_are_rejected(self):
+        for status in ['preparing', 'ready', 'delivering', 'delivered', 'pending']:
+            with self.subTest(status=status):
+                self.assertFalse(self.order.transition_to(status))
+        self.advance('confirmed', 'cancelled')
+        self.assertFalse(self.order.transition_to('confirmed'))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'cancelled')
+        self.assertEqual(self.status_events(), ['confirmed', 'cancelled'])
+
+    def test_only_one_of_two_racing_transitions_wins(self):
+        # Both copies were loaded while the order was pending
+        other = Order.objects.get(pk=self.order.pk)
+        self.assertTrue(self.order.transition_to('confirmed'))
+        self.assertFalse(other.transition_to('confirmed'))
+        self.assertEqual(other.status, 'pending')
+        self.assertEqual(Order.objects.get(pk=self.order.pk).status, 'confirmed')
+        self.assertEqual(self.status_events(), ['confirmed'])
+
+    def test_delivered_at_is_set_once(self):
+        self.advance('confirmed', 'preparing', 'ready', 'delivering', 'delivered')
+        delivered_at = Order.objects.get(pk=self.order.pk).delivered_at
+        self.assertIsNotNone(delivered_at)
+        self.assertEqual(self.order.delivered_at, delivered_at)
+
+        self.assertFalse(self.order.transition_to('delivered'))
+        self.order.notes = 'Left at the door'
+        self.order.save()
+        self.assertEqual(Order.objects.get(pk=self.order.pk).delivered_at, delivered_at)
+
+    def test_save_sets_delivered_at(self):
+        self.order.status = 'delivered'
+        self.order.save()
+        delivered_at = Order.objects.get(pk=self.order.pk).delivered_at
+        self.assertIsNotNone(delivered_at)
+        self.order.save()
+        self.assertEqual(Order.objects.get(pk=self.order.pk).delivered_at, delivered_at)
+
+    def test_one_event_per_transition(self):
+        self.assertEqual(OrderEvent.objects.filter(order=self.order, type='order_created').count(), 1)
+        self.advance('confirmed', 'preparing')
+        self.order.save()  # No status change, no event
+        self.order.status = 'ready'
+        self.order.save()
+        self.assertEqual(self.status_events(), ['confirmed', 'preparing', 'ready'])
+
+    def test_worker_consumes_each_event_once(self):
+        self.advance('confirmed', 'cancelled')
+        self.run_worker()
+        self.run_worker()
+
+        self.assertFalse(OrderEvent.objects.exclude(state='processed').exists())
+        self.assertEqual(set(OrderEvent.objects.values_list('attempts', flat=True)), {1})
+        self.assertEqual(Notification.objects.filter(user=self.customer, order=self.order).count(), 2)
+        self.assertEqual(Notification.objects.filter(user=self.restaurant_admin, order=self.order).count(), 1)
+
+        # A rejected transition leaves nothing for the worker
+        self.assertFalse(self.order.transition_to('confirmed'))
+        self.run_worker()
+        self.assertEqual(Notification.objects.filter(order=self.order).count(), 3)
+
+
+class NewOrderNotificationTests(TestCase):
+    """Who hears about a new order"""
+
+    def test_first_admin_and_every_staff_member_are_notified(self):
+        restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        product = Product.objects.create(name='Jollof', price=Decimal('10.00'), restaurant=restaurant)
+        customer = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+        admins = [
+            User.objects.create_user(
+                email=f'owner{index}@example.com', name='Owner', password='x', role='restaurant_admin', restaurant=restaurant
+            )
+            for index in range(2)
+        ]
+        staff = [
+            User.objects.create_user(
+                email=f'staff{index}@example.com', name='Staff', password='x', role='staff', restaurant=restaurant
+            )
+            for index in range(2)
+        ]
+        order = create_order(customer, product)
+        call_command('run_outbox_worker', once=True, stdout=io.StringIO())
+
+        first_admin = min(admins, key=lambda user: user.pk)
+        self.assertCountEqual(
+            Notification.objects.filter(order=order).values_list('user_id', flat=True),
+            [first_admin.pk] + [user.pk for user in staff]
+        )
+
+
+@unittest.skipIf(connection.vendor == 'sqlite', 'SQLite test databases do not take concurrent writers')
+class OrderTransitionRaceTests(TransactionTestCase):
+    """Transitions from separate connections at the same time"""
+
+    def test_exactly_one_concurrent_transition_wins(self):
+        restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        product = Product.objects.create(name='Jollof', price=Decimal('10.00'), restaurant=restaurant)
+        customer = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+        order = create_order(customer, product)
+
+        barrier = threading.Barrier(2)
+        results = []
+
+        def confirm():
+            try:
+                copy = Order.objects.get(pk=order.pk)
+                barrier.wait()
+                results.append(copy.transition_to('confirmed'))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=confirm) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), [False, True])
+        self.assertEqual(Order.objects.get(pk=order.pk).status, 'confirmed')
+        self.assertEqual(OrderEvent.objects.filter(order=order, type='status_changed').count(), 1)
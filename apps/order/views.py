@@ -1,9 +1,16 @@
+import math
+from django.db.models import F, Prefetch
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Order, OrderItem
-from .serializers import OrderSerializer, OrderCreateSerializer, OrderUpdateSerializer
+from apps.common.pagination import KeysetPagination
+from .models import Order, ArchivedOrder, ArchivedOrderRestaurant
+from . import feed as order_feed
+from .serializers import (
+    OrderSerializer, OrderCreateSerializer, OrderUpdateSerializer, ArchivedOrderSerializer
+)
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -12,6 +19,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     """
     queryset = Order.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status', 'payment_status', 'payment_method']
     ordering_fields = ['created_at', 'total']
@@ -32,26 +40,87 @@ class OrderViewSet(viewsets.ModelViewSet):
         
         # Super admin sees all orders
         if user.role == 'admin' or user.is_superuser:
-            return Order.objects.all()
+            queryset = Order.objects.all()
         
         # Restaurant admin sees orders for their restaurant
         elif user.role == 'restaurant_admin' and user.restaurant:
-            # Get orders that contain products from their restaurant
-            return Order.objects.filter(
-                items__product__restaurant=user.restaurant
-            ).distinct()
+            # One link row per order and restaurant, so no DISTINCT is needed
+            queryset = Order.objects.filter(
+                restaurant_links__restaurant=user.restaurant
+            ).annotate(link_created_at=F('restaurant_links__order_created_at'))
         
         # Staff sees orders for their restaurant
         elif user.role == 'staff' and user.restaurant:
-            return Order.objects.filter(
-                items__product__restaurant=user.restaurant
-            ).distinct()
+            queryset = Order.objects.filter(
+                restaurant_links__restaurant=user.restaurant
+            ).annotate(link_created_at=F('restaurant_links__order_created_at'))
         
         # Regular users see only their own orders
         else:
-            return Order.objects.filter(user=user)
+            queryset = Order.objects.filter(user=user)
+
+        # Only load the nested graph when the response serializes it
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.with_details()
+        return queryset
+
+    @property
+    def restaurant_scoped(self):
+        """Whether the user sees the orders of their restaurant"""
+        user = self.request.user
+        if user.role == 'admin' or user.is_superuser:
+            return False
+        return user.role in ['restaurant_admin', 'staff'] and user.restaurant is not None
+
+    @property
+    def keyset_field(self):
+        """Date the cursor pages on, see filter_queryset"""
+        if self.restaurant_scoped:
+            return 'link_created_at'
+        return 'created_at'
+
+    def filter_queryset(self, queryset):
+        """
+        Restaurant lists sort on the links' copy of created_at, so the
+        (restaurant, -order_created_at) index serves the filter and the sort.
+        It is annotated in get_queryset: filtering the relation again would
+        join a second link row.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.restaurant_scoped:
+            queryset = queryset.order_by(*[
+                field.replace('created_at', 'link_created_at')
+                for field in queryset.query.order_by
+            ])
+        return queryset
+
+    def get_archived_queryset(self):
+        """Archived orders, scoped and annotated like get_queryset"""
+        user = self.request.user
+
+        if user.role == 'admin' or user.is_superuser:
+            queryset = ArchivedOrder.objects.all()
+
+        elif user.role == 'restaurant_admin' and user.restaurant:
+            queryset = ArchivedOrder.objects.filter(
+                restaurant_links__restaurant=user.restaurant
+            ).annotate(link_created_at=F('restaurant_links__order_created_at'))
+
+        elif user.role == 'staff' and user.restaurant:
+            queryset = ArchivedOrder.objects.filter(
+                restaurant_links__restaurant=user.restaurant
+            ).annotate(link_created_at=F('restaurant_links__order_created_at'))
+
+        else:
+            queryset = ArchivedOrder.objects.filter(user=user)
+
+        return queryset.prefetch_related(
+            Prefetch('restaurant_links', ArchivedOrderRestaurant.objects.select_related('restaurant'))
+        )
 
     def get_serializer_class(self):
+        if self.action == 'history':
+            return ArchivedOrderSerializer
         if self.action == 'create':
             return OrderCreateSerializer
         elif self.action in ['update', 'partial_update']:
@@ -66,9 +135,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     def cancel(self, request, pk=None):
         """Cancel an order"""
         order = self.get_object()
-        if order.status in ['pending', 'confirmed']:
-            order.status = 'cancelled'
-            order.save()
+        if order.transition_to('cancelled'):
             return Response({'message': 'Order cancelled successfully'})
         return Response(
             {'error': 'Order cannot be cancelled at this stage'},
@@ -79,9 +146,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     def confirm(self, request, pk=None):
         """Confirm an order (for restaurant staff)"""
         order = self.get_object()
-        if order.status == 'pending':
-            order.status = 'confirmed'
-            order.save()
+        if order.transition_to('confirmed'):
             return Response({'message': 'Order confirmed successfully'})
         return Response(
             {'error': 'Order cannot be confirmed at this stage'},
@@ -92,11 +157,80 @@ class OrderViewSet(viewsets.ModelViewSet):
     def mark_delivered(self, request, pk=None):
         """Mark an order as delivered"""
         order = self.get_object()
-        if order.status == 'delivering':
-            order.status = 'delivered'
-            order.save()
+        if order.transition_to('delivered'):
             return Response({'message': 'Order marked as delivered'})
         return Response(
             {'error': 'Order cannot be marked as delivered at this stage'},
             status=status.HTTP_400_BAD_REQUEST
-        )
\ No newline at end of file
+        )
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        Archived (closed and older) orders, read from the archive tables.
+        Supports the same filters, ordering and pagination as the order list.
+        """
+        queryset = self.filter_queryset(self.get_archived_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """
+        Live order feed for restaurant admins and staff.
+        - ?since=<cursor>: only events after the cursor (omit it to get the current cursor)
+        - ?transport=poll|longpoll|sse: answer immediately, wait for events, or stream them
+        - ?timeout=<seconds>: how long longpoll/sse may wait (max 25)
+        """
+        user = request.user
+        if user.role not in ['restaurant_admin', 'staff'] or not user.restaurant:
+            return Response(
+                {'error': 'Only restaurant admins and staff have an order feed'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        transport = request.query_params.get('transport', 'poll')
+        if transport not in ['poll', 'longpoll', 'sse']:
+            return Response(
+                {'error': 'transport must be one of poll, longpoll or sse'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        since = request.query_params.get('since') or request.headers.get('Last-Event-ID')
+        try:
+            since = int(since) if since else None
+            timeout = float(request.query_params.get('timeout', order_feed.MAX_WAIT))
+            if not math.isfinite(timeout):
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': 'since must be an integer cursor and timeout a number of seconds'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        timeout = order_feed.bounded(timeout)
+
+        if transport == 'sse':
+            response = StreamingHttpResponse(
+                order_feed.stream_events(user.restaurant, since, timeout),
+                content_type='text/event-stream'
+            )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'
+            return response
+
+        if since is None:
+            return Response({'cursor': order_feed.latest_cursor(), 'events': []})
+
+        if transport == 'longpoll':
+            events = order_feed.wait_for_events(user.restaurant, since, timeout)
+        else:
+            events = order_feed.fetch_events(user.restaurant, since)
+
+        return Response({
+            'cursor': events[-1]['id'] if events else since,
+            'events': events
+        })
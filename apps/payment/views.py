@@ -1,10 +1,11 @@
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.mixins import ConditionalGetMixin
 from .models import PaymentMethod
 from .serializers import PaymentMethodSerializer, PaymentMethodListSerializer
 
 
-class PaymentMethodViewSet(viewsets.ModelViewSet):
+class PaymentMethodViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing payment methods.
     """
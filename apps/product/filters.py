@@ -0,0 +1,27 @@
+import django_filters
+from rest_framework import filters
+from .models import Product
+
+
+class ProductFilter(django_filters.FilterSet):
+    """Product filters; price ranges use the effective price"""
+    min_price = django_filters.NumberFilter(field_name='effective_price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='effective_price', lookup_expr='lte')
+
+    class Meta:
+        model = Product
+        fields = ['restaurant', 'category', 'is_flash_sale', 'in_stock']
+
+
+class ProductOrderingFilter(filters.OrderingFilter):
+    """?ordering=price sorts by the effective price, the price customers pay"""
+    aliases = {'price': 'effective_price'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [
+            ('-' if field.startswith('-') else '') + self.aliases.get(field.lstrip('-'), field.lstrip('-'))
+            for field in ordering
+        ]
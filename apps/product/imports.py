@@ -0,0 +1,226 @@
+"""
+Bulk product import.
+Rows come from a CSV or JSON-lines upload and are read as a stream. Each
+chunk of rows is validated, resolved against the database with a few
+queries and written with bulk_create/bulk_update in its own transaction.
+Products are matched on (restaurant, name): a known name updates the
+product with the given columns only, a new name creates it. Rows that
+change nothing are not written.
+bulk_create/bulk_update skip Product.save() and model signals, so the
+effective prices, the catalog cache and the search index are refreshed here.
+"""
+import csv
+import io
+import json
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+from apps.category.models import Category
+from apps.common.cache import invalidate
+from apps.discount.pricing import apply as apply_prices
+from apps.restaurant.models import Restaurant
+from apps.search.engine import index_products
+from .models import Product
+from .serializers import ProductImportSerializer
+
+# Columns holding a list; in CSV files the items are separated by ';'
+LIST_FIELDS = ['ingredients', 'allergens']
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be read as the expected format"""
+
+
+def detect_format(upload):
+    """'csv' or 'jsonl', from the file name or content type"""
+    name = (upload.name or '').lower()
+    content_type = (upload.content_type or '').lower()
+    if name.endswith('.csv') or content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')) or content_type in ('application/jsonl', 'application/x-ndjson'):
+        return 'jsonl'
+    raise ImportFormatError('Upload a .csv or .jsonl file')
+
+
+def _csv_rows(stream):
+    reader = csv.DictReader(stream)
+    nullable = {
+        field.name for field in Product._meta.get_fields()
+        if getattr(field, 'null', False) and not field.many_to_many
+    }
+    for row in reader:
+        data = {}
+        for column, value in row.items():
+            if column is None:
+                continue  # More cells than header columns
+            column = column.strip()
+            value = (value or '').strip()
+            if column in LIST_FIELDS:
+                data[column] = [item.strip() for item in value.split(';') if item.strip()]
+            elif value:
+                data[column] = value
+            elif column in nullable:
+                data[column] = None
+        yield reader.line_num, data
+
+
+def _jsonl_rows(stream):
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield line_num, data
+
+
+def read_rows(upload):
+    """(line number, row dict) for every row of the upload, read lazily"""
+    file_format = detect_format(upload)
+    upload.open()
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    rows = _csv_rows(stream) if file_format == 'csv' else _jsonl_rows(stream)
+    return _reading(rows, stream)
+
+
+def _reading(rows, stream):
+    try:
+        yield from rows
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f'Unreadable file: {e}')
+    finally:
+        stream.detach()
+
+
+def import_products(rows, restaurant=None, chunk_size=None, max_rows=None):
+    """
+    Import rows from read_rows(). Restaurant admins and staff pass their
+    restaurant, which overrides any restaurant column; otherwise every row
+    must name its restaurant. Returns the import report.
+    """
+    chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+    max_rows = max_rows or settings.PRODUCT_IMPORT_MAX_ROWS
+    report = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0, 'errors': []}
+    seen = {}  # (restaurant id, name) -> line of the row that set it
+    rows = iter(rows)
+    total = 0
+
+    while True:
+        try:
+            chunk = list(islice(rows, min(chunk_size, max_rows - total + 1)))
+        except ImportFormatError as e:
+            _fail(report, None, {'non_field_errors': [str(e)]})
+            break
+        if not chunk:
+            break
+        if total + len(chunk) > max_rows:
+            chunk = chunk[:max_rows - total]
+            _import_chunk(chunk, restaurant, report, seen)
+            _fail(report, None, {'non_field_errors': [f'Only the first {max_rows} rows were imported']})
+            break
+        total += len(chunk)
+        _import_chunk(chunk, restaurant, report, seen)
+
+    report['errors'].sort(key=lambda error: (error['row'] is None, error['row'] or 0))
+    return report
+
+
+def _fail(report, line_num, errors):
+    report['failed'] += 1
+    report['errors'].append({'row': line_num, 'errors': errors})
+
+
+def _import_chunk(chunk, restaurant, report, seen):
+    # One serializer for the chunk: building its fields costs more than validating a row
+    serializer = ProductImportSerializer()
+    valid = []
+    for line_num, data in chunk:
+        if not isinstance(data, dict):
+            _fail(report, line_num, {'non_field_errors': ['Not a JSON object']})
+            continue
+        if restaurant is not None:
+            data['restaurant'] = restaurant.id
+        try:
+            validated_data = serializer.run_validation(data)
+        except ValidationError as e:
+            _fail(report, line_num, as_serializer_error(e))
+            continue
+        if 'restaurant' not in validated_data:
+            _fail(report, line_num, {'restaurant': ['This field is required.']})
+            continue
+        valid.append((line_num, validated_data))
+
+    # Everything the chunk refers to, in one query per table
+    restaurants = {restaurant.id: restaurant} if restaurant is not None else Restaurant.objects.in_bulk(
+        {data['restaurant'] for _, data in valid}
+    )
+    categories = Category.objects.in_bulk(
+        {data['category'] for _, data in valid if data.get('category')}
+    )
+    existing = {}
+    products = Product.objects.filter(
+        restaurant_id__in=restaurants,
+        name__in={data['name'] for _, data in valid}
+    ).select_related('category').order_by('created_at')
+    for product in products:
+        existing.setdefault((product.restaurant_id, product.name), product)
+
+    created, updated, update_fields = [], [], {'updated_at'}
+    now = timezone.now()
+    for line_num, data in valid:
+        restaurant_id = data.pop('restaurant')
+        if restaurant_id not in restaurants:
+            _fail(report, line_num, {'restaurant': [f'Invalid pk "{restaurant_id}" - object does not exist.']})
+            continue
+        if 'category' in data:
+            category_id = data.pop('category')
+            if category_id and category_id not in categories:
+                _fail(report, line_num, {'category': [f'Invalid pk "{category_id}" - object does not exist.']})
+                continue
+            data['category'] = categories.get(category_id)
+
+        key = (restaurant_id, data['name'])
+        if key in seen:
+            _fail(report, line_num, {'name': [f'Duplicate of row {seen[key]}']})
+            continue
+
+        product = existing.get(key)
+        if product is None:
+            if 'price' not in data:
+                _fail(report, line_num, {'price': ['This field is required.']})
+                continue
+            product = Product(restaurant=restaurants[restaurant_id], **data)
+            created.append(product)
+        else:
+            changed = [field for field, value in data.items() if getattr(product, field) != value]
+            for field in changed:
+                setattr(product, field, data[field])
+            if changed:
+                product.updated_at = now
+                update_fields.update(changed)
+                updated.append(product)
+            else:
+                report['unchanged'] += 1
+        seen[key] = line_num
+
+    if not created and not updated:
+        return
+
+    stored_prices = [(product.effective_price, product.price_valid_until) for product in updated]
+    apply_prices(created + updated)
+    if stored_prices != [(product.effective_price, product.price_valid_until) for product in updated]:
+        update_fields.update(['effective_price', 'price_valid_until'])
+    with transaction.atomic():
+        Product.objects.bulk_create(created)
+        # Small batches keep each CASE statement cheap to plan
+        Product.objects.bulk_update(updated, sorted(update_fields), batch_size=100)
+        index_products(created + updated)
+        for restaurant_id in {product.restaurant_id for product in created + updated}:
+            invalidate(restaurant_id)
+
+    report['created'] += len(created)
+    report['updated'] += len(updated)
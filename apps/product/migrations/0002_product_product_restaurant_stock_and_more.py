@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("category", "0001_initial"),
+        ("product", "0001_initial"),
+        ("restaurant", "0002_restaurant_restaurant_active_top"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["restaurant", "in_stock"], name="product_restaurant_stock"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("in_stock", True)),
+                fields=["-rating", "name"],
+                name="product_in_stock_top",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("in_stock", True), ("is_flash_sale", True)),
+                fields=["-created_at"],
+                name="product_flash_sale_recent",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(
+                    ("discount_price__isnull", False), ("in_stock", True)
+                ),
+                fields=["-created_at"],
+                name="product_discounted_recent",
+            ),
+        ),
+    ]
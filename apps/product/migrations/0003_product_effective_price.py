@@ -0,0 +1,81 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:20
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_effective_price(apps, schema_editor):
+    # Manual discount prices only; marking every price due lets
+    # recompute_prices apply the active discounts
+    Product = apps.get_model("product", "Product")
+    Product.objects.update(
+        effective_price=models.Case(
+            models.When(
+                discount_price__lt=models.F("price"), then=models.F("discount_price")
+            ),
+            default=models.F("price"),
+        ),
+        price_valid_until=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("category", "0001_initial"),
+        ("product", "0002_product_product_restaurant_stock_and_more"),
+        ("restaurant", "0004_restaurantmenu"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="product",
+            name="product_discounted_recent",
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="effective_price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="price_valid_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_effective_price, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(
+                    ("effective_price__lt", models.F("price")), ("in_stock", True)
+                ),
+                fields=["-created_at"],
+                name="product_discounted_recent",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("in_stock", True)),
+                fields=["effective_price"],
+                name="product_in_stock_price",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["restaurant", "effective_price"],
+                name="product_restaurant_price",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("price_valid_until__isnull", False)),
+                fields=["price_valid_until"],
+                name="product_price_due",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:30
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_sum(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    Review = apps.get_model("review", "Review")
+    sums = (
+        Review.objects.filter(product=models.OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(total=models.Sum("rating"))
+        .values("total")
+    )
+    Product.objects.update(rating_sum=Coalesce(models.Subquery(sums), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0003_product_effective_price"),
+        ("review", "0003_review_review_product_recent_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
@@ -10,6 +10,9 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     discount_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     discount_percentage = models.IntegerField(default=0)
+    # Lowest current price after discount_price and active discounts (see apps/discount/pricing.py)
+    effective_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    price_valid_until = models.DateTimeField(blank=True, null=True)  # Next discount start or end
     image = models.URLField(blank=True, null=True)
     category = models.ForeignKey(
         'category.Category',
@@ -27,6 +30,13 @@ class Product(models.Model):
     is_flash_sale = models.BooleanField(default=False)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
     reviews_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)  # Sum of review ratings, rating = rating_sum / reviews_count
+    # Reviews per star rating, kept by Review
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
     ingredients = models.JSONField(default=list, blank=True)  # List of ingredients
     allergens = models.JSONField(default=list, blank=True)  # List of allergens
     calories = models.IntegerField(blank=True, null=True)
@@ -36,31 +46,78 @@ class Product(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Tenant listings and the restaurant menu
+            models.Index(fields=['restaurant', 'in_stock'], name='product_restaurant_stock'),
+            # Public listing, ordered by rating
+            models.Index(
+                fields=['-rating', 'name'],
+                condition=models.Q(in_stock=True),
+                name='product_in_stock_top',
+            ),
+            # Flash sale and discounted lists, newest first
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(in_stock=True, is_flash_sale=True),
+                name='product_flash_sale_recent',
+            ),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(in_stock=True, effective_price__lt=models.F('price')),
+                name='product_discounted_recent',
+            ),
+            # Sorting and price ranges, public and per restaurant
+            models.Index(
+                fields=['effective_price'],
+                condition=models.Q(in_stock=True),
+                name='product_in_stock_price',
+            ),
+            models.Index(fields=['restaurant', 'effective_price'], name='product_restaurant_price'),
+            # Prices due for recomputing
+            models.Index(
+                fields=['price_valid_until'],
+                condition=models.Q(price_valid_until__isnull=False),
+                name='product_price_due',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.restaurant.name}"
 
+    def save(self, *args, **kwargs):
+        """Refresh the effective price when the fields it depends on are saved"""
+        from apps.discount.pricing import PRICE_FIELDS, apply
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(PRICE_FIELDS):
+            apply([self])
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'effective_price', 'price_valid_until'}
+        super().save(*args, **kwargs)
+
     @property
     def is_discounted(self):
         """Check if product has discount"""
-        return self.discount_price is not None and self.discount_price < self.price
+        return self.final_price < self.price
 
     @property
     def final_price(self):
-        """Get the final price (discounted or regular)"""
-        return self.discount_price if self.is_discounted else self.price
+        """
+        Get the final price (after discount_price and active discounts).
+        Reads the stored price, which recompute_prices keeps current; order
+        creation reprices due products itself (pricing.apply_due).
+        """
+        if self.effective_price is not None:
+            return self.effective_price
+        if self.discount_price is not None and self.discount_price < self.price:
+            return self.discount_price
+        return self.price
 
     @property
     def average_rating(self):
-        """Calculate average rating from reviews"""
-        from apps.review.models import Review
-        reviews = Review.objects.filter(product=self)
-        if reviews.exists():
-            return reviews.aggregate(models.Avg('rating'))['rating__avg'] or 0.00
-        return 0.00
+        """Average review rating, kept in the rating column by Review"""
+        return self.rating
 
     @property
     def total_reviews(self):
-        """Get total number of reviews"""
-        from apps.review.models import Review
-        return Review.objects.filter(product=self).count()
\ No newline at end of file
+        """Number of reviews, kept in the reviews_count column by Review"""
+        return self.reviews_count
\ No newline at end of file
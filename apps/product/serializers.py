@@ -52,3 +52,16 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
             'in_stock', 'is_flash_sale', 'ingredients', 'allergens',
             'calories', 'preparation_time'
         ]
+
+
+class ProductImportSerializer(ProductCreateUpdateSerializer):
+    """
+    One row of a bulk import. Restaurant and category are plain ids here:
+    the importer resolves them once per chunk instead of once per row.
+    """
+    restaurant = serializers.UUIDField(required=False)
+    category = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta(ProductCreateUpdateSerializer.Meta):
+        # Existing products are matched on (restaurant, name); other fields may be omitted
+        extra_kwargs = {'price': {'required': False}}
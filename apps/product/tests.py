@@ -1,3 +1,35 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from apps.restaurant.models import Restaurant
+from .models import Product
+from .views import ProductViewSet
 
-# Create your tests here.
+
+class ProductListQueryTests(TestCase):
+    """Serializing product lists does not reprice products one by one"""
+
+    @classmethod
+    def setUpTestData(cls):
+        restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        for index in range(10):
+            Product.objects.create(name=f'Dish {index}', price=Decimal('10.00') + index, restaurant=restaurant)
+
+    def list_queries(self):
+        cache.clear()
+        request = APIRequestFactory().get('/api/products/')
+        with CaptureQueriesContext(connection) as context:
+            response = ProductViewSet.as_view({'get': 'list'})(request)
+            response.render()
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_due_prices_do_not_add_queries(self):
+        baseline = self.list_queries()
+        Product.objects.update(price_valid_until=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self.list_queries(), baseline)
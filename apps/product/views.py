@@ -1,24 +1,33 @@
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
+from apps.common.cache import cache_response, catalog_scope
+from apps.common.mixins import ConditionalGetMixin
+from apps.common.pagination import KeysetPagination
+from apps.search.filters import FullTextSearchFilter
+from .filters import ProductFilter, ProductOrderingFilter
+from .imports import ImportFormatError, import_products, read_rows
 from .models import Product
 from .serializers import ProductSerializer, ProductListSerializer, ProductCreateUpdateSerializer
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing products.
     Multi-tenant: Restaurant admins and staff only see their restaurant's products.
     """
     queryset = Product.objects.all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['restaurant', 'category', 'is_flash_sale', 'in_stock']
-    search_fields = ['name', 'description', 'ingredients']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, ProductOrderingFilter]
+    filterset_class = ProductFilter
     ordering_fields = ['name', 'price', 'rating', 'created_at']
     ordering = ['-rating', 'name']
+    # Product responses embed their restaurant and category
+    validator_fields = ['updated_at', 'restaurant__updated_at', 'category__updated_at']
 
     def get_queryset(self):
         """
@@ -28,7 +37,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         - Staff: sees only their restaurant's products
         - Regular users/unauthorized: sees all in-stock products
         """
-        queryset = Product.objects.all()
+        queryset = Product.objects.select_related('restaurant', 'category')
         user = self.request.user
         
         if user.is_authenticated:
@@ -51,6 +60,13 @@ class ProductViewSet(viewsets.ModelViewSet):
         # Unauthorized users see all in-stock products
         return queryset.filter(in_stock=True)
 
+    def get_catalog_scope(self, request, **kwargs):
+        return catalog_scope(request.user)
+
+    @cache_response(get_catalog_scope)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ProductListSerializer
@@ -62,7 +78,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_import']:
             permission_classes = [permissions.IsAuthenticated]
         else:
             permission_classes = [permissions.AllowAny]
@@ -85,7 +101,36 @@ class ProductViewSet(viewsets.ModelViewSet):
             # Admin or regular users can specify restaurant
             serializer.save()
 
+    @action(detail=False, methods=['post'], url_path='bulk-import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        Create or update many products from a CSV or JSON-lines file.
+        Rows are matched on (restaurant, name); invalid rows are skipped
+        and listed in the report with their line number.
+        """
+        user = request.user
+        restaurant = None
+        if user.role in ['restaurant_admin', 'staff'] and user.restaurant:
+            # Same rule as perform_create: their own restaurant only
+            restaurant = user.restaurant
+        elif not (user.role == 'admin' or user.is_superuser):
+            return Response(
+                {'error': 'Only admins and restaurant staff can import products'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = read_rows(upload)
+            report = import_products(rows, restaurant=restaurant)
+        except ImportFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
     @action(detail=False, methods=['get'])
+    @cache_response(get_catalog_scope)
     def flash_sale(self, request):
         """Get all flash sale products (filtered by restaurant for multi-tenant)"""
         products = self.get_queryset().filter(is_flash_sale=True, in_stock=True)
@@ -93,10 +138,11 @@ class ProductViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
+    @cache_response(get_catalog_scope)
     def discounted(self, request):
         """Get all discounted products (filtered by restaurant for multi-tenant)"""
         products = self.get_queryset().filter(
-            discount_price__isnull=False,
+            effective_price__lt=models.F('price'),
             in_stock=True
         )
         serializer = ProductListSerializer(products, many=True)
@@ -104,11 +150,23 @@ class ProductViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def reviews(self, request, pk=None):
-        """Get all reviews for a specific product"""
+        """Get the reviews for a specific product, paginated (also with ?cursor=)"""
         product = self.get_object()
         from apps.review.models import Review
-        from apps.review.serializers import ReviewSerializer
-        
-        reviews = Review.objects.filter(product=product)
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        from apps.review.serializers import ReviewListSerializer
+
+        reviews = Review.objects.filter(product=product).for_listing().order_by('-created_at', '-pk')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(reviews, request, view=self)
+        serializer = ReviewListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def rating_summary(self, request, pk=None):
+        """Rating, review count and reviews per star of a product, from its own row"""
+        from apps.review.serializers import RatingSummarySerializer
+
+        summary = get_object_or_404(
+            self.get_queryset().values(*RatingSummarySerializer.source_fields), pk=pk
+        )
+        return Response(RatingSummarySerializer(summary).data)
\ No newline at end of file
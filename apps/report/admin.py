@@ -0,0 +1,27 @@
+from django.contrib import admin
+from .models import RestaurantSalesHourly, RestaurantSalesDaily, ProductSalesDaily
+
+
+@admin.register(RestaurantSalesDaily)
+class RestaurantSalesDailyAdmin(admin.ModelAdmin):
+    list_display = ['restaurant', 'date', 'order_count', 'gross', 'delivery_fees', 'cancellations']
+    list_filter = ['restaurant', 'date']
+    ordering = ['-date']
+    readonly_fields = ['id', 'updated_at']
+
+
+@admin.register(RestaurantSalesHourly)
+class RestaurantSalesHourlyAdmin(admin.ModelAdmin):
+    list_display = ['restaurant', 'hour', 'order_count', 'gross', 'delivery_fees', 'cancellations']
+    list_filter = ['restaurant']
+    ordering = ['-hour']
+    readonly_fields = ['id', 'updated_at']
+
+
+@admin.register(ProductSalesDaily)
+class ProductSalesDailyAdmin(admin.ModelAdmin):
+    list_display = ['product', 'restaurant', 'date', 'quantity', 'revenue']
+    list_filter = ['restaurant', 'date']
+    search_fields = ['product__name']
+    ordering = ['-date']
+    readonly_fields = ['id', 'updated_at']
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ReportConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.report"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.report.signals  # noqa
@@ -0,0 +1,149 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:59
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("product", "0001_initial"),
+        ("restaurant", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSalesDaily",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_daily",
+                        to="product.product",
+                    ),
+                ),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_sales_daily",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(
+                        fields=["restaurant", "date"],
+                        name="product_sales_restaurant_day",
+                    )
+                ],
+                "unique_together": {("product", "date")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RestaurantSalesDaily",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "gross",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                (
+                    "delivery_fees",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                ("cancellations", models.PositiveIntegerField(default=0)),
+                (
+                    "cancelled_gross",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField()),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_daily",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+                "unique_together": {("restaurant", "date")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RestaurantSalesHourly",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "gross",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                (
+                    "delivery_fees",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                ("cancellations", models.PositiveIntegerField(default=0)),
+                (
+                    "cancelled_gross",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("hour", models.DateTimeField()),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_hourly",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-hour"],
+                "unique_together": {("restaurant", "hour")},
+            },
+        ),
+    ]
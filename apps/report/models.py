@@ -0,0 +1,82 @@
+from django.db import models
+import uuid
+
+
+class SalesRollup(models.Model):
+    """Sales counters shared by the hourly and daily restaurant rollups"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order_count = models.PositiveIntegerField(default=0)
+    gross = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    delivery_fees = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    cancellations = models.PositiveIntegerField(default=0)
+    cancelled_gross = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def net(self):
+        """Gross sales minus cancelled orders"""
+        return self.gross - self.cancelled_gross
+
+
+class RestaurantSalesHourly(SalesRollup):
+    restaurant = models.ForeignKey(
+        'restaurant.Restaurant',
+        on_delete=models.CASCADE,
+        related_name='sales_hourly'
+    )
+    hour = models.DateTimeField()  # Start of the hour the orders were placed in
+
+    class Meta:
+        ordering = ['-hour']
+        unique_together = ['restaurant', 'hour']
+
+    def __str__(self):
+        return f"{self.restaurant_id} - {self.hour:%Y-%m-%d %H:00}"
+
+
+class RestaurantSalesDaily(SalesRollup):
+    restaurant = models.ForeignKey(
+        'restaurant.Restaurant',
+        on_delete=models.CASCADE,
+        related_name='sales_daily'
+    )
+    date = models.DateField()
+
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['restaurant', 'date']
+
+    def __str__(self):
+        return f"{self.restaurant_id} - {self.date}"
+
+
+class ProductSalesDaily(models.Model):
+    """Units and revenue per product and day, excluding cancelled orders"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    restaurant = models.ForeignKey(
+        'restaurant.Restaurant',
+        on_delete=models.CASCADE,
+        related_name='product_sales_daily'
+    )
+    product = models.ForeignKey(
+        'product.Product',
+        on_delete=models.CASCADE,
+        related_name='sales_daily'
+    )
+    date = models.DateField()
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['product', 'date']
+        indexes = [
+            models.Index(fields=['restaurant', 'date'], name='product_sales_restaurant_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} - {self.date}"
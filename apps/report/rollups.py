@@ -0,0 +1,222 @@
+"""
+Restaurant sales rollups.
+apply_order_events() updates the counters incrementally from order events
+drained by the outbox worker, inside the worker's transaction.
+rebuild() recomputes them from scratch with grouped queries; days that
+already contain archived orders are kept as they are. It locks the rollup
+tables and leaves out the events the worker has not applied yet, so it can
+run alongside the worker without counting an order twice.
+Each restaurant is credited with its share of the order's delivery fee
+(OrderRestaurant.delivery_fee), so the fee is counted once per order.
+Buckets use the project time zone (settings.TIME_ZONE).
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncHour
+from django.utils import timezone
+from apps.order.models import ArchivedOrder, OrderEvent, OrderItem, OrderRestaurant
+from .models import RestaurantSalesHourly, RestaurantSalesDaily, ProductSalesDaily
+
+ZERO = Decimal('0.00')
+
+
+def hour_bucket(value):
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(value):
+    return timezone.localtime(value).date()
+
+
+def apply_order_events(events):
+    """Add new orders and cancellations from a batch of order events"""
+    created = {event.order_id for event in events if event.type == 'order_created'}
+    cancelled = {
+        event.order_id for event in events
+        if event.type == 'status_changed' and event.status == 'cancelled'
+    }
+    if not created and not cancelled:
+        return
+
+    hourly = defaultdict(lambda: defaultdict(int))
+    daily = defaultdict(lambda: defaultdict(int))
+    products = defaultdict(lambda: defaultdict(int))
+
+    links = OrderRestaurant.objects.filter(order_id__in=created | cancelled).values(
+        'order_id', 'restaurant_id', 'subtotal', 'delivery_fee', 'order_created_at'
+    )
+    for link in links:
+        deltas = []
+        if link['order_id'] in created:
+            deltas.append({
+                'order_count': 1,
+                'gross': link['subtotal'],
+                'delivery_fees': link['delivery_fee'],
+            })
+        if link['order_id'] in cancelled:
+            deltas.append({'cancellations': 1, 'cancelled_gross': link['subtotal']})
+
+        hour_key = (('restaurant_id', link['restaurant_id']), ('hour', hour_bucket(link['order_created_at'])))
+        day_key = (('restaurant_id', link['restaurant_id']), ('date', day_bucket(link['order_created_at'])))
+        for delta in deltas:
+            for field, value in delta.items():
+                hourly[hour_key][field] += value
+                daily[day_key][field] += value
+
+    items = OrderItem.objects.filter(order_id__in=created | cancelled).values(
+        'order_id', 'product_id', 'product__restaurant_id', 'quantity', 'total_price', 'order__created_at'
+    )
+    for item in items:
+        # Product sales exclude cancelled orders, so a cancellation takes them back out
+        sign = (item['order_id'] in created) - (item['order_id'] in cancelled)
+        if not sign:
+            continue
+        key = (
+            ('product_id', item['product_id']),
+            ('date', day_bucket(item['order__created_at'])),
+        )
+        products[key]['restaurant_id'] = item['product__restaurant_id']
+        products[key]['quantity'] += sign * item['quantity']
+        products[key]['revenue'] += sign * item['total_price']
+
+    _apply_deltas(RestaurantSalesHourly, hourly)
+    _apply_deltas(RestaurantSalesDaily, daily)
+    _apply_deltas(ProductSalesDaily, products, static_fields=['restaurant_id'])
+
+
+def _apply_deltas(model, deltas, static_fields=()):
+    """Add deltas to existing rollup rows with F() updates, creating missing rows"""
+    now = timezone.now()
+    for key, values in deltas.items():
+        lookup = dict(key)
+        changes = {
+            field: F(field) + value
+            for field, value in values.items()
+            if field not in static_fields
+        }
+        changes['updated_at'] = now
+        if model.objects.filter(**lookup).update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **values)
+        except IntegrityError:
+            # Another worker created the row first
+            model.objects.filter(**lookup).update(**changes)
+
+
+def _unapplied(**lookups):
+    """Whether the row's order has a matching event the worker has not applied yet"""
+    return Exists(
+        OrderEvent.objects.filter(order_id=OuterRef('order_id'), **lookups).exclude(state='processed')
+    )
+
+
+def _lock_rollups():
+    """
+    Make the worker's rollup writes wait until the rebuild commits, and wait
+    for batches already writing. SQLite already allows a single writer.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    tables = ', '.join(
+        connection.ops.quote_name(model._meta.db_table)
+        for model in [RestaurantSalesHourly, RestaurantSalesDaily, ProductSalesDaily]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {tables} IN SHARE ROW EXCLUSIVE MODE')
+
+
+def rebuild(restaurant_id=None, batch_size=1000):
+    """
+    Recompute the rollup rows from the order tables.
+    Buckets up to the day of the newest archived order are left untouched,
+    since their orders are no longer in the order tables.
+    Orders and cancellations whose events are still pending are left for
+    the worker to add once the rebuild has committed.
+    Returns the number of rows written per rollup model.
+    """
+    created_pending = _unapplied(type='order_created')
+    cancelled = Q(order__status='cancelled') & ~_unapplied(type='status_changed', status='cancelled')
+    links = OrderRestaurant.objects.filter(~created_pending)
+    items = OrderItem.objects.filter(~created_pending).exclude(cancelled)
+    hour_scope = {}
+    day_scope = {}
+    if restaurant_id:
+        links = links.filter(restaurant_id=restaurant_id)
+        items = items.filter(product__restaurant_id=restaurant_id)
+        hour_scope['restaurant_id'] = day_scope['restaurant_id'] = restaurant_id
+
+    archived = ArchivedOrder.objects.order_by('-created_at').values_list('created_at', flat=True).first()
+    if archived:
+        start = timezone.localtime(archived).replace(hour=0, minute=0, second=0, microsecond=0)
+        start += timedelta(days=1)
+        links = links.filter(order_created_at__gte=start)
+        items = items.filter(order__created_at__gte=start)
+        hour_scope['hour__gte'] = start
+        day_scope['date__gte'] = start.date()
+
+    written = {}
+    with transaction.atomic():
+        _lock_rollups()
+        for model, bucket_field, trunc, bucket_scope in [
+            (RestaurantSalesHourly, 'hour', TruncHour('order_created_at'), hour_scope),
+            (RestaurantSalesDaily, 'date', TruncDate('order_created_at'), day_scope),
+        ]:
+            model.objects.filter(**bucket_scope).delete()
+            rows = links.annotate(bucket=trunc).values('restaurant_id', 'bucket').annotate(
+                order_count=Count('id'),
+                gross=Sum('subtotal'),
+                delivery_fees=Sum('delivery_fee'),
+                cancellations=Count('id', filter=cancelled),
+                cancelled_gross=Coalesce(Sum('subtotal', filter=cancelled), ZERO),
+            ).order_by()
+            written[model.__name__] = _bulk_insert(model, (
+                model(
+                    restaurant_id=row['restaurant_id'],
+                    order_count=row['order_count'],
+                    gross=row['gross'],
+                    delivery_fees=row['delivery_fees'],
+                    cancellations=row['cancellations'],
+                    cancelled_gross=row['cancelled_gross'],
+                    **{bucket_field: row['bucket']}
+                )
+                for row in rows.iterator()
+            ), batch_size)
+
+        ProductSalesDaily.objects.filter(**day_scope).delete()
+        rows = items.annotate(date=TruncDate('order__created_at')).values(
+            'product_id', 'product__restaurant_id', 'date'
+        ).annotate(
+            quantity=Sum('quantity'),
+            revenue=Sum('total_price'),
+        ).order_by()
+        written[ProductSalesDaily.__name__] = _bulk_insert(ProductSalesDaily, (
+            ProductSalesDaily(
+                restaurant_id=row['product__restaurant_id'],
+                product_id=row['product_id'],
+                date=row['date'],
+                quantity=row['quantity'],
+                revenue=row['revenue'],
+            )
+            for row in rows.iterator()
+        ), batch_size)
+    return written
+
+
+def _bulk_insert(model, objects, batch_size):
+    count = 0
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+        count += len(batch)
+    return count
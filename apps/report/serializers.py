@@ -0,0 +1,24 @@
+from rest_framework import serializers
+from .models import RestaurantSalesHourly, RestaurantSalesDaily
+
+
+class RestaurantSalesHourlySerializer(serializers.ModelSerializer):
+    net = serializers.ReadOnlyField()
+
+    class Meta:
+        model = RestaurantSalesHourly
+        fields = [
+            'hour', 'order_count', 'gross', 'delivery_fees',
+            'cancellations', 'cancelled_gross', 'net'
+        ]
+
+
+class RestaurantSalesDailySerializer(serializers.ModelSerializer):
+    net = serializers.ReadOnlyField()
+
+    class Meta:
+        model = RestaurantSalesDaily
+        fields = [
+            'date', 'order_count', 'gross', 'delivery_fees',
+            'cancellations', 'cancelled_gross', 'net'
+        ]
@@ -0,0 +1,10 @@
+from django.dispatch import receiver
+from apps.order.models import OrderEvent
+from apps.order.signals import order_events_processed
+from . import rollups
+
+
+@receiver(order_events_processed, sender=OrderEvent)
+def update_sales_rollups(sender, events, **kwargs):
+    """Fold each outbox batch into the sales rollups in the worker's transaction"""
+    rollups.apply_order_events(events)
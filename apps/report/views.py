@@ -0,0 +1,99 @@
+import uuid
+from datetime import datetime, time, timedelta
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from .models import RestaurantSalesHourly, RestaurantSalesDaily, ProductSalesDaily
+from .serializers import RestaurantSalesHourlySerializer, RestaurantSalesDailySerializer
+
+TOTAL_FIELDS = ['order_count', 'gross', 'delivery_fees', 'cancellations', 'cancelled_gross']
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def sales_dashboard(request):
+    """
+    Sales dashboard served from the precomputed rollup tables.
+    - ?granularity=daily|hourly (default: daily)
+    - ?start=YYYY-MM-DD&end=YYYY-MM-DD (default: the last 30 days)
+    - ?restaurant={id} (platform admins only; restaurant users see their own)
+    """
+    user = request.user
+    if user.role == 'admin' or user.is_superuser:
+        try:
+            restaurant_id = uuid.UUID(request.query_params.get('restaurant', ''))
+        except ValueError:
+            return Response(
+                {'error': 'restaurant must be a restaurant id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    elif user.role in ['restaurant_admin', 'staff'] and user.restaurant:
+        restaurant_id = user.restaurant_id
+    else:
+        return Response(
+            {'error': 'Only restaurant admins and staff can view sales'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    granularity = request.query_params.get('granularity', 'daily')
+    if granularity not in ['daily', 'hourly']:
+        return Response(
+            {'error': 'granularity must be daily or hourly'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    today = timezone.localdate()
+    end = parse_date(request.query_params.get('end', '')) or today
+    start = parse_date(request.query_params.get('start', '')) or end - timedelta(days=29)
+    if start > end:
+        return Response(
+            {'error': 'start must be on or before end'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if granularity == 'hourly':
+        tz = timezone.get_current_timezone()
+        rows = RestaurantSalesHourly.objects.filter(
+            restaurant_id=restaurant_id,
+            hour__gte=datetime.combine(start, time.min, tzinfo=tz),
+            hour__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)
+        ).order_by('hour')
+        series = RestaurantSalesHourlySerializer(rows, many=True).data
+    else:
+        rows = RestaurantSalesDaily.objects.filter(
+            restaurant_id=restaurant_id,
+            date__range=(start, end)
+        ).order_by('date')
+        series = RestaurantSalesDailySerializer(rows, many=True).data
+
+    totals = {field: sum(getattr(row, field) for row in rows) for field in TOTAL_FIELDS}
+    totals['net'] = totals['gross'] - totals['cancelled_gross']
+
+    top_products = ProductSalesDaily.objects.filter(
+        restaurant_id=restaurant_id,
+        date__range=(start, end)
+    ).values('product_id', 'product__name').annotate(
+        quantity=Sum('quantity'),
+        revenue=Sum('revenue')
+    ).order_by('-quantity')[:10]
+
+    return Response({
+        'restaurant': restaurant_id,
+        'granularity': granularity,
+        'start': start,
+        'end': end,
+        'totals': totals,
+        'series': series,
+        'top_products': [
+            {
+                'product': row['product_id'],
+                'name': row['product__name'],
+                'quantity': row['quantity'],
+                'revenue': row['revenue'],
+            }
+            for row in top_products
+        ],
+    })
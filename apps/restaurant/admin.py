@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Restaurant
+from .models import Restaurant, RestaurantMenu
 
 
 @admin.register(Restaurant)
@@ -16,16 +16,34 @@ class RestaurantAdmin(admin.ModelAdmin):
             'fields': ('name', 'description', 'logo', 'banner')
         }),
         ('Contact Information', {
-            'fields': ('address', 'phone', 'email')
+            'fields': ('address', 'latitude', 'longitude', 'phone', 'email')
         }),
         ('Settings', {
             'fields': ('is_partner', 'is_active', 'rating', 'delivery_time')
         }),
         ('Pricing', {
-            'fields': ('delivery_fee', 'minimum_order')
+            'fields': ('delivery_fee', 'minimum_order', 'loyalty_multiplier')
+        }),
+        ('Opening Hours', {
+            'fields': ('opening_hours', 'timezone')
         }),
         ('Metadata', {
             'fields': ('id', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         })
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(RestaurantMenu)
+class RestaurantMenuAdmin(admin.ModelAdmin):
+    list_display = ['restaurant', 'is_stale', 'revision', 'built_at']
+    list_filter = ['is_stale']
+    search_fields = ['restaurant__name']
+    readonly_fields = ['restaurant', 'document', 'etag', 'is_stale', 'revision', 'built_at']
+    actions = ['mark_stale']
+
+    @admin.action(description='Rebuild selected menus')
+    def mark_stale(self, request, queryset):
+        from django.db.models import F
+        updated = queryset.update(is_stale=True, revision=F('revision') + 1)
+        self.message_user(request, f'{updated} menus queued for rebuilding')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RestaurantConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.restaurant"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.restaurant.signals  # noqa
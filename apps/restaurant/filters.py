@@ -0,0 +1,33 @@
+import django_filters
+from django.utils import timezone
+from .models import Restaurant, RestaurantOpeningInterval
+
+
+class RestaurantFilter(django_filters.FilterSet):
+    """
+    ?open_now=true: restaurants open at the current time
+    ?open_at=<ISO datetime>: restaurants open at that time
+    """
+    open_now = django_filters.BooleanFilter(method='filter_open_now')
+    open_at = django_filters.IsoDateTimeFilter(method='filter_open_at')
+
+    class Meta:
+        model = Restaurant
+        fields = ['is_partner']
+
+    def filter_open_now(self, queryset, name, value):
+        if value is None:
+            return queryset
+        return self.filter_open(queryset, timezone.now(), value)
+
+    def filter_open_at(self, queryset, name, value):
+        return self.filter_open(queryset, value, True)
+
+    @staticmethod
+    def filter_open(queryset, moment, is_open=True):
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        open_ids = RestaurantOpeningInterval.open_at(moment).values('restaurant_id')
+        if is_open:
+            return queryset.filter(pk__in=open_ids)
+        return queryset.exclude(pk__in=open_ids)
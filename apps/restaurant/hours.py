@@ -0,0 +1,107 @@
+"""
+Opening hours as minute-of-week intervals.
+Restaurant.opening_hours maps days to opening times in the restaurant's
+own timezone, e.g.
+
+    {"monday": "09:00-22:00", "friday": ["12:00-15:00", "18:00-02:00"],
+     "sunday": "closed"}
+
+Days are full or three-letter English names; a day may also hold
+{"open": "09:00", "close": "22:00"}. Times past midnight continue into the
+next day. parse() turns this into [start, end) minutes counted from Monday
+00:00 local time, which RestaurantOpeningInterval stores so "open at"
+queries are a range lookup.
+"""
+import re
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+CLOSED = {'', 'closed', 'none'}
+ALL_DAY = {'24h', 'open', 'always'}
+
+_RANGE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$')
+
+
+def _day_index(key):
+    key = str(key).strip().lower()
+    for index, day in enumerate(DAYS):
+        if key == day or key == day[:3]:
+            return index
+    raise ValueError(f'Unknown day "{key}"')
+
+
+def _ranges(value):
+    """(open, close) minutes of the day from one day's value"""
+    if isinstance(value, dict):
+        value = f"{value.get('open', '')}-{value.get('close', '')}"
+    if isinstance(value, str):
+        if value.strip().lower() in CLOSED:
+            return []
+        if value.strip().lower() in ALL_DAY:
+            return [(0, MINUTES_PER_DAY)]
+        value = value.split(',')
+    if not isinstance(value, list):
+        raise ValueError(f'Invalid opening hours "{value}"')
+
+    ranges = []
+    for item in value:
+        match = _RANGE.match(str(item))
+        if not match:
+            raise ValueError(f'Invalid time range "{item}", expected HH:MM-HH:MM')
+        open_hour, open_minute, close_hour, close_minute = map(int, match.groups())
+        start = open_hour * 60 + open_minute
+        end = close_hour * 60 + close_minute
+        # 24:00 is the end of the day; nothing comes after it
+        if open_minute > 59 or close_minute > 59 or start > MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            raise ValueError(f'Invalid time range "{item}"')
+        if end <= start:
+            end += MINUTES_PER_DAY  # Closes after midnight
+        ranges.append((start, end))
+    return ranges
+
+
+def parse(opening_hours):
+    """
+    Merged [start, end) minute-of-week intervals for an opening_hours dict.
+    Raises ValueError when it cannot be read.
+    """
+    if not opening_hours:
+        return []
+    if not isinstance(opening_hours, dict):
+        raise ValueError('Opening hours must map days to times')
+
+    intervals = []
+    for key, value in opening_hours.items():
+        day_start = _day_index(key) * MINUTES_PER_DAY
+        for start, end in _ranges(value):
+            start, end = day_start + start, day_start + end
+            if end > MINUTES_PER_WEEK:
+                # Sunday night into Monday morning
+                intervals.append((start, MINUTES_PER_WEEK))
+                intervals.append((0, end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((start, end))
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def validate_timezone(name):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f'Unknown timezone "{name}"')
+
+
+def minute_of_week(moment, timezone_name):
+    """Minutes since Monday 00:00 of an aware datetime, in a timezone"""
+    local = moment.astimezone(ZoneInfo(timezone_name))
+    return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
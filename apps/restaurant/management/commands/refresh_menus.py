@@ -0,0 +1,57 @@
+"""
+Management command to rebuild stale restaurant menus.
+Runs continuously by default; use --once to rebuild the current stale
+menus and exit, or --all to queue every menu first.
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.restaurant import menus
+
+
+class Command(BaseCommand):
+    help = 'Rebuild pre-rendered restaurant menus whose inputs changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Menus rebuilt per transaction (default: 50)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when no menu is stale (default: 2)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Rebuild the currently stale menus and exit'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Mark every existing menu stale before starting'
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            menus.mark_stale()
+
+        total = 0
+        self.stdout.write(self.style.SUCCESS('Menu worker started'))
+        try:
+            while True:
+                rebuilt = menus.refresh_batch(options['batch_size'])
+                total += rebuilt
+                if rebuilt:
+                    self.stdout.write(f'Rebuilt {rebuilt} menus ({total} total)')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Menu worker stopped after {total} menus'))
@@ -0,0 +1,118 @@
+"""
+Pre-rendered restaurant menus.
+A menu document holds the restaurant, its products grouped by category
+with their prices, stock flags and ratings. It is rendered once into
+RestaurantMenu and the cache, and served as-is by the menu endpoint.
+Catalog changes mark menus stale (see signals.py); the refresh_menus
+command rebuilds them, and the endpoint serves the previous document
+until then.
+"""
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+from apps.product.models import Product
+from .models import Restaurant, RestaurantMenu
+from .serializers import MenuProductSerializer, MenuRestaurantSerializer
+
+
+def cache_key(restaurant_id):
+    return f'menu:{restaurant_id}'
+
+
+def render(restaurant):
+    """Menu document of a restaurant as JSON bytes"""
+    products = Product.objects.filter(restaurant=restaurant).select_related('category').order_by('name')
+    categories = {}
+    for product in products:
+        category = product.category
+        key = category.id if category else None
+        if key not in categories:
+            categories[key] = {
+                'id': key,
+                'name': category.name if category else 'Other',
+                'icon': category.icon if category else None,
+                'products': [],
+            }
+        categories[key]['products'].append(MenuProductSerializer(product).data)
+
+    return JSONRenderer().render({
+        'restaurant': MenuRestaurantSerializer(restaurant).data,
+        'rating': {
+            'average': restaurant.rating,
+            'count': restaurant.reviews_count,
+        },
+        # Named categories first, alphabetically; uncategorized products last
+        'categories': sorted(categories.values(), key=lambda group: (group['id'] is None, group['name'])),
+        'generated_at': timezone.now(),
+    })
+
+
+def build(restaurant_id):
+    """
+    Render and store the menu of a restaurant.
+    Returns (etag, document), or None when the restaurant is gone or inactive.
+    """
+    restaurant = Restaurant.objects.filter(pk=restaurant_id, is_active=True).first()
+    if restaurant is None:
+        RestaurantMenu.objects.filter(restaurant_id=restaurant_id).delete()
+        transaction.on_commit(lambda: cache.delete(cache_key(restaurant_id)))
+        return None
+
+    menu, _ = RestaurantMenu.objects.get_or_create(restaurant=restaurant)
+    document = render(restaurant).decode()
+    etag = quote_etag(hashlib.md5(document.encode()).hexdigest())
+    RestaurantMenu.objects.filter(pk=menu.pk).update(
+        document=document,
+        etag=etag,
+        built_at=timezone.now()
+    )
+    # Inputs that changed while rendering keep the menu stale for the next run
+    RestaurantMenu.objects.filter(pk=menu.pk, revision=menu.revision).update(is_stale=False)
+    transaction.on_commit(lambda: cache.set(
+        cache_key(restaurant_id), (etag, document), settings.CATALOG_CACHE_TIMEOUT
+    ))
+    return etag, document
+
+
+def mark_stale(restaurant_id=None):
+    """Mark one restaurant's menu, or every menu, for rebuilding"""
+    menus = RestaurantMenu.objects.all()
+    if restaurant_id:
+        menus = menus.filter(restaurant_id=restaurant_id)
+    menus.update(is_stale=True, revision=F('revision') + 1)
+
+
+def get(restaurant_id):
+    """(etag, document) of a restaurant's menu: one cache lookup in the common case"""
+    menu = cache.get(cache_key(restaurant_id))
+    if menu is not None:
+        return menu
+
+    menu = RestaurantMenu.objects.filter(
+        restaurant_id=restaurant_id,
+        restaurant__is_active=True
+    ).values_list('etag', 'document').first()
+    if menu is None:
+        # First visit: build it now instead of waiting for the worker
+        with transaction.atomic():
+            return build(restaurant_id)
+    cache.set(cache_key(restaurant_id), tuple(menu), settings.CATALOG_CACHE_TIMEOUT)
+    return tuple(menu)
+
+
+def refresh_batch(batch_size=50):
+    """Rebuild a batch of stale menus; returns the number rebuilt"""
+    with transaction.atomic():
+        restaurant_ids = list(
+            RestaurantMenu.objects.filter(is_stale=True).select_for_update(
+                skip_locked=True
+            ).order_by('built_at').values_list('restaurant_id', flat=True)[:batch_size]
+        )
+        for restaurant_id in restaurant_ids:
+            build(restaurant_id)
+    return len(restaurant_ids)
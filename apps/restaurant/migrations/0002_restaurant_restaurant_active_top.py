@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurant", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="restaurant",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-rating", "name"],
+                name="restaurant_active_top",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:07
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_reviews_count(apps, schema_editor):
+    Restaurant = apps.get_model("restaurant", "Restaurant")
+    Review = apps.get_model("review", "Review")
+    counts = (
+        Review.objects.filter(restaurant=models.OuterRef("pk"))
+        .order_by()
+        .values("restaurant")
+        .annotate(count=models.Count("pk"))
+        .values("count")
+    )
+    Restaurant.objects.update(reviews_count=Coalesce(models.Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurant", "0002_restaurant_restaurant_active_top"),
+        ("review", "0003_review_review_product_recent_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="reviews_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reviews_count, migrations.RunPython.noop),
+    ]
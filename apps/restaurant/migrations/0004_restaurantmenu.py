@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:13
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurant", "0003_restaurant_reviews_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RestaurantMenu",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("document", models.TextField(blank=True)),
+                ("etag", models.CharField(blank=True, max_length=64)),
+                ("is_stale", models.BooleanField(default=True)),
+                ("revision", models.PositiveIntegerField(default=0)),
+                ("built_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "restaurant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="menu",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("is_stale", True)),
+                        fields=["built_at"],
+                        name="restaurant_menu_stale",
+                    )
+                ],
+            },
+        ),
+    ]
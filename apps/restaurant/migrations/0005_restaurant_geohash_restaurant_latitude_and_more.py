@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurant", "0004_restaurantmenu"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="geohash",
+            field=models.CharField(blank=True, db_index=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="latitude",
+            field=models.DecimalField(
+                blank=True, decimal_places=6, max_digits=9, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="longitude",
+            field=models.DecimalField(
+                blank=True, decimal_places=6, max_digits=9, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.restaurant.hours import parse
+
+
+def backfill_opening_intervals(apps, schema_editor):
+    Restaurant = apps.get_model("restaurant", "Restaurant")
+    RestaurantOpeningInterval = apps.get_model(
+        "restaurant", "RestaurantOpeningInterval"
+    )
+    intervals = []
+    for restaurant in Restaurant.objects.exclude(opening_hours={}).iterator():
+        try:
+            ranges = parse(restaurant.opening_hours)
+        except ValueError:
+            continue  # Unreadable hours: closed until edited
+        intervals.extend(
+            RestaurantOpeningInterval(
+                restaurant_id=restaurant.id,
+                timezone=restaurant.timezone,
+                start_minute=start,
+                end_minute=end,
+            )
+            for start, end in ranges
+        )
+    RestaurantOpeningInterval.objects.bulk_create(intervals, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurant", "0005_restaurant_geohash_restaurant_latitude_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="timezone",
+            field=models.CharField(default="UTC", max_length=64),
+        ),
+        migrations.CreateModel(
+            name="RestaurantOpeningInterval",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("timezone", models.CharField(max_length=64)),
+                ("start_minute", models.PositiveIntegerField()),
+                ("end_minute", models.PositiveIntegerField()),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="opening_intervals",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["restaurant", "start_minute"],
+                "indexes": [
+                    models.Index(
+                        fields=["timezone", "start_minute", "end_minute"],
+                        name="opening_interval_lookup",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_opening_intervals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:33
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_counts(apps, schema_editor):
+    Restaurant = apps.get_model("restaurant", "Restaurant")
+    Review = apps.get_model("review", "Review")
+    counts = {}
+    for rating in range(1, 6):
+        reviews = (
+            Review.objects.filter(restaurant=models.OuterRef("pk"), rating=rating)
+            .order_by()
+            .values("restaurant")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        counts[f"rating_{rating}_count"] = Coalesce(models.Subquery(reviews), 0)
+    Restaurant.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurant", "0007_restaurant_rating_sum"),
+        ("review", "0003_review_review_product_recent_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="rating_1_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="rating_2_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="rating_3_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="rating_4_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="rating_5_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_counts, migrations.RunPython.noop),
+    ]
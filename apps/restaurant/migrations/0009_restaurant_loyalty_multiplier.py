@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "restaurant",
+            "0008_restaurant_rating_1_count_restaurant_rating_2_count_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="loyalty_multiplier",
+            field=models.DecimalField(decimal_places=2, default=1.0, max_digits=4),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
 from django.utils import timezone
 import uuid
 
@@ -10,37 +12,162 @@ class Restaurant(models.Model):
     banner = models.URLField(blank=True, null=True)
     description = models.TextField(blank=True, null=True)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    reviews_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)  # Sum of review ratings, rating = rating_sum / reviews_count
+    # Reviews per star rating, kept by Review
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
     delivery_time = models.CharField(max_length=50, blank=True, null=True)
     cuisine_type = models.JSONField(default=list, blank=True)  # List of cuisine types
     is_partner = models.BooleanField(default=False)
     active_discounts = models.IntegerField(default=0)
     address = models.TextField()
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)  # Set from the coordinates on save
     phone = models.CharField(max_length=20)
     email = models.EmailField()
     opening_hours = models.JSONField(default=dict, blank=True)  # Opening hours for each day
+    timezone = models.CharField(max_length=64, default=settings.TIME_ZONE)  # Of the opening hours
     delivery_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     minimum_order = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # Loyalty points earned here = subtotal x LOYALTY_POINTS_PER_UNIT x multiplier
+    loyalty_multiplier = models.DecimalField(max_digits=4, decimal_places=2, default=1.00)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Public listing: active restaurants ordered by rating
+            models.Index(
+                fields=['-rating', 'name'],
+                condition=models.Q(is_active=True),
+                name='restaurant_active_top',
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from apps.delivery.geo import encode
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode(float(self.latitude), float(self.longitude))
+        else:
+            self.geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+
     @property
     def average_rating(self):
-        """Calculate average rating from reviews"""
-        from apps.review.models import Review
-        reviews = Review.objects.filter(restaurant=self)
-        if reviews.exists():
-            return reviews.aggregate(models.Avg('rating'))['rating__avg'] or 0.00
-        return 0.00
+        """Average review rating, kept in the rating column by Review"""
+        return self.rating
 
     @property
     def total_reviews(self):
-        """Get total number of reviews"""
-        from apps.review.models import Review
-        return Review.objects.filter(restaurant=self).count()
\ No newline at end of file
+        """Number of reviews, kept in the reviews_count column by Review"""
+        return self.reviews_count
+
+
+class RestaurantMenu(models.Model):
+    """
+    Pre-rendered menu document of a restaurant (see apps/restaurant/menus.py).
+    Marked stale whenever its inputs change and rebuilt by refresh_menus.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    restaurant = models.OneToOneField(
+        Restaurant,
+        on_delete=models.CASCADE,
+        related_name='menu'
+    )
+    document = models.TextField(blank=True)  # Rendered JSON
+    etag = models.CharField(max_length=64, blank=True)
+    is_stale = models.BooleanField(default=True)
+    revision = models.PositiveIntegerField(default=0)  # Bumped on every change of the inputs
+    built_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['built_at'],
+                condition=models.Q(is_stale=True),
+                name='restaurant_menu_stale',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Menu of {self.restaurant_id}"
+
+
+class RestaurantOpeningInterval(models.Model):
+    """
+    One opening interval of a restaurant, in minutes since Monday 00:00
+    local time (end excluded). Derived from Restaurant.opening_hours on
+    save, see apps/restaurant/hours.py.
+    """
+    TIMEZONES_CACHE_KEY = 'restaurant:opening-timezones'
+    # rebuild_for() only clears the key in this process unless the cache is
+    # shared, so other processes pick up a new timezone within this time
+    TIMEZONES_CACHE_TIMEOUT = 60
+
+    id = models.BigAutoField(primary_key=True)
+    restaurant = models.ForeignKey(
+        Restaurant,
+        on_delete=models.CASCADE,
+        related_name='opening_intervals'
+    )
+    timezone = models.CharField(max_length=64)  # Copied from the restaurant: lookups need no join
+    start_minute = models.PositiveIntegerField()
+    end_minute = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['restaurant', 'start_minute']
+        indexes = [
+            # "Open at": one range scan per timezone
+            models.Index(fields=['timezone', 'start_minute', 'end_minute'], name='opening_interval_lookup'),
+        ]
+
+    def __str__(self):
+        return f"{self.restaurant_id} {self.start_minute}-{self.end_minute}"
+
+    @classmethod
+    def rebuild_for(cls, restaurant):
+        """Replace a restaurant's intervals; unreadable opening hours leave it closed"""
+        from .hours import parse, validate_timezone
+        try:
+            validate_timezone(restaurant.timezone)
+            intervals = parse(restaurant.opening_hours)
+        except ValueError:
+            intervals = []
+        cls.objects.filter(restaurant=restaurant).delete()
+        cls.objects.bulk_create([
+            cls(restaurant=restaurant, timezone=restaurant.timezone, start_minute=start, end_minute=end)
+            for start, end in intervals
+        ])
+        transaction.on_commit(lambda: cache.delete(cls.TIMEZONES_CACHE_KEY))
+
+    @classmethod
+    def timezones(cls):
+        """Timezones restaurants have opening hours in (cached)"""
+        return cache.get_or_set(
+            cls.TIMEZONES_CACHE_KEY,
+            lambda: sorted(cls.objects.order_by().values_list('timezone', flat=True).distinct()),
+            cls.TIMEZONES_CACHE_TIMEOUT
+        )
+
+    @classmethod
+    def open_at(cls, moment):
+        """Intervals covering an aware datetime, each in its own timezone"""
+        from .hours import minute_of_week
+        query = models.Q(pk__in=[])
+        for timezone_name in cls.timezones():
+            minute = minute_of_week(moment, timezone_name)
+            query |= models.Q(timezone=timezone_name, start_minute__lte=minute, end_minute__gt=minute)
+        return cls.objects.filter(query)
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from apps.product.models import Product
+from . import hours
 from .models import Restaurant
 
 
@@ -11,11 +13,27 @@ class RestaurantSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'logo', 'banner', 'description', 'rating',
             'delivery_time', 'cuisine_type', 'is_partner', 'active_discounts',
-            'address', 'phone', 'email', 'opening_hours', 'delivery_fee',
-            'minimum_order', 'is_active', 'created_at', 'updated_at',
+            'address', 'latitude', 'longitude', 'phone', 'email',
+            'opening_hours', 'timezone', 'delivery_fee', 'minimum_order',
+            'loyalty_multiplier', 'is_active', 'created_at', 'updated_at',
             'average_rating', 'total_reviews'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'rating']
+        # loyalty_multiplier is set by platform admins in the Django admin
+        read_only_fields = ['id', 'created_at', 'updated_at', 'rating', 'loyalty_multiplier']
+
+    def validate_opening_hours(self, value):
+        try:
+            hours.parse(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+    def validate_timezone(self, value):
+        try:
+            hours.validate_timezone(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
 
 
 class RestaurantListSerializer(serializers.ModelSerializer):
@@ -27,5 +45,31 @@ class RestaurantListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'logo', 'description', 'rating', 'delivery_time',
             'cuisine_type', 'is_partner', 'delivery_fee', 'minimum_order',
-            'average_rating'
+            'latitude', 'longitude', 'average_rating'
+        ]
+
+
+class MenuRestaurantSerializer(serializers.ModelSerializer):
+    """Restaurant part of a menu document"""
+    class Meta:
+        model = Restaurant
+        fields = [
+            'id', 'name', 'logo', 'banner', 'description', 'delivery_time',
+            'cuisine_type', 'is_partner', 'address', 'phone', 'opening_hours',
+            'timezone', 'delivery_fee', 'minimum_order'
+        ]
+
+
+class MenuProductSerializer(serializers.ModelSerializer):
+    """Product entry of a menu document"""
+    is_discounted = serializers.ReadOnlyField()
+    final_price = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Product
+        fields = [
+            'id', 'name', 'description', 'image', 'price', 'discount_price',
+            'discount_percentage', 'final_price', 'is_discounted', 'in_stock',
+            'is_flash_sale', 'rating', 'reviews_count', 'ingredients',
+            'allergens', 'calories', 'preparation_time'
         ]
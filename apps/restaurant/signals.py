@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.common.signals import catalog_changed
+from . import menus
+from .models import Restaurant, RestaurantOpeningInterval
+
+
+@receiver(catalog_changed)
+def mark_menus_stale(sender, restaurant_id, **kwargs):
+    """Menus are built from products, categories, discounts and ratings"""
+    menus.mark_stale(restaurant_id)
+
+
+@receiver(post_save, sender=Restaurant)
+def sync_opening_intervals(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'opening_hours', 'timezone'} & set(update_fields):
+        RestaurantOpeningInterval.rebuild_for(instance)
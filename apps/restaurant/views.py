@@ -1,23 +1,40 @@
-from rest_framework import viewsets, permissions, filters
+import uuid
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.cache import cache_response, catalog_scope
+from apps.common.mixins import ConditionalGetMixin
+from apps.common.pagination import KeysetPagination
+from apps.delivery import geo
+from apps.search.filters import FullTextSearchFilter
+from .filters import RestaurantFilter
 from .models import Restaurant
+from . import menus
 from .serializers import RestaurantSerializer, RestaurantListSerializer
 
 
-class RestaurantViewSet(viewsets.ModelViewSet):
+class RestaurantViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing restaurants.
     """
     queryset = Restaurant.objects.filter(is_active=True)
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['is_partner']
-    search_fields = ['name', 'description', 'cuisine_type']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
+    filterset_class = RestaurantFilter
     ordering_fields = ['name', 'rating', 'created_at']
     ordering = ['-rating', 'name']
 
+    def get_validator_extra(self):
+        # Which restaurants are open changes by the minute, not only when rows change
+        if 'open_now' in self.request.query_params:
+            return timezone.now().replace(second=0, microsecond=0)
+        return None
+
     def get_serializer_class(self):
         if self.action == 'list':
             return RestaurantListSerializer
@@ -33,24 +50,95 @@ class RestaurantViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.AllowAny]
         return [permission() for permission in permission_classes]
 
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """
+        Active restaurants near a point, nearest first.
+        - ?lat=<latitude>&lng=<longitude>: the point
+        - ?radius=<km>: search radius (default 5, max 50)
+        - ?delivers=true: only restaurants with a delivery zone containing the point
+        """
+        try:
+            latitude, longitude = geo.read_point(request.query_params)
+            radius = geo.read_radius(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        index = geo.get_index()
+        found = index.nearby(latitude, longitude, radius)
+        delivering = index.delivering_to(latitude, longitude)
+        if request.query_params.get('delivers') in ['true', '1']:
+            found = [(distance, restaurant_id) for distance, restaurant_id in found if restaurant_id in delivering]
+
+        page = self.paginate_queryset(found)
+        restaurants = Restaurant.objects.filter(is_active=True).in_bulk(
+            [restaurant_id for _, restaurant_id in page]
+        )
+        results = [
+            {
+                **RestaurantListSerializer(restaurants[restaurant_id]).data,
+                'distance_km': round(distance, 2),
+                'delivers': restaurant_id in delivering,
+            }
+            for distance, restaurant_id in page
+            if restaurant_id in restaurants
+        ]
+        return self.get_paginated_response(results)
+
     @action(detail=True, methods=['get'])
+    @cache_response(lambda view, request, pk=None: catalog_scope(request.user, pk))
     def products(self, request, pk=None):
         """Get all products for a specific restaurant"""
         restaurant = self.get_object()
         from apps.product.models import Product
         from apps.product.serializers import ProductListSerializer
         
-        products = Product.objects.filter(restaurant=restaurant, in_stock=True)
+        products = Product.objects.filter(
+            restaurant=restaurant, in_stock=True
+        ).select_related('restaurant')
         serializer = ProductListSerializer(products, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def menu(self, request, pk=None):
+        """
+        Full menu of a restaurant: products grouped by category with prices,
+        stock flags and ratings. Served pre-rendered, without serializing.
+        """
+        try:
+            restaurant_id = uuid.UUID(str(pk))
+        except ValueError:
+            restaurant_id = None
+        menu = menus.get(restaurant_id) if restaurant_id else None
+        if menu is None:
+            return Response({'error': 'Restaurant not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        etag, document = menu
+        response = get_conditional_response(request, etag=etag) or HttpResponse(
+            document, content_type='application/json'
+        )
+        response['ETag'] = etag
+        return response
+
     @action(detail=True, methods=['get'])
     def reviews(self, request, pk=None):
-        """Get all reviews for a specific restaurant"""
+        """Get the reviews for a specific restaurant, paginated (also with ?cursor=)"""
         restaurant = self.get_object()
         from apps.review.models import Review
-        from apps.review.serializers import ReviewSerializer
-        
-        reviews = Review.objects.filter(restaurant=restaurant)
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        from apps.review.serializers import ReviewListSerializer
+
+        reviews = Review.objects.filter(restaurant=restaurant).for_listing().order_by('-created_at', '-pk')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(reviews, request, view=self)
+        serializer = ReviewListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def rating_summary(self, request, pk=None):
+        """Rating, review count and reviews per star of a restaurant, from its own row"""
+        from apps.review.serializers import RatingSummarySerializer
+
+        summary = get_object_or_404(
+            self.get_queryset().values(*RatingSummarySerializer.source_fields), pk=pk
+        )
+        return Response(RatingSummarySerializer(summary).data)
\ No newline at end of file
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReviewConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.review"
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.review.signals  # noqa
@@ -0,0 +1,84 @@
+"""
+Management command to check the stored rating statistics.
+Compares the running totals Review keeps on Product and Restaurant
+(rating_sum, reviews_count, the per-star counts and the rating derived
+from them) against grouped aggregates over Review and reports (or, with
+--fix, repairs) any drift.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from apps.common import cache
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
+from apps.review.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Check stored product and restaurant ratings against their reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Write the correct values for rows that drifted'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and updated per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        drifted = 0
+        # (model, its review foreign key, the field holding its restaurant id)
+        for model, field, restaurant_field in [
+            (Product, 'product', 'restaurant_id'),
+            (Restaurant, 'restaurant', 'id'),
+        ]:
+            star_counts = {
+                name: Count('id', filter=Q(rating=rating)) for rating, name in Review.HISTOGRAM_FIELDS.items()
+            }
+            expected = {
+                row.pop(field): row
+                for row in Review.objects.filter(**{f'{field}__isnull': False}).values(field).annotate(
+                    rating_sum=Sum('rating'),
+                    reviews_count=Count('id'),
+                    **star_counts
+                ).order_by()
+            }
+            empty = dict.fromkeys(['rating_sum', 'reviews_count', *star_counts], 0)
+
+            stale = []
+            rows = model.objects.only(
+                'id', restaurant_field, 'rating', *empty
+            ).order_by().iterator(chunk_size=options['batch_size'])
+            for obj in rows:
+                values = expected.get(obj.id, empty)
+                values = {**values, 'rating': Review.expected_rating(values['rating_sum'], values['reviews_count'])}
+                wrong = {name: value for name, value in values.items() if getattr(obj, name) != value}
+                if wrong:
+                    self.stdout.write(f'{model.__name__} {obj.id}: ' + ', '.join(
+                        f'stored {name}={getattr(obj, name)} expected {value}' for name, value in wrong.items()
+                    ))
+                    for name, value in values.items():
+                        setattr(obj, name, value)
+                    obj.updated_at = timezone.now()
+                    stale.append(obj)
+
+            drifted += len(stale)
+            if stale and options['fix']:
+                with transaction.atomic():
+                    model.objects.bulk_update(
+                        stale, ['rating', *empty, 'updated_at'], batch_size=options['batch_size']
+                    )
+                    # bulk_update skips the signals that invalidate cached catalog responses
+                    for restaurant_id in {getattr(obj, restaurant_field) for obj in stale}:
+                        cache.invalidate(restaurant_id)
+                self.stdout.write(f'Fixed {len(stale)} {model._meta.verbose_name_plural}')
+
+        if drifted and not options['fix']:
+            raise CommandError(f'{drifted} rows have drifted rating stats; run with --fix to repair them')
+        self.stdout.write(self.style.SUCCESS('Rating stats are consistent'))
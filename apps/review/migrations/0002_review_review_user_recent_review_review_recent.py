@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0001_initial"),
+        ("restaurant", "0001_initial"),
+        ("review", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="review_user_recent"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(fields=["-created_at", "-id"], name="review_recent"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0002_product_product_restaurant_stock_and_more"),
+        ("restaurant", "0002_restaurant_restaurant_active_top"),
+        ("review", "0002_review_review_user_recent_review_review_recent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["product", "-created_at"], name="review_product_recent"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["restaurant", "-created_at"], name="review_restaurant_recent"
+            ),
+        ),
+    ]
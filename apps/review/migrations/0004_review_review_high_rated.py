@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0005_product_rating_1_count_product_rating_2_count_and_more"),
+        (
+            "restaurant",
+            "0008_restaurant_rating_1_count_restaurant_rating_2_count_and_more",
+        ),
+        ("review", "0003_review_review_product_recent_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                condition=models.Q(("rating__gte", 4)),
+                fields=["-created_at", "-id"],
+                name="review_high_rated",
+            ),
+        ),
+    ]
@@ -1,8 +1,25 @@
-from django.db import models
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
 from django.utils import timezone
 import uuid
 
 
+class ReviewQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Load what ReviewListSerializer reads: the author, product and
+        restaurant are joined in the same query and trimmed to the columns
+        the listing shows.
+        """
+        return self.select_related('user', 'product', 'restaurant').only(
+            'id', 'rating', 'comment', 'created_at', 'updated_at',
+            'user', 'user__id', 'user__name',
+            'product', 'product__id', 'product__name', 'product__image', 'product__restaurant_id',
+            'restaurant', 'restaurant__id', 'restaurant__name', 'restaurant__logo',
+        )
+
+
 class Review(models.Model):
     RATING_CHOICES = [
         (1, '1 Star'),
@@ -11,6 +28,8 @@ class Review(models.Model):
         (4, '4 Stars'),
         (5, '5 Stars'),
     ]
+    # Product/Restaurant column counting the reviews with each rating
+    HISTOGRAM_FIELDS = {rating: f'rating_{rating}_count' for rating, _ in RATING_CHOICES}
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
@@ -37,12 +56,25 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReviewQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         unique_together = [
             ['user', 'product'],
             ['user', 'restaurant']
         ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='review_user_recent'),
+            models.Index(fields=['-created_at', '-id'], name='review_recent'),
+            models.Index(fields=['product', '-created_at'], name='review_product_recent'),
+            models.Index(fields=['restaurant', '-created_at'], name='review_restaurant_recent'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='review_high_rated',
+                condition=models.Q(rating__gte=4)
+            ),
+        ]
 
     def __str__(self):
         if self.product:
@@ -63,27 +95,77 @@ class Review(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
-        
-        # Update product/restaurant rating and review count
-        if self.product:
-            self._update_product_stats()
-        elif self.restaurant:
-            self._update_restaurant_stats()
-
-    def _update_product_stats(self):
-        """Update product rating and review count"""
-        reviews = Review.objects.filter(product=self.product)
-        if reviews.exists():
-            avg_rating = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.product.rating = round(avg_rating, 2)
-            self.product.reviews_count = reviews.count()
-            self.product.save(update_fields=['rating', 'reviews_count'])
-
-    def _update_restaurant_stats(self):
-        """Update restaurant rating"""
-        reviews = Review.objects.filter(restaurant=self.restaurant)
-        if reviews.exists():
-            avg_rating = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.restaurant.rating = round(avg_rating, 2)
-            self.restaurant.save(update_fields=['rating'])
\ No newline at end of file
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                # Locked so concurrent edits of this review apply their deltas in turn
+                previous = Review.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values('product_id', 'restaurant_id', 'rating').first()
+            super().save(*args, **kwargs)
+
+            # Update the product/restaurant running totals by the change only
+            if previous is None:
+                self.apply_rating(self.product_id, self.restaurant_id, added=self.rating)
+            elif (previous['product_id'], previous['restaurant_id']) == (self.product_id, self.restaurant_id):
+                if previous['rating'] != self.rating:
+                    self.apply_rating(
+                        self.product_id, self.restaurant_id, added=self.rating, removed=previous['rating']
+                    )
+            else:
+                self.apply_rating(previous['product_id'], previous['restaurant_id'], removed=previous['rating'])
+                self.apply_rating(self.product_id, self.restaurant_id, added=self.rating)
+
+    @staticmethod
+    def round_rating(average):
+        """Average rating as stored in the rating columns"""
+        return Decimal(str(average or 0)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    @staticmethod
+    def expected_rating(rating_sum, count):
+        """rating column value for these running totals"""
+        return Review.round_rating(Decimal(rating_sum) / count if count else 0)
+
+    @staticmethod
+    def apply_rating(product_id, restaurant_id, added=None, removed=None):
+        """
+        Count a rating added to and/or removed from the reviewed product or
+        restaurant: rating_sum, reviews_count and the star histogram change
+        by the difference and rating is derived from the new totals, all in
+        one UPDATE whatever the number of reviews. A target that no longer
+        exists (cascading deletes) is skipped.
+        """
+        from apps.common import cache
+        from apps.product.models import Product
+        from apps.restaurant.models import Restaurant
+
+        if product_id:
+            restaurant_id = Product.objects.filter(pk=product_id).values_list('restaurant_id', flat=True).first()
+            targets = Product.objects.filter(pk=product_id)
+        else:
+            targets = Restaurant.objects.filter(pk=restaurant_id)
+        if restaurant_id is None:
+            return
+
+        steps = {}
+        for rating, step in [(added, 1), (removed, -1)]:
+            if rating:
+                steps[rating] = steps.get(rating, 0) + step
+        histogram = {
+            Review.HISTOGRAM_FIELDS[rating]: models.F(Review.HISTOGRAM_FIELDS[rating]) + step
+            for rating, step in steps.items() if step
+        }
+        rating_sum = models.F('rating_sum') + sum(rating * step for rating, step in steps.items())
+        count = models.F('reviews_count') + sum(steps.values())
+        # Cast so neither database truncates the division; Round works on numeric on PostgreSQL
+        average = Cast(rating_sum, models.FloatField()) / NullIf(count, 0)
+        updated = targets.update(
+            rating_sum=rating_sum,
+            reviews_count=count,
+            **histogram,
+            rating=Coalesce(Round(average, 2), models.Value(Decimal('0.00')), output_field=models.DecimalField()),
+            updated_at=timezone.now()
+        )
+        if updated:
+            # Queryset updates skip the signals that invalidate cached catalog responses
+            cache.invalidate(restaurant_id)
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from .models import Review
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
 from apps.restaurant.serializers import RestaurantListSerializer
 from apps.product.serializers import ProductListSerializer
+from apps.user_account.models import User
 from apps.user_account.serializers import UserSerializer
 
 
@@ -19,6 +22,54 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class ReviewAuthorSerializer(serializers.ModelSerializer):
+    """Public part of a review's author"""
+    class Meta:
+        model = User
+        fields = ['id', 'name']
+
+
+class ReviewProductSerializer(serializers.ModelSerializer):
+    """Reviewed product, as shown in review listings"""
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'image', 'restaurant']
+
+
+class ReviewRestaurantSerializer(serializers.ModelSerializer):
+    """Reviewed restaurant, as shown in review listings"""
+    class Meta:
+        model = Restaurant
+        fields = ['id', 'name', 'logo']
+
+
+class ReviewListSerializer(serializers.ModelSerializer):
+    """Serializer for review listings; use with Review.objects.for_listing()"""
+    user = ReviewAuthorSerializer(read_only=True)
+    product = ReviewProductSerializer(read_only=True)
+    restaurant = ReviewRestaurantSerializer(read_only=True)
+
+    class Meta:
+        model = Review
+        fields = [
+            'id', 'user', 'product', 'restaurant', 'rating',
+            'comment', 'created_at', 'updated_at'
+        ]
+
+
+class RatingSummarySerializer(serializers.Serializer):
+    """Rating of a product or restaurant with its reviews per star, from the stored counters"""
+    # Columns of the product or restaurant row to serialize, read with .values()
+    source_fields = ['rating', 'reviews_count', *Review.HISTOGRAM_FIELDS.values()]
+
+    rating = serializers.DecimalField(max_digits=3, decimal_places=2)
+    reviews_count = serializers.IntegerField()
+    histogram = serializers.SerializerMethodField()
+
+    def get_histogram(self, obj):
+        return {str(rating): obj[field] for rating, field in Review.HISTOGRAM_FIELDS.items()}
+
+
 class ReviewCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating reviews"""
     class Meta:
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Review
+
+
+@receiver(post_delete, sender=Review)
+def update_stats_on_delete(sender, instance, **kwargs):
+    """Take a removed review out of its product or restaurant running totals"""
+    Review.apply_rating(instance.product_id, instance.restaurant_id, removed=instance.rating)
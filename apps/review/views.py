@@ -2,8 +2,9 @@ from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.pagination import KeysetPagination
 from .models import Review
-from .serializers import ReviewSerializer, ReviewCreateSerializer, ReviewUpdateSerializer
+from .serializers import ReviewSerializer, ReviewListSerializer, ReviewCreateSerializer, ReviewUpdateSerializer
 
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -12,6 +13,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     """
     queryset = Review.objects.all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['product', 'restaurant', 'rating']
     ordering_fields = ['created_at', 'rating']
@@ -37,19 +39,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
         """Set the user to the current user when creating a review"""
         serializer.save(user=self.request.user)
 
+    def paginated_reviews(self, reviews):
+        """Page of reviews for the listing actions, newest first"""
+        page = self.paginate_queryset(reviews.for_listing().order_by('-created_at', '-pk'))
+        serializer = ReviewListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def my_reviews(self, request):
-        """Get all reviews by the authenticated user"""
+        """Get the reviews by the authenticated user, paginated"""
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=401)
-            
-        reviews = Review.objects.filter(user=request.user)
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
+        return self.paginated_reviews(Review.objects.filter(user=request.user))
 
     @action(detail=False, methods=['get'])
     def high_rated(self, request):
-        """Get all high-rated reviews (4+ stars)"""
-        reviews = Review.objects.filter(rating__gte=4)
-        serializer = ReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        """Get high-rated reviews (4+ stars), paginated"""
+        return self.paginated_reviews(Review.objects.filter(rating__gte=4))
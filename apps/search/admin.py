@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import SearchEntry
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ['title', 'kind', 'restaurant', 'is_visible', 'updated_at']
+    list_filter = ['kind', 'is_visible']
+    search_fields = ['title']
+    readonly_fields = ['kind', 'object_id', 'restaurant', 'title', 'body', 'is_visible', 'updated_at']
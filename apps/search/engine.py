@@ -0,0 +1,123 @@
+"""
+Full-text search over products and restaurants.
+SearchEntry rows hold the searchable text; the database does the matching
+and ranking: tsvector/GIN and ts_rank on PostgreSQL, FTS5 and bm25 on
+SQLite, plain LIKE (unranked) elsewhere. Every term is matched as a prefix
+so results update while the user types.
+Entries are written by the signals in apps/search/signals.py; code that
+bypasses model signals (bulk_create, bulk_update, queryset.update) must
+call index_products / index_restaurants itself.
+"""
+import re
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from .models import SearchEntry
+
+MAX_TERMS = 8
+
+_POSTGRES_MATCH = "SELECT id FROM search_searchentry WHERE document @@ to_tsquery('english', %s)"
+_POSTGRES_RANK = "ts_rank(search_searchentry.document, to_tsquery('english', %s))"
+_SQLITE_MATCH = "SELECT rowid FROM search_searchentry_fts WHERE search_searchentry_fts MATCH %s"
+_SQLITE_RANK = (
+    "(SELECT -bm25(search_searchentry_fts, 10.0, 1.0) FROM search_searchentry_fts "
+    "WHERE search_searchentry_fts MATCH %s AND rowid = search_searchentry.id)"
+)
+
+
+def parse_terms(query):
+    """Lower-cased words of a query; everything else is dropped"""
+    return re.findall(r'[^\W_]+', (query or '').lower())[:MAX_TERMS]
+
+
+def matching(query):
+    """Entries whose text contains every term of the query (as a prefix)"""
+    terms = parse_terms(query)
+    if not terms:
+        return SearchEntry.objects.none()
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return SearchEntry.objects.filter(id__in=RawSQL(_POSTGRES_MATCH, [tsquery]))
+
+    if connection.vendor == 'sqlite':
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        return SearchEntry.objects.filter(id__in=RawSQL(_SQLITE_MATCH, [expression]))
+
+    entries = SearchEntry.objects.all()
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return entries
+
+
+def ranked(query, kinds=None, limit=20):
+    """Visible matching entries, best match first"""
+    terms = parse_terms(query)
+    entries = matching(query).filter(is_visible=True, restaurant__is_active=True)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        rank = RawSQL(_POSTGRES_RANK, [tsquery], output_field=FloatField())
+    elif connection.vendor == 'sqlite':
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        rank = RawSQL(_SQLITE_RANK, [expression], output_field=FloatField())
+    else:
+        rank = Value(0.0, output_field=FloatField())
+
+    return list(entries.annotate(rank=rank).order_by('-rank', 'title')[:limit])
+
+
+def _upsert(entries):
+    SearchEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['restaurant', 'title', 'body', 'is_visible', 'updated_at'],
+    )
+
+
+def product_fields(product):
+    """SearchEntry field values for a product (load it with select_related('category'))"""
+    return {
+        'kind': 'product',
+        'object_id': product.id,
+        'restaurant_id': product.restaurant_id,
+        'title': product.name,
+        'body': ' '.join(filter(None, [
+            product.category.name if product.category else '',
+            product.description,
+            ' '.join(str(item) for item in product.ingredients or []),
+        ])),
+        'is_visible': product.in_stock,
+    }
+
+
+def restaurant_fields(restaurant):
+    """SearchEntry field values for a restaurant"""
+    return {
+        'kind': 'restaurant',
+        'object_id': restaurant.id,
+        'restaurant_id': restaurant.id,
+        'title': restaurant.name,
+        'body': ' '.join(filter(None, [
+            restaurant.description,
+            ' '.join(str(cuisine) for cuisine in restaurant.cuisine_type or []),
+        ])),
+        'is_visible': restaurant.is_active,
+    }
+
+
+def index_products(products):
+    """Create or refresh the entries of these products (load them with select_related('category'))"""
+    _upsert([SearchEntry(**product_fields(product)) for product in products])
+
+
+def index_restaurants(restaurants):
+    """Create or refresh the entries of these restaurants"""
+    _upsert([SearchEntry(**restaurant_fields(restaurant)) for restaurant in restaurants])
+
+
+def remove(kind, object_ids):
+    SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
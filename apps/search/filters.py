@@ -0,0 +1,19 @@
+from rest_framework import filters
+from . import engine
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ?search= backed by the full-text index instead of icontains over
+    search_fields. Works for querysets of products and restaurants; the
+    viewset's other filters and ordering still apply.
+    """
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not engine.parse_terms(query):
+            return queryset
+        return queryset.filter(
+            pk__in=engine.matching(query).filter(
+                kind=queryset.model._meta.model_name
+            ).values('object_id')
+        )
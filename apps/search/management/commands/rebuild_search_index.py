@@ -0,0 +1,48 @@
+"""
+Management command to rebuild the search index.
+Refreshes the entry of every product and restaurant in batches and drops
+entries whose object no longer exists. Migrations fill the index on the
+first deploy; run it after data changes that bypassed model signals.
+"""
+from django.core.management.base import BaseCommand
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
+from apps.search import engine
+from apps.search.models import SearchEntry
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the product and restaurant search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Objects indexed per batch (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for kind, queryset, index in [
+            ('restaurant', Restaurant.objects.all(), engine.index_restaurants),
+            ('product', Product.objects.select_related('category'), engine.index_products),
+        ]:
+            indexed = 0
+            batch = []
+            for obj in queryset.order_by().iterator(chunk_size=batch_size):
+                batch.append(obj)
+                if len(batch) == batch_size:
+                    index(batch)
+                    indexed += len(batch)
+                    batch = []
+            if batch:
+                index(batch)
+                indexed += len(batch)
+
+            removed, _ = SearchEntry.objects.filter(kind=kind).exclude(
+                object_id__in=queryset.model.objects.values('id')
+            ).delete()
+            self.stdout.write(f'{kind}: {indexed} indexed, {removed} stale entries removed')
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE search_searchentry ADD COLUMN document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_entry_document ON search_searchentry USING GIN (document)",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE search_searchentry_fts USING fts5(
+        title, body, content='search_searchentry', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER search_searchentry_fts_insert AFTER INSERT ON search_searchentry BEGIN
+        INSERT INTO search_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchentry_fts_delete AFTER DELETE ON search_searchentry BEGIN
+        INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchentry_fts_update AFTER UPDATE ON search_searchentry BEGIN
+        INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_searchentry_fts_insert",
+    "DROP TRIGGER IF EXISTS search_searchentry_fts_delete",
+    "DROP TRIGGER IF EXISTS search_searchentry_fts_update",
+    "DROP TABLE IF EXISTS search_searchentry_fts",
+]
+
+
+def create_full_text_index(apps, schema_editor):
+    """tsvector + GIN on PostgreSQL, FTS5 on SQLite; other databases fall back to LIKE"""
+    statements = {
+        "postgresql": POSTGRESQL_FORWARD,
+        "sqlite": SQLITE_FORWARD,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_full_text_index(apps, schema_editor):
+    # The PostgreSQL column and index go away with the table
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_BACKWARD:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("restaurant", "0003_restaurant_reviews_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("product", "Product"), ("restaurant", "Restaurant")],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("title", models.CharField(max_length=255)),
+                ("body", models.TextField(blank=True)),
+                ("is_visible", models.BooleanField(default=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_entries",
+                        to="restaurant.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "search entries",
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
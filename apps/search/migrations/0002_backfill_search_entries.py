@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:05
+
+from django.db import migrations
+
+from apps.search.engine import product_fields, restaurant_fields
+
+
+def backfill_entries(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    Restaurant = apps.get_model("restaurant", "Restaurant")
+    SearchEntry = apps.get_model("search", "SearchEntry")
+    for queryset, fields in [
+        (Restaurant.objects.all(), restaurant_fields),
+        (Product.objects.select_related("category"), product_fields),
+    ]:
+        SearchEntry.objects.bulk_create(
+            (
+                SearchEntry(**fields(obj))
+                for obj in queryset.order_by().iterator(chunk_size=500)
+            ),
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0001_initial"),
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
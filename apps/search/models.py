@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    Searchable text of one product or restaurant.
+    The full-text index lives outside the ORM: a generated tsvector column
+    with a GIN index on PostgreSQL, an FTS5 table kept in sync by triggers
+    on SQLite (see migration 0001 and apps/search/engine.py).
+    """
+    KIND_CHOICES = [
+        ('product', 'Product'),
+        ('restaurant', 'Restaurant'),
+    ]
+
+    # Integer key so SQLite FTS5 can use it as its rowid
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    restaurant = models.ForeignKey(
+        'restaurant.Restaurant',
+        on_delete=models.CASCADE,
+        related_name='search_entries'
+    )
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    is_visible = models.BooleanField(default=True)  # In stock (products) or active (restaurants)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        verbose_name_plural = 'search entries'
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
@@ -0,0 +1,37 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.category.models import Category
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
+from . import engine
+
+# Saves limited to other fields (e.g. rating updates from reviews) leave entries as they are
+PRODUCT_FIELDS = {'name', 'description', 'ingredients', 'category', 'restaurant', 'in_stock'}
+RESTAURANT_FIELDS = {'name', 'description', 'cuisine_type', 'is_active'}
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not PRODUCT_FIELDS & set(update_fields):
+        return
+    engine.index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def remove_product(sender, instance, **kwargs):
+    engine.remove('product', [instance.pk])
+
+
+@receiver(post_save, sender=Restaurant)
+def index_restaurant(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not RESTAURANT_FIELDS & set(update_fields):
+        return
+    # Product entries follow the restaurant's is_active through a join at query time
+    engine.index_restaurants([instance])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, created, **kwargs):
+    """Product entries include their category name"""
+    if not created:
+        engine.index_products(Product.objects.filter(category=instance).select_related('category'))
@@ -0,0 +1,62 @@
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from apps.product.models import Product
+from apps.product.serializers import ProductListSerializer
+from apps.restaurant.models import Restaurant
+from apps.restaurant.serializers import RestaurantListSerializer
+from . import engine
+
+MAX_LIMIT = 50
+
+
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def search(request):
+    """
+    Ranked search over products and restaurants.
+    - ?q=<text>: words to look for; each word also matches as a prefix
+    - ?type=product|restaurant: only one kind of result
+    - ?limit=<n>: number of results (default 20, max 50)
+    """
+    query = request.query_params.get('q', '')
+    if not engine.parse_terms(query):
+        return Response(
+            {'error': 'q must contain at least one word'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    kind = request.query_params.get('type')
+    if kind not in [None, 'product', 'restaurant']:
+        return Response(
+            {'error': 'type must be product or restaurant'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {'error': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    entries = engine.ranked(query, kinds=[kind] if kind else None, limit=limit)
+    products = Product.objects.select_related('restaurant', 'category').in_bulk(
+        [entry.object_id for entry in entries if entry.kind == 'product']
+    )
+    restaurants = Restaurant.objects.in_bulk(
+        [entry.object_id for entry in entries if entry.kind == 'restaurant']
+    )
+
+    results = []
+    for entry in entries:
+        if entry.kind == 'product' and entry.object_id in products:
+            item = ProductListSerializer(products[entry.object_id]).data
+        elif entry.kind == 'restaurant' and entry.object_id in restaurants:
+            item = RestaurantListSerializer(restaurants[entry.object_id]).data
+        else:
+            continue
+        results.append({'type': entry.kind, 'rank': entry.rank, 'item': item})
+
+    return Response({'query': query, 'count': len(results), 'results': results})
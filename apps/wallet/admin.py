@@ -1,14 +1,47 @@
+from django import forms
 from django.contrib import admin
-from .models import WalletTransaction
+from apps.user_account.models import User
+from . import ledger
+from .models import WalletSnapshot, WalletSummary, WalletTransaction
+
+
+class WalletTransactionAdminForm(forms.ModelForm):
+    class Meta:
+        model = WalletTransaction
+        fields = '__all__'
+
+    def clean(self):
+        """
+        Reject postings the ledger would refuse, so they show as form errors.
+        The user row stays locked until save_model() posts, in the admin's
+        transaction, so the balances cannot drop in between.
+        """
+        cleaned_data = super().clean()
+        user = cleaned_data.get('user')
+        type = cleaned_data.get('type')
+        amount = cleaned_data.get('amount')
+        points = cleaned_data.get('points')
+        if user and type and amount is not None and points is not None:
+            try:
+                ledger.check_signs(type, amount, points)
+            except ValueError as e:
+                raise forms.ValidationError(str(e))
+            balances = User.objects.select_for_update().filter(pk=user.pk).values(
+                'wallet_balance', 'loyalty_points'
+            ).get()
+            if balances['wallet_balance'] + amount < 0 or balances['loyalty_points'] + points < 0:
+                raise forms.ValidationError('Insufficient wallet balance or loyalty points')
+        return cleaned_data
 
 
 @admin.register(WalletTransaction)
 class WalletTransactionAdmin(admin.ModelAdmin):
+    form = WalletTransactionAdminForm
     list_display = ['user', 'type', 'amount', 'points', 'created_at']
     list_filter = ['type', 'created_at']
     search_fields = ['user__name', 'user__email', 'description']
     ordering = ['-created_at']
-    readonly_fields = ['id', 'created_at']
+    readonly_fields = ['id', 'idempotency_key', 'created_at']
     
     fieldsets = (
         ('Transaction Information', {
@@ -18,7 +51,55 @@ class WalletTransactionAdmin(admin.ModelAdmin):
             'fields': ('order',)
         }),
         ('Metadata', {
-            'fields': ('id', 'created_at'),
+            'fields': ('id', 'idempotency_key', 'created_at'),
             'classes': ('collapse',)
         })
-    )
\ No newline at end of file
+    )
+
+    def save_model(self, request, obj, form, change):
+        """Post new transactions through the ledger so they move the user's balances"""
+        posted, _ = ledger.post(
+            obj.user, obj.type, obj.amount,
+            points=obj.points, description=obj.description, order=obj.order
+        )
+        obj.pk, obj.created_at = posted.pk, posted.created_at
+        obj._state.adding = False
+
+    # Transactions are append-only: correct a mistake with a new transaction
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WalletSummary)
+class WalletSummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'transactions_count', 'earned_amount', 'redeemed_amount', 'last_transaction_at']
+    search_fields = ['user__name', 'user__email']
+    ordering = ['-last_transaction_at']
+
+    # Maintained by the ledger
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WalletSnapshot)
+class WalletSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['user', 'wallet_balance', 'ledger_amount', 'loyalty_points', 'ledger_points', 'taken_at']
+    list_filter = ['taken_at']
+    search_fields = ['user__name', 'user__email']
+    ordering = ['-taken_at']
+
+    # Written by reconcile_wallets --snapshot
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
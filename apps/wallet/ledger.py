@@ -0,0 +1,194 @@
+"""
+Wallet ledger.
+Every change to a user's wallet_balance or loyalty_points goes through
+post(): it records the WalletTransaction and applies it to the user row
+in one transaction, with a single guarded UPDATE
+
+    UPDATE user SET wallet_balance = wallet_balance + amount, ...
+    WHERE id = ? AND wallet_balance + amount >= 0 AND loyalty_points + points >= 0
+
+so concurrent postings never lose an update and never take a balance
+below zero; a posting that would is rejected and its transaction rolled
+back. Transactions are append-only. The user's WalletSummary counters
+are updated in the same transaction.
+
+Callers may pass an idempotency key (e.g. the client's Idempotency-Key
+header): a key the user already used returns the original transaction
+instead of posting again, so retries are safe.
+
+post_credits() records many crediting transactions at once, for jobs such
+as loyalty accrual: one bulk insert and one grouped UPDATE per table.
+"""
+from collections import defaultdict
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from apps.user_account.models import User
+from .models import WalletSummary, WalletTransaction
+
+# Transaction types that add to the balances, and those that take from them
+CREDIT_TYPES = ['earned', 'bonus', 'refund', 'top_up']
+DEBIT_TYPES = ['redeemed']
+
+# WalletSummary counters changed by a posting
+SUMMARY_COUNTERS = ['transactions_count', 'earned_amount', 'earned_points', 'redeemed_amount', 'redeemed_points']
+
+
+class InsufficientFunds(Exception):
+    """The posting would take the wallet balance or loyalty points below zero"""
+
+
+def check_signs(type, amount, points):
+    """
+    Raise ValueError unless the amount and points move the balances the way
+    the type does: credits add, debits take, and something has to move
+    """
+    if type in CREDIT_TYPES:
+        if amount < 0 or points < 0 or not (amount or points):
+            raise ValueError(f'A {type} transaction must add a positive amount or points')
+    elif type in DEBIT_TYPES:
+        if amount > 0 or points > 0 or not (amount or points):
+            raise ValueError(f'A {type} transaction must take a negative amount or points')
+    else:
+        raise ValueError(f'Unknown transaction type "{type}"')
+
+
+def post(user, type, amount, points=0, description='', order=None, idempotency_key=None):
+    """
+    Record a transaction and apply it to the user's balances.
+    Returns (transaction, created); created is False when the idempotency
+    key was already used. Raises InsufficientFunds on an overdraft and
+    ValueError when the signs do not match the type (see check_signs).
+    """
+    check_signs(type, amount, points)
+    with transaction.atomic():
+        if idempotency_key:
+            existing = WalletTransaction.objects.filter(user=user, idempotency_key=idempotency_key).first()
+            if existing is not None:
+                return existing, False
+        try:
+            # Savepoint, so a concurrent retry with the same key can be recovered from
+            with transaction.atomic():
+                wallet_transaction = WalletTransaction.objects.create(
+                    user=user,
+                    type=type,
+                    amount=amount,
+                    points=points,
+                    description=description,
+                    order=order,
+                    idempotency_key=idempotency_key,
+                )
+        except IntegrityError:
+            if not idempotency_key:
+                raise
+            return WalletTransaction.objects.get(user=user, idempotency_key=idempotency_key), False
+
+        users = User.objects.filter(pk=user.pk)
+        if amount < 0:
+            users = users.filter(wallet_balance__gte=-amount)
+        if points < 0:
+            users = users.filter(loyalty_points__gte=-points)
+        updated = users.update(
+            wallet_balance=F('wallet_balance') + amount,
+            loyalty_points=F('loyalty_points') + points
+        )
+        if not updated:
+            # Rolls back the transaction row too
+            raise InsufficientFunds('Insufficient wallet balance or loyalty points')
+        _count(wallet_transaction)
+    return wallet_transaction, True
+
+
+def _count(wallet_transaction):
+    """
+    Add a posted transaction to its user's WalletSummary. The user row is
+    locked by the balance UPDATE, so no other posting for this user can
+    create the summary row concurrently.
+    """
+    deltas = {'transactions_count': 1}
+    if wallet_transaction.type in ['earned', 'redeemed']:
+        deltas[f'{wallet_transaction.type}_amount'] = wallet_transaction.amount
+        deltas[f'{wallet_transaction.type}_points'] = wallet_transaction.points
+
+    summaries = WalletSummary.objects.filter(user_id=wallet_transaction.user_id)
+    if not summaries.update(
+        last_transaction_at=wallet_transaction.created_at,
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    ):
+        WalletSummary.objects.create(
+            user_id=wallet_transaction.user_id,
+            last_transaction_at=wallet_transaction.created_at,
+            **deltas
+        )
+
+
+def post_credits(wallet_transactions):
+    """
+    Record unsaved transactions that only add to balances and apply them
+    with one grouped UPDATE of the users and one of their summaries,
+    whatever the number of users. Transactions whose idempotency key the
+    user already used are skipped. Returns the transactions inserted.
+    """
+    if any(tx.type not in CREDIT_TYPES for tx in wallet_transactions):
+        raise ValueError('post_credits() only takes transactions that add to balances')
+    for tx in wallet_transactions:
+        check_signs(tx.type, tx.amount, tx.points)
+
+    with transaction.atomic():
+        keys = {tx.idempotency_key for tx in wallet_transactions if tx.idempotency_key}
+        used = set(WalletTransaction.objects.filter(
+            user_id__in={tx.user_id for tx in wallet_transactions},
+            idempotency_key__in=keys
+        ).values_list('user_id', 'idempotency_key')) if keys else set()
+        new_transactions = []
+        for tx in wallet_transactions:
+            if tx.idempotency_key:
+                if (tx.user_id, tx.idempotency_key) in used:
+                    continue
+                used.add((tx.user_id, tx.idempotency_key))
+            new_transactions.append(tx)
+        wallet_transactions = new_transactions
+        if not wallet_transactions:
+            return []
+        WalletTransaction.objects.bulk_create(wallet_transactions)
+
+        balances = defaultdict(lambda: {'wallet_balance': 0, 'loyalty_points': 0})
+        counters = defaultdict(lambda: dict.fromkeys(SUMMARY_COUNTERS, 0))
+        last_at = {}
+        for tx in wallet_transactions:
+            balances[tx.user_id]['wallet_balance'] += tx.amount
+            balances[tx.user_id]['loyalty_points'] += tx.points
+            counters[tx.user_id]['transactions_count'] += 1
+            if tx.type in ['earned', 'redeemed']:
+                counters[tx.user_id][f'{tx.type}_amount'] += tx.amount
+                counters[tx.user_id][f'{tx.type}_points'] += tx.points
+            last_at[tx.user_id] = max(last_at.get(tx.user_id, tx.created_at), tx.created_at)
+
+        User.objects.filter(pk__in=balances).update(**_grouped(User, 'pk', balances))
+
+        existing = set(WalletSummary.objects.filter(user_id__in=counters).values_list('user_id', flat=True))
+        if existing:
+            WalletSummary.objects.filter(user_id__in=existing).update(
+                last_transaction_at=Case(*[
+                    When(user_id=user_id, then=Value(last_at[user_id])) for user_id in existing
+                ]),
+                **_grouped(WalletSummary, 'user_id', {user_id: counters[user_id] for user_id in existing})
+            )
+        # The users are locked by the UPDATE above, so no posting can create these concurrently
+        WalletSummary.objects.bulk_create([
+            WalletSummary(user_id=user_id, last_transaction_at=last_at[user_id], **counters[user_id])
+            for user_id in counters if user_id not in existing
+        ])
+    return wallet_transactions
+
+
+def _grouped(model, key, deltas):
+    """
+    field=F(field) + CASE WHEN <key> = <id> THEN <delta> ... ELSE 0 END
+    for every field changed in deltas ({id: {field: delta}})
+    """
+    changes = {}
+    for field in {field for row in deltas.values() for field in row}:
+        whens = [When(**{key: pk}, then=Value(row[field])) for pk, row in deltas.items() if row[field]]
+        if whens:
+            changes[field] = F(field) + Case(*whens, default=Value(0), output_field=model._meta.get_field(field))
+    return changes
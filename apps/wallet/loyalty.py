@@ -0,0 +1,166 @@
+"""
+Loyalty points accrual.
+Delivered orders earn points outside the request path: accrue_batch()
+scans the orders delivered since the watermark, in (delivered_at, id)
+order, and credits each customer through ledger.post_credits() with one
+'earned' transaction per order.
+
+An order earns, for each restaurant in it, its subtotal there times
+settings.LOYALTY_POINTS_PER_UNIT times the restaurant's loyalty_multiplier,
+rounded down. Every transaction carries the idempotency key
+loyalty:<order id>, so replaying orders (e.g. with --since) never credits
+an order twice. Orders without restaurant links earn from their items.
+
+delivered_at is stamped before the delivering transaction commits, so an
+order can become visible after the watermark has passed it. accrue_late()
+re-scans the RESCAN_WINDOW behind the watermark for delivered orders that
+have no loyalty transaction yet.
+"""
+from datetime import timedelta
+from decimal import Decimal, ROUND_DOWN
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Sum
+from django.utils import timezone
+from apps.order.models import Order, OrderItem, OrderRestaurant
+from . import ledger
+from .models import LoyaltyWatermark, WalletTransaction
+
+WATERMARK = 'loyalty'
+
+# Orders delivered more recently than this are left for the next batch, so
+# most orders commit before the watermark reaches them
+SETTLE_DELAY = timedelta(seconds=60)
+
+# How far behind the watermark accrue_late() looks for orders that committed late
+RESCAN_WINDOW = timedelta(hours=1)
+
+
+def points_for(subtotal, multiplier):
+    """Points earned for a restaurant subtotal"""
+    points = subtotal * settings.LOYALTY_POINTS_PER_UNIT * multiplier
+    return int(points.quantize(Decimal('1'), rounding=ROUND_DOWN))
+
+
+def idempotency_key(order_id):
+    return f'loyalty:{order_id}'
+
+
+def delivered_since(delivered_at, order_id, until):
+    """
+    Orders delivered after the (delivered_at, order_id) watermark and no
+    later than `until`, in scan order. Without order_id, orders delivered
+    at exactly delivered_at are included.
+    """
+    after = Q(delivered_at__gt=delivered_at)
+    if order_id is None:
+        after |= Q(delivered_at=delivered_at)
+    else:
+        after |= Q(delivered_at=delivered_at, pk__gt=order_id)
+    return Order.objects.filter(after, delivered_at__lte=until).order_by('delivered_at', 'pk')
+
+
+def reset(since):
+    """Scan again from the orders delivered at or after `since`"""
+    LoyaltyWatermark.objects.update_or_create(
+        name=WATERMARK,
+        defaults={'delivered_at': since, 'order_id': None}
+    )
+
+
+def accrue_batch(batch_size=None):
+    """
+    Credit the points of the next batch of delivered orders.
+    The first run starts from the current time; use reset() to accrue
+    earlier orders. Returns the number of orders scanned.
+    """
+    batch_size = batch_size or settings.LOYALTY_ACCRUAL_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        # Locked for the batch, so concurrent workers take turns
+        watermark, _ = LoyaltyWatermark.objects.select_for_update().get_or_create(
+            name=WATERMARK,
+            defaults={'delivered_at': now}
+        )
+        orders = list(
+            delivered_since(watermark.delivered_at, watermark.order_id, now - SETTLE_DELAY).values(
+                'pk', 'user_id', 'delivered_at'
+            )[:batch_size]
+        )
+        if not orders:
+            return 0
+
+        _credit(orders)
+
+        watermark.delivered_at = orders[-1]['delivered_at']
+        watermark.order_id = orders[-1]['pk']
+        watermark.save()
+    return len(orders)
+
+
+def accrue_late(batch_size=None):
+    """
+    Credit the orders delivered in the RESCAN_WINDOW behind the watermark
+    that have no loyalty transaction yet, e.g. because their transaction
+    committed after the watermark passed them. Returns the number of
+    transactions posted.
+    """
+    batch_size = batch_size or settings.LOYALTY_ACCRUAL_BATCH_SIZE
+    watermark = LoyaltyWatermark.objects.filter(name=WATERMARK).first()
+    if watermark is None:
+        return 0
+    until = watermark.delivered_at
+    credited = WalletTransaction.objects.filter(order_id=OuterRef('pk'), idempotency_key__startswith='loyalty:')
+    position = (until - RESCAN_WINDOW, None)
+    total = 0
+    while True:
+        with transaction.atomic():
+            # Taken in turn with accrue_batch(), which may be posting the same orders
+            LoyaltyWatermark.objects.select_for_update().get(name=WATERMARK)
+            orders = list(
+                delivered_since(*position, until).filter(~Exists(credited)).values(
+                    'pk', 'user_id', 'delivered_at'
+                )[:batch_size]
+            )
+            if not orders:
+                return total
+            total += len(_credit(orders))
+        position = (orders[-1]['delivered_at'], orders[-1]['pk'])
+
+
+def _credit(orders):
+    """Post the points earned by orders ({'pk', 'user_id'} rows); returns the transactions posted"""
+    order_ids = [order['pk'] for order in orders]
+    points = {}
+    linked = set()
+    for link in OrderRestaurant.objects.filter(order_id__in=order_ids).values(
+        'order_id', 'subtotal', 'restaurant__loyalty_multiplier'
+    ):
+        linked.add(link['order_id'])
+        points[link['order_id']] = points.get(link['order_id'], 0) + points_for(
+            link['subtotal'], link['restaurant__loyalty_multiplier']
+        )
+
+    # Orders whose links were never written earn from their items instead
+    unlinked = [order_id for order_id in order_ids if order_id not in linked]
+    if unlinked:
+        for row in OrderItem.objects.filter(order_id__in=unlinked).values(
+            'order_id', 'product__restaurant__loyalty_multiplier'
+        ).annotate(subtotal=Sum('total_price')).order_by():
+            points[row['order_id']] = points.get(row['order_id'], 0) + points_for(
+                row['subtotal'], row['product__restaurant__loyalty_multiplier']
+            )
+
+    return ledger.post_credits([
+        WalletTransaction(
+            user_id=order['user_id'],
+            type='earned',
+            amount=Decimal('0.00'),
+            points=points[order['pk']],
+            description='Loyalty points for your order',
+            order_id=order['pk'],
+            idempotency_key=idempotency_key(order['pk']),
+        )
+        for order in orders
+        if points.get(order['pk'])
+    ])
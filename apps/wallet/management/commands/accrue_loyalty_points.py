@@ -0,0 +1,68 @@
+"""
+Management command to credit loyalty points for delivered orders.
+Runs continuously by default; use --once to accrue the orders delivered
+so far and exit, or --since to scan again from an earlier date (orders
+already credited are skipped). Whenever it catches up, it also credits the
+orders that committed after the watermark passed them.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+from apps.wallet import loyalty
+
+
+class Command(BaseCommand):
+    help = 'Credit loyalty points for delivered orders in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Orders credited per transaction (default: LOYALTY_ACCRUAL_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds to sleep when no order is waiting (default: 60)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Credit the orders delivered so far and exit'
+        )
+        parser.add_argument(
+            '--since',
+            help='Scan again from the orders delivered at or after this ISO datetime'
+        )
+
+    def handle(self, *args, **options):
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError(f'Invalid datetime "{options["since"]}"')
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            loyalty.reset(since)
+
+        total = 0
+        self.stdout.write(self.style.SUCCESS('Loyalty worker started'))
+        try:
+            while True:
+                scanned = loyalty.accrue_batch(options['batch_size'])
+                total += scanned
+                if scanned:
+                    self.stdout.write(f'Scanned {scanned} delivered orders ({total} total)')
+                    continue
+                # Caught up: credit orders that committed after the watermark passed them
+                late = loyalty.accrue_late(options['batch_size'])
+                if late:
+                    self.stdout.write(f'Credited {late} late orders')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Loyalty worker stopped after {total} orders'))
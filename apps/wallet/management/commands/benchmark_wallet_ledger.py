@@ -0,0 +1,146 @@
+"""
+Management command to benchmark the wallet ledger under contention.
+Several threads post random top-ups and redemptions to the same few
+wallets, each one sent twice with the same idempotency key as a client
+retry would. Afterwards every balance must equal the sum of its
+transactions, never be negative, every wallet summary must count them
+all, and every retry must have been deduplicated.
+Run against PostgreSQL: SQLite serializes writers and will report lock errors.
+"""
+import random
+import threading
+import time
+import uuid
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Sum
+from django.contrib.auth import get_user_model
+from apps.wallet import ledger
+from apps.wallet.models import WalletSummary, WalletTransaction
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Race concurrent wallet postings and verify balances, overdrafts and retries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=4, help='Wallets shared by all threads (default: 4)')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers (default: 8)')
+        parser.add_argument(
+            '--operations',
+            type=int,
+            default=100,
+            help='Postings per worker, each sent twice (default: 100)'
+        )
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        users = [
+            User.objects.create_user(
+                email=f'benchmark-{suffix}-{index}@bitedrop.test',
+                name='Benchmark User',
+            )
+            for index in range(options['users'])
+        ]
+        try:
+            self.race(users, options['threads'], options['operations'])
+        finally:
+            for user in users:
+                user.delete()
+
+    def race(self, users, thread_count, operations):
+        counts = {'posted': 0, 'rejected': 0, 'replayed': 0, 'duplicated': 0}
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(thread_count)
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local = dict.fromkeys(counts, 0)
+            try:
+                barrier.wait()
+                for _ in range(operations):
+                    user = rng.choice(users)
+                    kind = rng.choice(['top_up', 'bonus', 'redeemed'])
+                    if kind == 'top_up':
+                        amount, points = Decimal(rng.randint(1, 50)), 0
+                    elif kind == 'bonus':
+                        amount, points = Decimal('0.00'), rng.randint(1, 10)
+                    else:
+                        amount, points = -Decimal(rng.randint(1, 50)), -rng.randint(0, 10)
+                    key = uuid.uuid4().hex
+                    posted = False
+                    for _ in range(2):
+                        try:
+                            _, created = ledger.post(
+                                user, kind, amount, points=points,
+                                description='Benchmark', idempotency_key=key
+                            )
+                        except ledger.InsufficientFunds:
+                            local['rejected'] += 1
+                            continue
+                        if not created:
+                            local['replayed'] += 1
+                        elif posted:
+                            local['duplicated'] += 1
+                        else:
+                            local['posted'] += 1
+                            posted = True
+            except Exception as exc:
+                with lock:
+                    errors.append(repr(exc))
+            finally:
+                with lock:
+                    for name, value in local.items():
+                        counts[name] += value
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        totals = {
+            row['user']: row
+            for row in WalletTransaction.objects.filter(user__in=users).values('user').annotate(
+                amount=Sum('amount'),
+                points=Sum('points'),
+                count=Count('id')
+            ).order_by()
+        }
+        summaries = {
+            summary.user_id: summary.transactions_count
+            for summary in WalletSummary.objects.filter(user__in=users)
+        }
+        drifted = negative = stored = 0
+        for user in User.objects.filter(pk__in=[user.pk for user in users]):
+            total = totals.get(user.pk, {'amount': Decimal('0.00'), 'points': 0, 'count': 0})
+            stored += total['count']
+            if (
+                user.wallet_balance != total['amount']
+                or user.loyalty_points != total['points']
+                or summaries.get(user.pk, 0) != total['count']
+            ):
+                drifted += 1
+            if user.wallet_balance < 0 or user.loyalty_points < 0:
+                negative += 1
+
+        attempts = thread_count * operations * 2
+        self.stdout.write(f'Attempts:          {attempts}')
+        self.stdout.write(f'Elapsed:           {elapsed:.3f}s ({attempts / elapsed:.0f} attempts/s)')
+        self.stdout.write(f'Posted:            {counts["posted"]} ({stored} transactions stored)')
+        self.stdout.write(f'Overdrafts:        {counts["rejected"]} rejected')
+        self.stdout.write(f'Retries:           {counts["replayed"]} deduplicated, {counts["duplicated"]} posted twice')
+        self.stdout.write(f'Drifted balances:  {drifted}')
+        self.stdout.write(f'Negative balances: {negative}')
+        for error in errors:
+            self.stdout.write(self.style.ERROR(f'Worker error: {error}'))
+
+        if errors or drifted or negative or counts['duplicated'] or stored != counts['posted']:
+            raise CommandError('Wallet ledger benchmark failed')
+        self.stdout.write(self.style.SUCCESS('No lost updates, overdrafts or duplicate postings'))
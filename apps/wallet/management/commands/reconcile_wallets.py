@@ -0,0 +1,89 @@
+"""
+Management command to reconcile wallet balances with the ledger.
+Compares every user's wallet_balance and loyalty_points with the sums of
+their wallet transactions, in keyset-ordered chunks of users, and reports
+the users that drifted. With --snapshot it also records a WalletSnapshot
+per user; schedule it (e.g. nightly) to keep a balance history.
+With --workers the user id range is split across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from apps.wallet import reconcile
+
+
+def _setup_worker():
+    # Processes started with spawn (not fork) import nothing from the parent
+    django.setup()
+
+
+def _reconcile(arguments):
+    return reconcile.reconcile_range(*arguments)
+
+
+class Command(BaseCommand):
+    help = 'Check wallet balances and loyalty points against the wallet transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Users read per query (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processes to split the user id range across (default: 1)'
+        )
+        parser.add_argument(
+            '--snapshot',
+            action='store_true',
+            help='Record a WalletSnapshot of every user'
+        )
+        parser.add_argument(
+            '--report-limit',
+            type=int,
+            default=100,
+            help='Drifted users listed at most (default: 100)'
+        )
+
+    def handle(self, *args, **options):
+        taken_at = timezone.now() if options['snapshot'] else None
+        workers = max(1, options['workers'])
+        # Several ranges per worker, so one dense range does not hold up the others
+        ranges = reconcile.id_ranges(workers * 4 if workers > 1 else 1)
+        arguments = [
+            (start, end, options['chunk_size'], taken_at, options['report_limit'])
+            for start, end in ranges
+        ]
+
+        if workers > 1:
+            # Forked workers must not share the parent's database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+                reports = list(pool.map(_reconcile, arguments))
+        else:
+            reports = [_reconcile(argument) for argument in arguments]
+
+        totals = {
+            name: sum(report[name] for report in reports)
+            for name in ['users', 'transactions', 'drifted', 'snapshots']
+        }
+        drift = [row for report in reports for row in report['drift']][:options['report_limit']]
+        for row in drift:
+            self.stdout.write(
+                f"User {row['pk']}: stored balance={row['wallet_balance']} points={row['loyalty_points']}, "
+                f"ledger balance={row['ledger_amount']} points={row['ledger_points']}"
+            )
+
+        self.stdout.write(
+            f"Checked {totals['users']} users and {totals['transactions']} transactions"
+            + (f", wrote {totals['snapshots']} snapshots" if taken_at else '')
+        )
+        if totals['drifted']:
+            raise CommandError(f"{totals['drifted']} users have balances that differ from their transactions")
+        self.stdout.write(self.style.SUCCESS('Wallet balances match the ledger'))
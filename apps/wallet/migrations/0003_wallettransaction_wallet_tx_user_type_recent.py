@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0007_order_order_status_created"),
+        ("wallet", "0002_wallettransaction_wallet_tx_user_recent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="wallettransaction",
+            index=models.Index(
+                fields=["user", "type", "-created_at"],
+                name="wallet_tx_user_type_recent",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0007_order_order_status_created"),
+        ("wallet", "0003_wallettransaction_wallet_tx_user_type_recent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wallettransaction",
+            name="idempotency_key",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="wallettransaction",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("idempotency_key__isnull", False)),
+                fields=("user", "idempotency_key"),
+                name="wallet_tx_idempotency_key",
+            ),
+        ),
+    ]
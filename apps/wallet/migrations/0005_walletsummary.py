@@ -0,0 +1,79 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_summaries(apps, schema_editor):
+    WalletTransaction = apps.get_model("wallet", "WalletTransaction")
+    WalletSummary = apps.get_model("wallet", "WalletSummary")
+
+    def total(field, type):
+        return Coalesce(
+            models.Sum(field, filter=models.Q(type=type)),
+            0,
+            output_field=(
+                models.DecimalField() if field == "amount" else models.IntegerField()
+            ),
+        )
+
+    rows = (
+        WalletTransaction.objects.values("user")
+        .annotate(
+            transactions_count=models.Count("pk"),
+            earned_amount=total("amount", "earned"),
+            earned_points=total("points", "earned"),
+            redeemed_amount=total("amount", "redeemed"),
+            redeemed_points=total("points", "redeemed"),
+            last_transaction_at=models.Max("created_at"),
+        )
+        .order_by()
+    )
+    WalletSummary.objects.bulk_create(
+        [WalletSummary(user_id=row.pop("user"), **row) for row in rows.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user_account", "0004_user_must_change_password"),
+        ("wallet", "0004_wallettransaction_idempotency_key_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WalletSummary",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="wallet_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("transactions_count", models.IntegerField(default=0)),
+                (
+                    "earned_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("earned_points", models.IntegerField(default=0)),
+                (
+                    "redeemed_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("redeemed_points", models.IntegerField(default=0)),
+                ("last_transaction_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "wallet summaries",
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
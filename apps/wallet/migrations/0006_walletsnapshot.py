@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wallet", "0005_walletsummary"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WalletSnapshot",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "wallet_balance",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("loyalty_points", models.IntegerField()),
+                ("ledger_amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("ledger_points", models.IntegerField()),
+                ("transactions_count", models.IntegerField()),
+                ("taken_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="wallet_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-taken_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-taken_at"], name="wallet_snapshot_user_recent"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wallet", "0006_walletsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoyaltyWatermark",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("delivered_at", models.DateTimeField()),
+                ("order_id", models.UUIDField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -32,27 +32,97 @@ class WalletTransaction(models.Model):
         related_name='wallet_transactions'
     )
     
+    # Client-supplied key deduplicating retries, unique per user (see apps/wallet/ledger.py)
+    idempotency_key = models.CharField(max_length=255, blank=True, null=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'idempotency_key'],
+                condition=models.Q(idempotency_key__isnull=False),
+                name='wallet_tx_idempotency_key'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='wallet_tx_user_recent'),
+            models.Index(fields=['user', 'type', '-created_at'], name='wallet_tx_user_type_recent'),
+        ]
 
     def __str__(self):
         return f"{self.user.name} - {self.type} - {self.amount}"
 
-    def save(self, *args, **kwargs):
-        """Update user's wallet balance and loyalty points when transaction is saved"""
-        super().save(*args, **kwargs)
-        
-        # Update user's wallet balance and loyalty points
-        user = self.user
-        user.wallet_balance += self.amount
-        user.loyalty_points += self.points
-        
-        # Ensure non-negative values
-        if user.wallet_balance < 0:
-            user.wallet_balance = 0
-        if user.loyalty_points < 0:
-            user.loyalty_points = 0
-            
-        user.save(update_fields=['wallet_balance', 'loyalty_points'])
\ No newline at end of file
+
+class WalletSummary(models.Model):
+    """
+    Per-user ledger counters, updated by apps.wallet.ledger in the same
+    transaction as every posting so the balance endpoint reads one row.
+    Earned and redeemed totals are the sums of those transaction types,
+    with their sign (redemptions are negative).
+    """
+    user = models.OneToOneField(
+        'user_account.User',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='wallet_summary'
+    )
+    transactions_count = models.IntegerField(default=0)
+    earned_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    earned_points = models.IntegerField(default=0)
+    redeemed_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    redeemed_points = models.IntegerField(default=0)
+    last_transaction_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name_plural = 'wallet summaries'
+
+    def __str__(self):
+        return f"{self.user.name} - {self.transactions_count} transactions"
+
+
+class WalletSnapshot(models.Model):
+    """
+    A user's stored balances next to the sums of their transactions, as
+    read by reconcile_wallets --snapshot in one consistent query.
+    """
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        'user_account.User',
+        on_delete=models.CASCADE,
+        related_name='wallet_snapshots'
+    )
+    wallet_balance = models.DecimalField(max_digits=10, decimal_places=2)
+    loyalty_points = models.IntegerField()
+    ledger_amount = models.DecimalField(max_digits=12, decimal_places=2)  # Sum of transaction amounts
+    ledger_points = models.IntegerField()  # Sum of transaction points
+    transactions_count = models.IntegerField()
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-taken_at']
+        indexes = [
+            models.Index(fields=['user', '-taken_at'], name='wallet_snapshot_user_recent'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.wallet_balance} at {self.taken_at}"
+
+    @property
+    def drifted(self):
+        return self.wallet_balance != self.ledger_amount or self.loyalty_points != self.ledger_points
+
+
+class LoyaltyWatermark(models.Model):
+    """
+    How far loyalty accrual has got: the (delivered_at, id) of the last
+    order it scanned. One row, locked by each accrual batch.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    delivered_at = models.DateTimeField()
+    order_id = models.UUIDField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} - {self.delivered_at}"
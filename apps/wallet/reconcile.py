@@ -0,0 +1,75 @@
+"""
+Wallet reconciliation.
+Checks that every user's wallet_balance and loyalty_points still equal the
+sums of their WalletTransaction rows. Users are read in keyset-ordered
+chunks of ids; each chunk is one grouped query joining the users to their
+transactions, so stored balances and ledger sums come from the same
+snapshot of the database and a posting in flight cannot look like drift.
+Rows are streamed with a server-side cursor, so memory stays bounded by
+the chunk size whatever the number of transactions.
+The id range can be split for a process pool (see reconcile_wallets).
+"""
+from django.db.models import Count, DecimalField, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce
+from apps.user_account.models import User
+from .models import WalletSnapshot
+
+ZERO = Value(0, output_field=DecimalField())
+
+
+def id_ranges(parts):
+    """Split the user ids into up to `parts` [start, end) ranges of about equal width"""
+    bounds = User.objects.aggregate(first=Min('pk'), last=Max('pk'))
+    if bounds['first'] is None:
+        return []
+    first, last = bounds['first'], bounds['last'] + 1
+    width = max(1, -(-(last - first) // parts))  # Ceiling division
+    return [(start, min(start + width, last)) for start in range(first, last, width)]
+
+
+def reconcile_range(start, end, chunk_size=1000, taken_at=None, report_limit=100):
+    """
+    Reconcile the users with start <= id < end. With taken_at, also write
+    a WalletSnapshot per user. Returns a report dict with the counts and
+    at most report_limit drifted users.
+    """
+    report = {'users': 0, 'transactions': 0, 'drifted': 0, 'snapshots': 0, 'drift': []}
+    last_pk = start - 1
+    while True:
+        users = User.objects.filter(pk__gt=last_pk, pk__lt=end).order_by('pk')[:chunk_size]
+        rows = User.objects.filter(pk__in=users.values('pk')).order_by('pk').values(
+            'pk', 'wallet_balance', 'loyalty_points'
+        ).annotate(
+            ledger_amount=Coalesce(Sum('wallet_transactions__amount'), ZERO),
+            ledger_points=Coalesce(Sum('wallet_transactions__points'), 0),
+            transactions_count=Count('wallet_transactions')
+        )
+
+        snapshots = []
+        seen = 0
+        for row in rows.iterator(chunk_size=chunk_size):
+            seen += 1
+            last_pk = row['pk']
+            report['users'] += 1
+            report['transactions'] += row['transactions_count']
+            if row['wallet_balance'] != row['ledger_amount'] or row['loyalty_points'] != row['ledger_points']:
+                report['drifted'] += 1
+                if len(report['drift']) < report_limit:
+                    report['drift'].append(row)
+            if taken_at is not None:
+                snapshots.append(WalletSnapshot(
+                    user_id=row['pk'],
+                    wallet_balance=row['wallet_balance'],
+                    loyalty_points=row['loyalty_points'],
+                    ledger_amount=row['ledger_amount'],
+                    ledger_points=row['ledger_points'],
+                    transactions_count=row['transactions_count'],
+                    taken_at=taken_at,
+                ))
+
+        if snapshots:
+            WalletSnapshot.objects.bulk_create(snapshots, batch_size=chunk_size)
+            report['snapshots'] += len(snapshots)
+        if seen < chunk_size:
+            break
+    return report
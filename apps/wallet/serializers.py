@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from . import ledger
 from .models import WalletTransaction
 from apps.order.serializers import OrderSerializer
 
@@ -16,15 +17,37 @@ class WalletTransactionSerializer(serializers.ModelSerializer):
 
 
 class WalletTransactionCreateSerializer(serializers.ModelSerializer):
-    """Serializer for creating wallet transactions"""
+    """
+    Serializer for the transactions users post themselves. Users can only
+    spend from their wallet; credits come from staff and background jobs.
+    """
+    type = serializers.ChoiceField(choices=ledger.DEBIT_TYPES)
+
     class Meta:
         model = WalletTransaction
         fields = ['type', 'amount', 'points', 'description', 'order']
 
+    def validate_order(self, order):
+        if order is not None and order.user_id != self.context['request'].user.pk:
+            raise serializers.ValidationError('Invalid order')
+        return order
+
+    def validate(self, attrs):
+        try:
+            ledger.check_signs(attrs['type'], attrs['amount'], attrs['points'])
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return attrs
+
 
 class WalletBalanceSerializer(serializers.Serializer):
     """Serializer for wallet balance information"""
     wallet_balance = serializers.DecimalField(max_digits=10, decimal_places=2)
     loyalty_points = serializers.IntegerField()
     total_transactions = serializers.IntegerField()
-    recent_transactions = WalletTransactionSerializer(many=True)
+    earned_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    earned_points = serializers.IntegerField()
+    redeemed_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    redeemed_points = serializers.IntegerField()
+    last_transaction_at = serializers.DateTimeField(allow_null=True)
+    recent_transactions = WalletTransactionSerializer(many=True, required=False)
@@ -1,3 +1,168 @@
-from django.test import TestCase
+import io
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from apps.order.models import Order, OrderItem, OrderRestaurant
+from apps.product.models import Product
+from apps.restaurant.models import Restaurant
+from apps.user_account.models import User
+from . import ledger, loyalty
+from .admin import WalletTransactionAdminForm
+from .models import LoyaltyWatermark, WalletSummary, WalletTransaction
 
-# Create your tests here.
+
+class LedgerTests(TestCase):
+    """Postings through apps.wallet.ledger"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+        ledger.post(self.user, 'top_up', Decimal('20.00'), points=5)
+
+    def balances(self):
+        self.user.refresh_from_db()
+        summary = WalletSummary.objects.get(user=self.user)
+        return (
+            self.user.wallet_balance, self.user.loyalty_points,
+            summary.transactions_count, summary.redeemed_amount, summary.redeemed_points,
+        )
+
+    def test_post_applies_the_transaction(self):
+        ledger.post(self.user, 'redeemed', Decimal('-7.50'), points=-2)
+        self.assertEqual(self.balances(), (Decimal('12.50'), 3, 2, Decimal('-7.50'), -2))
+
+    def test_overdraft_is_rejected_without_changes(self):
+        before = self.balances()
+        for amount, points in [(Decimal('-20.01'), 0), (Decimal('0.00'), -6), (Decimal('-1.00'), -6)]:
+            with self.subTest(amount=amount, points=points):
+                with self.assertRaises(ledger.InsufficientFunds):
+                    ledger.post(self.user, 'redeemed', amount, points=points)
+                self.assertEqual(self.balances(), before)
+        self.assertEqual(WalletTransaction.objects.filter(user=self.user).count(), 1)
+
+    def test_signs_must_match_the_type(self):
+        for type, amount, points in [
+            ('top_up', Decimal('-1.00'), 0),
+            ('earned', Decimal('0.00'), 0),
+            ('redeemed', Decimal('1.00'), 0),
+            ('redeemed', Decimal('0.00'), 3),
+        ]:
+            with self.subTest(type=type, amount=amount, points=points):
+                with self.assertRaises(ValueError):
+                    ledger.post(self.user, type, amount, points=points)
+        self.assertEqual(WalletTransaction.objects.filter(user=self.user).count(), 1)
+
+    def test_idempotency_key_retry_posts_once(self):
+        first, created = ledger.post(self.user, 'redeemed', Decimal('-5.00'), idempotency_key='checkout-1')
+        self.assertTrue(created)
+        retry, created = ledger.post(self.user, 'redeemed', Decimal('-5.00'), idempotency_key='checkout-1')
+        self.assertFalse(created)
+        self.assertEqual(retry.pk, first.pk)
+        self.assertEqual(WalletTransaction.objects.filter(idempotency_key='checkout-1').count(), 1)
+        self.assertEqual(self.balances()[:3], (Decimal('15.00'), 5, 2))
+
+
+class WalletTransactionAdminFormTests(TestCase):
+    """Postings the ledger would refuse show as form errors"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+        ledger.post(self.user, 'top_up', Decimal('10.00'))
+
+    def form(self, type, amount, points=0):
+        return WalletTransactionAdminForm(data={
+            'user': self.user.pk,
+            'type': type,
+            'amount': amount,
+            'points': points,
+            'description': 'Adjustment',
+        })
+
+    def test_overdraft_is_a_form_error(self):
+        form = self.form('redeemed', '-10.01')
+        self.assertFalse(form.is_valid())
+        self.assertIn('Insufficient wallet balance or loyalty points', form.non_field_errors())
+
+    def test_wrong_sign_is_a_form_error(self):
+        form = self.form('bonus', '-1.00')
+        self.assertFalse(form.is_valid())
+        self.assertTrue(form.non_field_errors())
+
+    def test_valid_posting(self):
+        self.assertTrue(self.form('redeemed', '-10.00').is_valid())
+
+
+@override_settings(LOYALTY_POINTS_PER_UNIT=Decimal('1'))
+class LoyaltyAccrualTests(TestCase):
+    """Points for delivered orders, credited once whatever the number of scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        restaurant = Restaurant.objects.create(name='Mama Put', address='1 Main St', phone='1', email='r@example.com')
+        double = Restaurant.objects.create(
+            name='Suya Spot', address='2 Main St', phone='2', email='s@example.com', loyalty_multiplier=Decimal('2.00')
+        )
+        cls.product = Product.objects.create(name='Jollof', price=Decimal('10.00'), restaurant=restaurant)
+        cls.double_product = Product.objects.create(name='Suya', price=Decimal('5.00'), restaurant=double)
+        cls.customer = User.objects.create_user(email='c@example.com', name='Customer', password='x', role='customer')
+
+    def setUp(self):
+        self.delivered_at = timezone.now() - timedelta(minutes=10)
+
+    def deliver(self, delivered_at, linked=True):
+        """A delivered order with one item from each restaurant, worth 20 points"""
+        order = Order.objects.create(user=self.customer, delivery_address='1 Main St', payment_method='cash')
+        for product in [self.product, self.double_product]:
+            OrderItem.objects.create(order=order, product=product, quantity=1, unit_price=product.price)
+        if linked:
+            OrderRestaurant.sync_for_order(order)
+        Order.objects.filter(pk=order.pk).update(status='delivered', delivered_at=delivered_at)
+        return order
+
+    def accrue(self, since=None):
+        options = {'since': since.isoformat()} if since else {}
+        call_command('accrue_loyalty_points', once=True, stdout=io.StringIO(), **options)
+
+    def credited(self, order):
+        return list(WalletTransaction.objects.filter(order=order, type='earned').values_list('points', flat=True))
+
+    def points(self):
+        self.customer.refresh_from_db()
+        return self.customer.loyalty_points
+
+    def test_replaying_over_the_watermark_credits_once(self):
+        orders = [self.deliver(self.delivered_at + timedelta(seconds=i)) for i in range(3)]
+        since = self.delivered_at - timedelta(minutes=1)
+        self.accrue(since)
+        self.accrue(since)
+        self.accrue()
+        for order in orders:
+            self.assertEqual(self.credited(order), [20])
+        self.assertEqual(self.points(), 60)
+        self.assertEqual(LoyaltyWatermark.objects.get().order_id, orders[-1].pk)
+
+    def test_orders_without_links_earn_from_their_items(self):
+        order = self.deliver(self.delivered_at, linked=False)
+        self.accrue(self.delivered_at - timedelta(minutes=1))
+        self.assertEqual(self.credited(order), [20])
+
+    def test_late_commits_are_credited_once_by_the_rescan(self):
+        self.deliver(self.delivered_at)
+        self.accrue(self.delivered_at - timedelta(minutes=1))
+
+        # Delivered before the watermark, but only visible now
+        late = self.deliver(self.delivered_at - timedelta(seconds=30))
+        self.assertEqual(loyalty.accrue_batch(), 0)
+        self.assertEqual(loyalty.accrue_late(), 1)
+        self.assertEqual(loyalty.accrue_late(), 0)
+        self.accrue()
+        self.assertEqual(self.credited(late), [20])
+        self.assertEqual(self.points(), 40)
+
+    def test_rescan_window_is_bounded(self):
+        self.deliver(self.delivered_at)
+        self.accrue(self.delivered_at - timedelta(minutes=1))
+        too_late = self.deliver(self.delivered_at - loyalty.RESCAN_WINDOW - timedelta(seconds=1))
+        self.assertEqual(loyalty.accrue_late(), 0)
+        self.assertEqual(self.credited(too_late), [])
@@ -1,26 +1,36 @@
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import WalletTransaction
+from apps.common.pagination import KeysetPagination
+from apps.order.models import Order
+from . import ledger
+from .models import WalletSummary, WalletTransaction
 from .serializers import WalletTransactionSerializer, WalletTransactionCreateSerializer, WalletBalanceSerializer
 
 
 class WalletTransactionViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing wallet transactions.
+    Transactions are append-only: they can be listed and created, not edited or deleted.
     """
     queryset = WalletTransaction.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['type']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    http_method_names = ['get', 'post', 'head', 'options']
 
     def get_queryset(self):
         """Return wallet transactions for the authenticated user"""
         if self.request.user.is_authenticated:
-            return WalletTransaction.objects.filter(user=self.request.user)
+            # Orders are nested in the response: load them for the whole page at once
+            return WalletTransaction.objects.filter(user=self.request.user).prefetch_related(
+                Prefetch('order', queryset=Order.objects.with_details())
+            )
         else:
             return WalletTransaction.objects.none()
 
@@ -29,53 +39,81 @@ class WalletTransactionViewSet(viewsets.ModelViewSet):
             return WalletTransactionCreateSerializer
         return WalletTransactionSerializer
 
-    def perform_create(self, serializer):
-        """Set the user to the current user when creating a transaction"""
-        serializer.save(user=self.request.user)
+    def create(self, request, *args, **kwargs):
+        """
+        Post a transaction to the current user's wallet through the ledger.
+        With an Idempotency-Key header, a retry of an already posted request
+        returns the original transaction (200) instead of posting it again.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        idempotency_key = request.headers.get('Idempotency-Key') or None
+        if idempotency_key and len(idempotency_key) > 255:
+            return Response(
+                {'error': 'Idempotency-Key must be at most 255 characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            wallet_transaction, created = ledger.post(
+                request.user, idempotency_key=idempotency_key, **serializer.validated_data
+            )
+        except ledger.InsufficientFunds as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            self.get_serializer(wallet_transaction).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
 
     @action(detail=False, methods=['get'])
     def balance(self, request):
-        """Get wallet balance and recent transactions"""
+        """
+        Get wallet balance and lifetime totals, from the user's ledger counters.
+        - ?recent=<n>: how many of the latest transactions to include (default 10,
+          max 50); ?recent=0 leaves them out and skips their queries
+        """
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=401)
-            
+
         user = request.user
-        recent_transactions = WalletTransaction.objects.filter(
-            user=user
-        )[:10]  # Last 10 transactions
-        
+        summary = WalletSummary.objects.filter(user=user).first() or WalletSummary(user=user)
         data = {
             'wallet_balance': user.wallet_balance,
             'loyalty_points': user.loyalty_points,
-            'total_transactions': WalletTransaction.objects.filter(user=user).count(),
-            'recent_transactions': WalletTransactionSerializer(recent_transactions, many=True).data
+            'total_transactions': summary.transactions_count,
+            'earned_amount': summary.earned_amount,
+            'earned_points': summary.earned_points,
+            'redeemed_amount': summary.redeemed_amount,
+            'redeemed_points': summary.redeemed_points,
+            'last_transaction_at': summary.last_transaction_at,
         }
-        
+        try:
+            recent = min(int(request.query_params.get('recent', 10)), 50)
+        except ValueError:
+            return Response({'error': 'recent must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        if recent > 0:
+            data['recent_transactions'] = self.get_queryset()[:recent] if summary.transactions_count else []
+
         serializer = WalletBalanceSerializer(data)
         return Response(serializer.data)
 
+    def paginated_type(self, type):
+        """Page of the user's transactions of one type, newest first"""
+        transactions = self.get_queryset().filter(type=type).order_by('-created_at', '-pk')
+        page = self.paginate_queryset(transactions)
+        serializer = WalletTransactionSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def earned(self, request):
-        """Get all earned transactions"""
+        """Get earned transactions, paginated"""
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=401)
-            
-        transactions = WalletTransaction.objects.filter(
-            user=request.user,
-            type='earned'
-        )
-        serializer = WalletTransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
+        return self.paginated_type('earned')
 
     @action(detail=False, methods=['get'])
     def redeemed(self, request):
-        """Get all redeemed transactions"""
+        """Get redeemed transactions, paginated"""
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=401)
-            
-        transactions = WalletTransaction.objects.filter(
-            user=request.user,
-            type='redeemed'
-        )
-        serializer = WalletTransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return self.paginated_type('redeemed')
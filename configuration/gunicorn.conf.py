@@ -0,0 +1,17 @@
+"""
+Gunicorn settings, loaded by the Procfile web process.
+The order feed (/api/orders/feed/) keeps long-poll and SSE requests open
+for up to 25 seconds, so workers are threaded: each open feed holds a
+thread, not a whole process. Raise GUNICORN_THREADS with the number of
+kitchen screens each instance serves.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
+# Longer than the feed's longest wait, so open streams are not killed as stuck workers
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
@@ -16,6 +16,7 @@ import os, sys
 from dotenv import load_dotenv
 
 from datetime import timedelta
+from decimal import Decimal
 
 load_dotenv()
 
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     
     # Local Apps
+    'apps.common',
     'apps.user_account',
     'apps.restaurant',
     'apps.category',
@@ -67,6 +69,8 @@ INSTALLED_APPS = [
     'apps.review',
     'apps.delivery',
     'apps.payment',
+    'apps.search',
+    'apps.report',
 ]
 
 MIDDLEWARE = [
@@ -292,6 +296,41 @@ REDOC_SETTINGS = {
     'PATH_IN_MIDDLE': True,
 }
 
+# Cache: shared Redis cache when REDIS_URL is set (requires the redis package),
+# per-process memory otherwise
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached catalog response may be served (see apps/common/cache.py)
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', '300'))
+
+# Seconds a process serves its in-memory geo index before rebuilding it (see
+# apps/delivery/geo.py); bounds how stale other processes are without Redis
+GEO_INDEX_MAX_AGE = int(os.getenv('GEO_INDEX_MAX_AGE', '60'))
+
+# Largest upload accepted by /api/products/bulk-import/, and rows per transaction
+PRODUCT_IMPORT_MAX_ROWS = int(os.getenv('PRODUCT_IMPORT_MAX_ROWS', '10000'))
+PRODUCT_IMPORT_CHUNK_SIZE = int(os.getenv('PRODUCT_IMPORT_CHUNK_SIZE', '500'))
+
+# Loyalty points per currency unit of a delivered order's subtotal (before
+# the restaurant's loyalty_multiplier), and orders accrued per transaction
+LOYALTY_POINTS_PER_UNIT = Decimal(os.getenv('LOYALTY_POINTS_PER_UNIT', '1'))
+LOYALTY_ACCRUAL_BATCH_SIZE = int(os.getenv('LOYALTY_ACCRUAL_BATCH_SIZE', '500'))
+
+# Closed orders older than this are moved to the archive tables by archive_orders
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv('ORDER_ARCHIVE_AFTER_DAYS', '180'))
+
 # Frontend URL for email templates
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
@@ -89,4 +89,6 @@ urlpatterns = [
     path('api/', include('apps.review.urls')),
     path('api/', include('apps.delivery.urls')),
     path('api/', include('apps.payment.urls')),
+    path('api/', include('apps.search.urls')),
+    path('api/', include('apps.report.urls')),
 ]